@@ -13,32 +13,51 @@ STEPS = [
 ]
 
 
-def render_progress(current_step: str | None) -> None:
+def render_progress(
+    current_step: str | None,
+    completed: set[str] | None = None,
+    running: set[str] | None = None,
+    counts: dict[str, int] | None = None,
+) -> None:
     """渲染研究進度
 
+    只傳入 current_step 時，依步驟順序判斷完成狀態 (研究結束後的顯示)。
+    串流執行中可傳入 completed / running 明確指定各步驟狀態，
+    因為新聞與社群抓取並行執行，完成順序不一定。
+
     Args:
         current_step: 目前步驟 ID
+        completed: 已完成的步驟 ID
+        running: 執行中的步驟 ID
+        counts: 各步驟取得的內容數 (顯示在步驟名稱旁)
     """
-    if current_step is None:
+    if current_step is None and not completed and not running:
         return
 
     step_ids = [s[1] for s in STEPS]
+    _counts = counts or {}
 
     # 找到目前步驟的索引
-    if current_step == "error":
-        current_idx = -1
-    elif current_step in step_ids:
+    if current_step in step_ids:
         current_idx = step_ids.index(current_step)
     else:
         current_idx = -1
 
+    if completed is None and running is None:
+        _completed = set(step_ids[:current_idx])
+        _running = {current_step} if current_idx >= 0 else set()
+    else:
+        _completed = completed or set()
+        _running = running or set()
+
     cols = st.columns(len(STEPS))
-    for i, (label, _) in enumerate(STEPS):
+    for i, (label, step_id) in enumerate(STEPS):
+        count = f" ({_counts[step_id]} 筆)" if step_id in _counts else ""
         with cols[i]:
-            if i < current_idx:
-                st.markdown(f"✅ **{label}**")
-            elif i == current_idx:
-                st.markdown(f"🔄 **{label}**")
+            if step_id in _completed:
+                st.markdown(f"✅ **{label}**{count}")
+            elif step_id in _running:
+                st.markdown(f"🔄 **{label}**{count}")
             else:
                 st.markdown(f"⏳ {label}")
 
@@ -46,6 +65,6 @@ def render_progress(current_step: str | None) -> None:
         st.error("研究流程中發生錯誤")
 
     # 進度條
-    if current_idx >= 0:
-        progress = (current_idx + 1) / len(STEPS)
-        st.progress(progress)
+    done = len(_completed | _running)
+    if done:
+        st.progress(min(1.0, done / len(STEPS)))
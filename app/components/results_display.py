@@ -1,8 +1,11 @@
 """結果顯示元件
 
 將 VideoMaterial 渲染為 Streamlit 卡片。
+串流合成期間以 render_partial_material 先顯示已完成的欄位。
 """
 
+from typing import Any
+
 import streamlit as st
 
 from src.models.video_material import VideoMaterial
@@ -23,6 +26,41 @@ def render_video_material(material: VideoMaterial) -> None:
     render_sources(material)
 
 
+def render_partial_material(fields: dict[str, Any]) -> None:
+    """渲染串流合成中已完成的欄位 (依使用者閱讀順序，尚未完成的區段不顯示)
+
+    Args:
+        fields: 已完成的 LLM 輸出欄位 (欄位名稱 -> 原始值)
+    """
+    if "title_suggestion" in fields:
+        st.subheader(fields["title_suggestion"])
+    if "hook_line" in fields:
+        st.markdown("**📢 Hook Line**:")
+        st.info(fields["hook_line"])
+    if "target_emotion" in fields:
+        st.markdown(f"**🎯 目標情緒**: {fields['target_emotion']}")
+    if "call_to_action" in fields:
+        st.markdown(f"**💡 行動呼籲**: {fields['call_to_action']}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if "key_talking_points" in fields:
+            st.markdown("### 💬 論點")
+            for i, point in enumerate(fields["key_talking_points"], 1):
+                st.markdown(f"{i}. {point}")
+    with col2:
+        if "visual_suggestions" in fields:
+            st.markdown("### 🎨 視覺建議")
+            for suggestion in fields["visual_suggestions"]:
+                st.markdown(f"- {suggestion}")
+
+    if "hashtag_suggestions" in fields:
+        st.markdown(
+            " ".join(f"`#{tag.lstrip('#')}`" for tag in fields["hashtag_suggestions"])
+        )
+    st.caption("⏳ 素材生成中...")
+
+
 def render_metric_cards(material: VideoMaterial) -> None:
     """渲染指標卡片"""
     cols = st.columns(4)
@@ -11,29 +11,47 @@ if _project_root not in sys.path:
 import asyncio  # noqa: E402
 import html as html_module  # noqa: E402
 import logging  # noqa: E402
+import uuid
 from datetime import datetime  # noqa: E402
 
 import streamlit as st  # noqa: E402
 
 from components.feedback_panel import render_feedback_panel  # noqa: E402
 from components.history_store import load_history, save_history  # noqa: E402
-from components.progress_tracker import render_progress  # noqa: E402
-from components.results_display import render_video_material  # noqa: E402
+from components.progress_tracker import STEPS, render_progress  # noqa: E402
+from components.results_display import (
+    render_partial_material,
+    render_video_material,
+)
 from components.topic_input import render_topic_input  # noqa: E402
-from src.graph.research_graph import run_research  # noqa: E402
+from src.graph.events import NODE_STEPS
+from src.graph.research_graph import (
+    resume_research,
+    stream_research,
+    warm_up_workflow,
+)
+from src.utils.llm_factory import aclose_chat_models
 
 logger = logging.getLogger(__name__)
 
 
+async def _with_llm_cleanup(coro):
+    """執行協程，結束時關閉此事件迴圈的共用 LLM 連線"""
+    try:
+        return await coro
+    finally:
+        await aclose_chat_models()
+
+
 def _run_async(coro):
     """Run async coroutine, handling case where event loop already exists."""
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(coro)
+        return asyncio.run(_with_llm_cleanup(coro))
     import concurrent.futures
     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-        return pool.submit(asyncio.run, coro).result()
+        return pool.submit(asyncio.run, _with_llm_cleanup(coro)).result()
 
 
 def _esc(value: object) -> str:
@@ -48,6 +66,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# 預先編譯研究工作流，讓第一次提交不需負擔圖建構與編譯時間 (已快取時為 no-op)
+warm_up_workflow()
+
 # Tech Innovation 主題樣式 (Electric Blue + Neon Cyan)
 st.markdown(
     """
@@ -287,6 +308,94 @@ def _handle_feedback(
     ]
 
 
+def _save_to_history(topic: str, result: dict) -> None:
+    """研究成功 (產生影片素材) 時加入研究歷史並儲存"""
+    video_mat = result.get("video_material")
+    if not video_mat:
+        return
+    st.session_state.research_history = [
+        *st.session_state.research_history,
+        {
+            "topic": topic,
+            "video_material": video_mat.model_dump()
+            if hasattr(video_mat, "model_dump")
+            else video_mat,
+            "executed_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        },
+    ]
+    save_history(st.session_state.research_history)
+
+
+_STEP_LABELS = {step_id: label for label, step_id in STEPS}
+
+
+async def _stream_research_with_progress(
+    initial_state: dict,
+    run_id: str,
+    status,
+    progress_placeholder,
+    preview_placeholder,
+) -> dict:
+    """串流執行研究，每個節點開始/結束時即時更新進度與狀態訊息
+
+    串流合成時，影片素材欄位一完成就顯示在 preview_placeholder，
+    並回報首個欄位距合成開始的時間。
+
+    Returns:
+        最終的 ResearchState dict
+    """
+    completed: set[str] = set()
+    running: set[str] = set()
+    counts: dict[str, int] = {}
+    fields: dict = {}
+    synthesis_started_ms: float | None = None
+    result: dict = {}
+
+    async for event in stream_research(initial_state, run_id=run_id):
+        step = NODE_STEPS.get(event.node or "")
+        if event.kind == "field":
+            if not fields:
+                first_ms = event.elapsed_ms - (synthesis_started_ms or 0)
+                status.write(f"⚡ 首個素材欄位於 {first_ms / 1000:.1f} 秒後出現")
+            fields[event.field] = event.value
+            with preview_placeholder.container():
+                render_partial_material(fields)
+            continue
+        if event.kind == "node_start" and event.node == "content_synthesizer":
+            synthesis_started_ms = event.elapsed_ms
+        if event.kind == "node_start" and step:
+            running.add(step)
+        elif event.kind == "node_end" and step:
+            running.discard(step)
+            if not event.error:
+                completed.add(step)
+            if event.item_count is not None:
+                counts[step] = event.item_count
+            count_info = (
+                f"：{event.item_count} 筆" if event.item_count is not None else ""
+            )
+            status.write(
+                f"{'❌' if event.error else '✅'} {_STEP_LABELS[step]}{count_info}"
+                f" ({(event.duration_ms or 0) / 1000:.1f} 秒)"
+            )
+            status.update(
+                label=f"🚀 研究進行中... 已取得 {sum(counts.values())} 筆資料"
+                f" ({event.elapsed_ms / 1000:.0f} 秒)"
+            )
+        elif event.kind == "run_end":
+            result = event.state or {}
+
+        with progress_placeholder.container():
+            render_progress(
+                event.current_step,
+                completed=completed,
+                running=running,
+                counts=counts,
+            )
+
+    return result
+
+
 # ── Demo 模式的模擬資料與渲染函式 ────────────────────────────────
 
 
@@ -610,19 +719,24 @@ if request and not st.session_state.is_running:
     st.session_state.is_running = True
     st.session_state.research_result = None
 
-    status = st.status(
-        "🚀 研究進行中... 預計約 50 秒", expanded=True
-    )
+    progress_placeholder = st.empty()
+    status = st.status("🚀 研究進行中...", expanded=True)
     status.write("🔍 分解查詢 → 📰 抓取資料 → 🧠 深度分析 → 🎬 生成素材")
+    preview_placeholder = st.empty()
 
+    run_id = uuid.uuid4().hex
     try:
         result = _run_async(
-            run_research(
+            _stream_research_with_progress(
                 {
                     "request": request,
                     "execution_log": [],
                     "total_sources_scraped": 0,
-                }
+                },
+                run_id,
+                status,
+                progress_placeholder,
+                preview_placeholder,
             )
         )
 
@@ -638,27 +752,14 @@ if request and not st.session_state.is_running:
             )
 
         st.session_state.research_result = result
-
-        # 只在成功時儲存歷史
-        video_mat = result.get("video_material")
-        if video_mat:
-            st.session_state.research_history = [
-                *st.session_state.research_history,
-                {
-                    "topic": request.topic,
-                    "video_material": video_mat.model_dump()
-                    if hasattr(video_mat, "model_dump")
-                    else video_mat,
-                    "executed_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                },
-            ]
-            save_history(st.session_state.research_history)
+        _save_to_history(request.topic, result)
     except Exception:
         logger.exception("研究流程失敗")
         status.update(label="❌ 研究失敗", state="error")
         st.session_state.research_result = {
             "error": "研究流程發生非預期錯誤",
             "current_step": "error",
+            "run_id": run_id,
         }
 
     st.session_state.is_running = False
@@ -689,6 +790,20 @@ if result is not None:
         with st.expander("📋 執行日誌", expanded=True):
             for log in result.get("execution_log", []):
                 st.text(log)
+
+        # 從檢查點繼續，已完成的抓取與分析不會重新執行
+        run_id = result.get("run_id")
+        if run_id and st.button("🔁 從失敗的步驟繼續", key="resume_research"):
+            with st.spinner("從失敗的步驟繼續研究..."):
+                try:
+                    resumed = _run_async(resume_research(run_id))
+                except Exception:
+                    logger.exception("繼續研究失敗 (run_id=%s)", run_id)
+                    st.error("無法從檢查點繼續，請重新開始研究")
+                else:
+                    st.session_state.research_result = resumed
+                    _save_to_history(resumed["request"].topic, resumed)
+                    st.rerun()
 else:
     # Demo 模式 - 顯示模擬資料
     data = get_mock_data()
@@ -0,0 +1 @@
+"""效能基準測試腳本 (以 `uv run python -m benchmarks.<name>` 執行)"""
@@ -0,0 +1,106 @@
+"""記憶儲存寫入吞吐量基準測試
+
+以 10k 筆反饋比較 SQLiteStore 的寫入模式：
+
+- rollback journal + synchronous=FULL，每筆提交 (舊行為)
+- WAL + synchronous=NORMAL，每筆提交
+- WAL + 合併提交 (每 N 毫秒最多提交一次)
+- WAL + transaction() 單次提交
+
+執行:
+    uv run python -m benchmarks.memory_writes [--rows 10000] [--interval-ms 50]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from src.memory.models.feedback import FeedbackType, UserFeedback
+from src.memory.models.user_profile import UserProfile
+from src.memory.storage.sqlite_store import SQLiteStore
+
+USER_ID = "bench-user"
+
+
+def _feedback(i: int) -> UserFeedback:
+    return UserFeedback(
+        feedback_id=f"fb-{i}",
+        user_id=USER_ID,
+        session_id="bench",
+        original_content=f"原始內容 {i}",
+        original_analysis=f"原始分析 {i}",
+        agent_type="deep_analyzer",
+        feedback_type=FeedbackType.CORRECTION,
+        user_correction=f"修正內容 {i}",
+        topics=["AI", "半導體"],
+    )
+
+
+async def _run_mode(
+    db_path: Path,
+    rows: list[UserFeedback],
+    *,
+    legacy: bool = False,
+    interval_ms: int = 0,
+    batched: bool = False,
+) -> float:
+    """寫入所有反饋並回傳耗時 (秒，包含最後的提交)"""
+    store = SQLiteStore(
+        str(db_path),
+        synchronous="FULL" if legacy else "NORMAL",
+        commit_interval_ms=interval_ms,
+    )
+    await store.initialize()
+    if legacy:
+        await store._conn.execute("PRAGMA journal_mode = DELETE")
+    await store.create_user(UserProfile(user_id=USER_ID))
+
+    start = time.perf_counter()
+    if batched:
+        async with store.transaction():
+            for feedback in rows:
+                await store.save_feedback(feedback)
+    else:
+        for feedback in rows:
+            await store.save_feedback(feedback)
+    await store.flush()
+    elapsed = time.perf_counter() - start
+
+    await store.close()
+    return elapsed
+
+
+async def _main(row_count: int, interval_ms: int) -> None:
+    rows = [_feedback(i) for i in range(row_count)]
+    modes = [
+        ("rollback journal, FULL", {"legacy": True}),
+        ("WAL, NORMAL", {}),
+        (f"WAL, coalesce {interval_ms} ms", {"interval_ms": interval_ms}),
+        ("WAL, transaction()", {"batched": True}),
+    ]
+
+    baseline: float | None = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, options) in enumerate(modes):
+            elapsed = await _run_mode(Path(tmp) / f"mode-{i}.db", rows, **options)
+            baseline = baseline or elapsed
+            print(
+                f"{label:<28} {elapsed:8.3f} s  {row_count / elapsed:10.0f} rows/s"
+                f"  speedup={baseline / elapsed:6.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="寫入的反饋筆數")
+    parser.add_argument(
+        "--interval-ms", type=int, default=50, help="合併提交模式的提交間隔"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.rows, args.interval_ms))
+
+
+if __name__ == "__main__":
+    main()
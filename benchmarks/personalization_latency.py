@@ -0,0 +1,138 @@
+"""個人化 prompt 延遲基準測試
+
+以 PersonalizationEngine.get_personalized_prompt 比較 VectorStore 的查詢路徑：
+
+- 舊路徑：每次搜尋都在執行緒中 get_or_create_collection + count()，再查詢
+- 新路徑：collection handle 與文件數快取在記憶體，每次搜尋只切換一次執行緒
+
+embedding 使用本地 n-gram 後端並經 EmbeddingCache 快取，個人化段落快取停用，
+量測結果只反映儲存層開銷。
+
+執行:
+    uv run python -m benchmarks.personalization_latency [--docs 200] [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.memory.manager import MemoryManager
+from src.memory.models.learned_correction import LearnedCorrection
+from src.memory.personalization import PersonalizationEngine
+from src.memory.storage.sqlite_store import SQLiteStore
+from src.memory.storage.vector_store import VectorStore
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.llm_factory import create_embedding_model
+from src.utils.local_embeddings import LOCAL_EMBEDDING_MODEL
+
+USER_ID = "bench-user"
+QUERIES = ["台積電先進製程", "AI 晶片出口管制", "電動車補助", "央行升息"]
+
+
+class _LegacyVectorStore(VectorStore):
+    """改動前的查詢路徑：每次搜尋兩次額外的執行緒切換與 metadata 查詢"""
+
+    async def _query(self, user_id, collection_type, query, limit, include):
+        name = self._collection_name(user_id, collection_type)
+        collection = await asyncio.to_thread(
+            self._client.get_or_create_collection, name=name
+        )
+        count = await asyncio.to_thread(collection.count)
+        if count == 0:
+            return None
+        query_embedding = await self._embed_text(query)
+        return await asyncio.to_thread(
+            collection.query,
+            query_embeddings=[query_embedding],
+            n_results=min(limit, count),
+            include=include,
+        )
+
+
+async def _build_engine(
+    root: Path, store_cls: type[VectorStore], doc_count: int
+) -> tuple[MemoryManager, PersonalizationEngine]:
+    vector = store_cls(
+        str(root / "vectors"),
+        embedding_cache=EmbeddingCache(root / "embeddings.db"),
+        embeddings=create_embedding_model(LOCAL_EMBEDDING_MODEL),
+    )
+    manager = MemoryManager(
+        sqlite_store=SQLiteStore(str(root / "memory.db")), vector_store=vector
+    )
+    await manager.initialize()
+
+    await manager.get_or_create_user(USER_ID)
+    await manager.store_corrections_many(
+        [
+            LearnedCorrection(
+                correction_id=f"c-{i}",
+                user_id=USER_ID,
+                pattern=f"錯誤模式 {i}",
+                correction=f"正確說法 {i}",
+                context=QUERIES[i % len(QUERIES)],
+            )
+            for i in range(doc_count)
+        ]
+    )
+    await vector.store_conversations_many(
+        USER_ID,
+        [(f"s-{i}", f"{QUERIES[i % len(QUERIES)]} 對話 {i}") for i in range(doc_count)],
+    )
+    return manager, PersonalizationEngine(manager, cache_entries=0)
+
+
+async def _run_mode(
+    root: Path, store_cls: type[VectorStore], doc_count: int, iterations: int
+) -> list[float]:
+    """回傳每次 get_personalized_prompt 的耗時 (毫秒)"""
+    manager, engine = await _build_engine(root, store_cls, doc_count)
+    # 預熱：載入 collection 與 embedding 快取
+    for query in QUERIES:
+        await engine.get_personalized_prompt(USER_ID, "base", query, "deep_analyzer")
+
+    latencies = []
+    for i in range(iterations):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        await engine.get_personalized_prompt(USER_ID, "base", query, "deep_analyzer")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    await manager.close()
+    return latencies
+
+
+async def _main(doc_count: int, iterations: int) -> None:
+    modes = [
+        ("per-search get_or_create + count", _LegacyVectorStore),
+        ("cached handles + counts", VectorStore),
+    ]
+    baseline: float | None = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, store_cls) in enumerate(modes):
+            root = Path(tmp) / f"mode-{i}"
+            latencies = await _run_mode(root, store_cls, doc_count, iterations)
+            p50 = statistics.median(latencies)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            baseline = baseline or p50
+            print(
+                f"{label:<34} p50={p50:7.2f} ms  p95={p95:7.2f} ms"
+                f"  speedup={baseline / p50:5.2f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--docs", type=int, default=200, help="每種 collection 的文件數"
+    )
+    parser.add_argument("--iterations", type=int, default=200, help="量測次數")
+    args = parser.parse_args()
+    asyncio.run(_main(args.docs, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
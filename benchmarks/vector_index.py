@@ -0,0 +1,122 @@
+"""向量索引基準測試
+
+在 1k / 10k / 100k 個隨機單位向量上比較 Chroma collection 與 NumpyIndex
+(memory-mapped 矩陣 + argpartition 暴力搜尋)：寫入耗時、top-k 查詢延遲，
+以及 Chroma (HNSW 近似搜尋) 相對精確結果的 recall。
+
+直接呼叫 collection 介面，不含 embedding 計算。
+
+執行:
+    uv run python -m benchmarks.vector_index [--sizes 1000,10000,100000] [--dim 512]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+from src.memory.storage.numpy_index import NumpyIndexClient
+from src.utils.config import settings
+
+# Chroma 單次 upsert 的筆數上限約 5461
+BATCH_SIZE = 5000
+
+
+def _load(collection, vectors: np.ndarray) -> float:
+    """分批寫入，回傳耗時 (秒)"""
+    start = time.perf_counter()
+    for i in range(0, len(vectors), BATCH_SIZE):
+        batch = vectors[i : i + BATCH_SIZE]
+        ids = [str(j) for j in range(i, i + len(batch))]
+        collection.upsert(
+            ids=ids,
+            embeddings=batch.tolist(),
+            documents=[f"doc {j}" for j in ids],
+            metadatas=[{"row": int(j)} for j in ids],
+        )
+    return time.perf_counter() - start
+
+
+def _search(collection, queries: np.ndarray, k: int) -> tuple[list[float], list]:
+    """回傳每次查詢的耗時 (毫秒) 與結果 ID"""
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(
+            query_embeddings=[query.tolist()],
+            n_results=k,
+            include=["metadatas", "distances"],
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(set(result["ids"][0]))
+    return latencies, results
+
+
+def _run_size(
+    root: Path, size: int, dim: int, queries: int, k: int, rng: np.random.Generator
+) -> None:
+    vectors = rng.standard_normal((size, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query_vectors = rng.standard_normal((queries, dim), dtype=np.float32)
+
+    backends = [
+        (
+            "chroma",
+            chromadb.PersistentClient(path=str(root / "chroma")).create_collection(
+                f"bench_{size}", metadata={"hnsw:space": "cosine"}
+            ),
+        ),
+        (
+            "numpy",
+            NumpyIndexClient(root / "numpy").get_or_create_collection(f"bench_{size}"),
+        ),
+    ]
+
+    ids: dict[str, list] = {}
+    baseline: float | None = None
+    for label, collection in backends:
+        load_seconds = _load(collection, vectors)
+        # 預熱
+        _search(collection, query_vectors[:5], k)
+        latencies, ids[label] = _search(collection, query_vectors, k)
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        baseline = baseline or p50
+        print(
+            f"{size:>7} {label:<7} load={load_seconds:7.2f} s"
+            f"  p50={p50:7.2f} ms  p95={p95:7.2f} ms"
+            f"  speedup={baseline / p50:6.2f}x"
+        )
+
+    # NumpyIndex 為精確搜尋，作為 recall 基準
+    recall = statistics.mean(
+        len(a & b) / k for a, b in zip(ids["chroma"], ids["numpy"], strict=True)
+    )
+    print(f"{size:>7} chroma recall@{k}={recall:.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="1000,10000,100000", help="以逗號分隔的向量數"
+    )
+    parser.add_argument(
+        "--dim", type=int, default=settings.local_embedding_dim, help="向量維度"
+    )
+    parser.add_argument("--queries", type=int, default=200, help="查詢次數")
+    parser.add_argument("-k", type=int, default=5, help="每次查詢的結果數")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",")):
+            _run_size(Path(tmp), size, args.dim, args.queries, args.k, rng)
+
+
+if __name__ == "__main__":
+    main()
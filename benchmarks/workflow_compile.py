@@ -0,0 +1,60 @@
+"""研究工作流編譯成本基準測試
+
+比較「每次請求重新編譯」與「使用快取的已編譯工作流」取得工作流的耗時。
+
+執行:
+    uv run python -m benchmarks.workflow_compile [--runs 50]
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from src.graph.research_graph import (
+    clear_workflow_cache,
+    create_research_workflow,
+    get_research_workflow,
+)
+
+
+def _measure(fn: Callable[[], object], runs: int) -> list[float]:
+    """執行 fn 多次並回傳每次耗時 (毫秒)"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<24} mean={statistics.mean(timings):8.3f} ms  "
+        f"median={statistics.median(timings):8.3f} ms  max={max(timings):8.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50, help="每種模式的執行次數")
+    args = parser.parse_args()
+
+    uncached = _measure(create_research_workflow, args.runs)
+
+    clear_workflow_cache()
+    start = time.perf_counter()
+    get_research_workflow()
+    first = (time.perf_counter() - start) * 1000
+    cached = _measure(get_research_workflow, args.runs)
+
+    _report("compile per request", uncached)
+    print(f"{'cached (first call)':<24} {first:8.3f} ms")
+    _report("cached", cached)
+    print(
+        f"speedup: {statistics.mean(uncached) / max(statistics.mean(cached), 1e-6):.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
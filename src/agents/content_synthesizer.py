@@ -4,14 +4,18 @@
 """
 
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime, timezone
+from typing import Any
 
 from pydantic import BaseModel, Field
 
 from src.agents.base import AgentContext, AgentResult, BaseAgent
 from src.models.content import AnalysisResult, ContentItem
 from src.models.video_material import PlatformVariant, SourceItem, VideoMaterial
-from src.utils.llm_factory import create_chat_model
+from src.utils.llm_cache import cached_structured_invoke, cached_structured_stream
+from src.utils.llm_factory import get_chat_model
 
 logger = logging.getLogger(__name__)
 
@@ -122,19 +126,31 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
 
     將分析結果轉化為完整的 VideoMaterial。
     LLM 負責創意內容，代碼負責結構化資料 (sources, platform_variants)。
+
+    提供 on_field 時使用串流模式：LLM 每輸出完一個欄位就呼叫 on_field(欄位, 值)，
+    UI 可先顯示 hook_line、title_suggestion 等欄位；最終的 VideoMaterial 與非串流模式相同。
+
+    Args:
+        llm: Chat 模型，預設使用 get_chat_model()
+        on_field: 串流模式的欄位完成回呼
     """
 
     name = "content_synthesizer"
     description = "影片素材合成代理"
 
-    def __init__(self, llm=None) -> None:
+    def __init__(
+        self,
+        llm=None,
+        on_field: Callable[[str, Any], None] | None = None,
+    ) -> None:
         super().__init__()
         self._llm = llm
+        self._on_field = on_field
 
     async def initialize(self) -> None:
         """初始化 LLM"""
         if self._llm is None:
-            self._llm = create_chat_model()
+            self._llm = get_chat_model()
         self._initialized = True
 
     async def run(
@@ -142,7 +158,11 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
         input_data: ContentSynthesizerInput,
         context: AgentContext | None = None,
     ) -> AgentResult[VideoMaterial]:
-        """執行內容合成"""
+        """執行內容合成
+
+        metadata 記錄 streamed、time_to_first_field_ms 與 synthesis_ms
+        (非串流模式所有欄位同時完成，首個欄位時間等於總時間)。
+        """
         analysis = input_data.analysis
 
         prompt = SYNTHESIZER_SYSTEM_PROMPT.format(
@@ -155,9 +175,24 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
             tone=input_data.tone,
         )
 
-        structured_llm = self._llm.with_structured_output(LLMVideoOutput)
+        start = time.perf_counter()
+        first_field_at: float | None = None
+
+        def on_field(field: str, value: Any) -> None:
+            nonlocal first_field_at
+            if first_field_at is None:
+                first_field_at = time.perf_counter()
+            self._on_field(field, value)
+
         try:
-            llm_output = await structured_llm.ainvoke(prompt)
+            if self._on_field is None:
+                llm_output = await cached_structured_invoke(
+                    self._llm, LLMVideoOutput, prompt
+                )
+            else:
+                llm_output = await cached_structured_stream(
+                    self._llm, LLMVideoOutput, prompt, on_field
+                )
         except Exception as e:
             logger.error("內容合成 LLM 呼叫失敗 (topic=%s): %s", input_data.topic, e)
             return AgentResult(
@@ -165,7 +200,23 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
                 error=f"AI 內容合成失敗: {type(e).__name__}",
             )
 
-        # 組合完整的 VideoMaterial
+        end = time.perf_counter()
+        metadata = {
+            "streamed": self._on_field is not None,
+            "time_to_first_field_ms": ((first_field_at or end) - start) * 1000,
+            "synthesis_ms": (end - start) * 1000,
+        }
+        return AgentResult(
+            success=True,
+            data=self._build_material(input_data, llm_output),
+            metadata=metadata,
+        )
+
+    def _build_material(
+        self, input_data: ContentSynthesizerInput, llm_output: LLMVideoOutput
+    ) -> VideoMaterial:
+        """由 LLM 輸出組合完整的 VideoMaterial (串流與非串流共用)"""
+        analysis = input_data.analysis
         sources = self._build_sources(input_data.content_items)
         platform_variants = self._build_platform_variants(
             input_data.target_platforms, llm_output.platform_tips
@@ -178,7 +229,7 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
             + 0.3 * min(1.0, len(input_data.content_items) / 10),
         )
 
-        video_material = VideoMaterial(
+        return VideoMaterial(
             topic=llm_output.topic,
             title_suggestion=llm_output.title_suggestion,
             hook_line=llm_output.hook_line,
@@ -195,8 +246,6 @@ class ContentSynthesizerAgent(BaseAgent[ContentSynthesizerInput, VideoMaterial])
             confidence_score=confidence,
         )
 
-        return AgentResult(success=True, data=video_material)
-
     def _build_sources(self, items: list[ContentItem]) -> list[SourceItem]:
         """從 ContentItem 建立 SourceItem 列表"""
         sources = []
@@ -1,15 +1,22 @@
 """深度分析代理
 
 使用 LLM 對收集到的內容進行深度分析，產出 AnalysisResult。
+內容量大時自動切換為 map-reduce 模式：分片並行分析後再合併。
 """
 
+import asyncio
 import logging
+import re
 
 from pydantic import BaseModel, Field
 
 from src.agents.base import AgentContext, AgentResult, BaseAgent
 from src.models.content import AnalysisResult, ContentItem
-from src.utils.llm_factory import create_chat_model
+from src.utils.config import settings
+from src.utils.context_packer import ContextPacker, PackedContext
+from src.utils.llm_cache import cached_structured_invoke
+from src.utils.llm_factory import get_chat_model
+from src.utils.text import tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +46,15 @@ ANALYSIS_SYSTEM_PROMPT = """你是一位專業的新聞與社群分析師，擅
 
 請用繁體中文回答。"""
 
-# 每篇來源的最大內容長度
-MAX_CONTENT_PER_SOURCE = 500
+# 合併後各欄位保留的最大數量
+MAX_MERGED_INSIGHTS = 7
+MAX_MERGED_CONTROVERSIES = 5
+MAX_MERGED_ANGLES = 5
+MAX_MERGED_HOOKS = 3
+MAX_MERGED_SENTIMENTS = 3
+
+# 兩句的詞彙 Jaccard 相似度超過此值視為重複
+DUPLICATE_SIMILARITY = 0.6
 
 
 class DeepAnalyzerInput(BaseModel):
@@ -52,12 +66,23 @@ class DeepAnalyzerInput(BaseModel):
     )
     language: str = Field(default="zh-TW", description="語言")
     depth: int = Field(default=2, ge=1, le=5, description="分析深度")
+    context_token_budget: int | None = Field(
+        default=None,
+        ge=1,
+        description="來源摘要 token 預算，預設使用 settings.analysis_context_tokens",
+    )
+    map_reduce: bool | None = Field(
+        default=None,
+        description="是否使用 map-reduce 模式；None 表示依內容量自動判斷",
+    )
 
 
 class DeepAnalyzerAgent(BaseAgent[DeepAnalyzerInput, AnalysisResult]):
     """深度分析代理
 
     使用 LLM 分析來自多個來源的內容，萃取洞察和趨勢。
+    項目數或估計 token 數超過門檻時，切分為多個分片並行分析 (map)，
+    再於本地合併去重 (reduce)，避免單一巨大 prompt 拖慢或超出 context 限制。
     """
 
     name = "deep_analyzer"
@@ -70,7 +95,7 @@ class DeepAnalyzerAgent(BaseAgent[DeepAnalyzerInput, AnalysisResult]):
     async def initialize(self) -> None:
         """初始化 LLM"""
         if self._llm is None:
-            self._llm = create_chat_model()
+            self._llm = get_chat_model()
         self._initialized = True
 
     async def run(
@@ -79,17 +104,21 @@ class DeepAnalyzerAgent(BaseAgent[DeepAnalyzerInput, AnalysisResult]):
         context: AgentContext | None = None,
     ) -> AgentResult[AnalysisResult]:
         """執行深度分析"""
-        content_summary = self._format_content_summary(input_data.content_items)
-
-        prompt = ANALYSIS_SYSTEM_PROMPT.format(
-            topic=input_data.topic,
-            depth=input_data.depth,
-            content_summary=content_summary,
-        )
+        budget = input_data.context_token_budget or settings.analysis_context_tokens
+        if self._should_map_reduce(input_data, budget):
+            return await self._run_map_reduce(input_data, budget)
+
+        packed = self._pack_context(input_data.content_items, budget)
+        if packed.truncated or packed.dropped:
+            logger.info(
+                "來源摘要超出預算 (topic=%s): 截斷 %d 筆，捨棄 %d 筆",
+                input_data.topic,
+                len(packed.truncated),
+                len(packed.dropped),
+            )
 
-        structured_llm = self._llm.with_structured_output(AnalysisResult)
         try:
-            analysis = await structured_llm.ainvoke(prompt)
+            analysis = await self._analyze(input_data, packed.text)
         except Exception as e:
             logger.error("深度分析 LLM 呼叫失敗 (topic=%s): %s", input_data.topic, e)
             return AgentResult(
@@ -102,30 +131,200 @@ class DeepAnalyzerAgent(BaseAgent[DeepAnalyzerInput, AnalysisResult]):
             update={"source_count": len(input_data.content_items)}
         )
 
-        return AgentResult(success=True, data=analysis)
+        return AgentResult(
+            success=True,
+            data=analysis,
+            metadata={"analysis_mode": "single", **packed.metadata()},
+        )
 
-    def _format_content_summary(self, items: list[ContentItem]) -> str:
-        """將 ContentItem 列表格式化為 LLM 可消化的摘要"""
-        if not items:
-            return "（無來源資料）"
+    async def _analyze(
+        self, input_data: DeepAnalyzerInput, content_summary: str
+    ) -> AnalysisResult:
+        """對一段來源摘要呼叫 LLM 產出分析"""
+        prompt = ANALYSIS_SYSTEM_PROMPT.format(
+            topic=input_data.topic,
+            depth=input_data.depth,
+            content_summary=content_summary,
+        )
+        return await cached_structured_invoke(self._llm, AnalysisResult, prompt)
 
-        summaries = []
-        for i, item in enumerate(items, 1):
-            content_preview = item.content[:MAX_CONTENT_PER_SOURCE]
-            if len(item.content) > MAX_CONTENT_PER_SOURCE:
-                content_preview += "..."
+    def _should_map_reduce(self, input_data: DeepAnalyzerInput, budget: int) -> bool:
+        """判斷是否使用 map-reduce 模式"""
+        if input_data.map_reduce is not None:
+            return input_data.map_reduce and len(input_data.content_items) > 1
 
-            source_info = f"[{item.source_type}] {item.source_name}"
-            engagement_info = ""
-            if item.engagement:
-                engagement_info = (
-                    f" (讚:{item.engagement.likes} 留言:{item.engagement.comments})"
-                )
+        items = input_data.content_items
+        if len(items) >= settings.analysis_map_reduce_min_items:
+            return True
+
+        packer = ContextPacker(token_budget=budget)
+        total_tokens = sum(packer.item_cost(item) for item in items)
+        return total_tokens > budget * settings.analysis_map_reduce_token_ratio
+
+    async def _run_map_reduce(
+        self, input_data: DeepAnalyzerInput, budget: int
+    ) -> AgentResult[AnalysisResult]:
+        """分片並行分析 (map)，再合併去重 (reduce)"""
+        packer = ContextPacker(token_budget=budget)
+        shards = packer.shard(input_data.content_items)
+        semaphore = asyncio.Semaphore(settings.analysis_map_concurrency)
+
+        async def analyze_shard(
+            shard: list[ContentItem],
+        ) -> tuple[AnalysisResult, PackedContext]:
+            packed = packer.pack(shard)
+            async with semaphore:
+                partial = await self._analyze(input_data, packed.text)
+            return partial.model_copy(update={"source_count": len(shard)}), packed
+
+        results = await asyncio.gather(
+            *(analyze_shard(shard) for shard in shards), return_exceptions=True
+        )
 
-            summaries.append(
-                f"{i}. {source_info}{engagement_info}\n"
-                f"   標題: {item.title}\n"
-                f"   內容: {content_preview}"
+        partials: list[AnalysisResult] = []
+        truncated: list[dict] = []
+        dropped: list[dict] = []
+        estimated_tokens = 0
+        failed = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                failed += 1
+                logger.warning(
+                    "深度分析分片失敗 (topic=%s): %s", input_data.topic, result
+                )
+                continue
+            partial, packed = result
+            partials.append(partial)
+            estimated_tokens += packed.estimated_tokens
+            truncated.extend(packed.truncated)
+            dropped.extend(packed.dropped)
+
+        if not partials:
+            error = next(r for r in results if isinstance(r, BaseException))
+            logger.error(
+                "深度分析 LLM 呼叫失敗 (topic=%s): %s", input_data.topic, error
+            )
+            return AgentResult(
+                success=False,
+                error=f"AI 深度分析失敗: {type(error).__name__}",
             )
 
-        return "\n\n".join(summaries)
+        analysis = merge_analyses(
+            input_data.topic, partials, source_count=len(input_data.content_items)
+        )
+        logger.info(
+            "map-reduce 分析完成 (topic=%s): %d 分片，%d 失敗",
+            input_data.topic,
+            len(shards),
+            failed,
+        )
+
+        return AgentResult(
+            success=True,
+            data=analysis,
+            metadata={
+                "analysis_mode": "map_reduce",
+                "shard_count": len(shards),
+                "failed_shards": failed,
+                "context_token_budget": budget,
+                "context_estimated_tokens": estimated_tokens,
+                "truncated_items": truncated,
+                "dropped_items": dropped,
+            },
+        )
+
+    def _pack_context(
+        self,
+        items: list[ContentItem],
+        token_budget: int | None = None,
+    ) -> PackedContext:
+        """在 token 預算內打包來源摘要"""
+        budget = token_budget or settings.analysis_context_tokens
+        return ContextPacker(token_budget=budget).pack(items)
+
+
+def merge_analyses(
+    topic: str,
+    partials: list[AnalysisResult],
+    source_count: int,
+) -> AnalysisResult:
+    """合併多個分片的分析結果
+
+    各列表欄位去除近似重複的句子後，依出現次數 (多個分片都提到的優先) 排序並截斷。
+    信心分數以各分片的來源數加權平均。
+
+    Args:
+        topic: 分析話題
+        partials: 各分片的分析結果
+        source_count: 總來源數
+
+    Returns:
+        合併後的 AnalysisResult
+    """
+    total_sources = sum(p.source_count for p in partials) or len(partials)
+    confidence = (
+        sum(p.confidence_score * (p.source_count or 1) for p in partials)
+        / total_sources
+        if partials
+        else 0.0
+    )
+
+    sentiments = _dedup_ranked(
+        [[p.sentiment_summary] for p in partials if p.sentiment_summary]
+    )
+
+    return AnalysisResult(
+        topic=topic,
+        key_insights=_dedup_ranked([p.key_insights for p in partials])[
+            :MAX_MERGED_INSIGHTS
+        ],
+        controversies=_dedup_ranked([p.controversies for p in partials])[
+            :MAX_MERGED_CONTROVERSIES
+        ],
+        trending_angles=_dedup_ranked([p.trending_angles for p in partials])[
+            :MAX_MERGED_ANGLES
+        ],
+        sentiment_summary="；".join(sentiments[:MAX_MERGED_SENTIMENTS]),
+        recommended_hooks=_dedup_ranked([p.recommended_hooks for p in partials])[
+            :MAX_MERGED_HOOKS
+        ],
+        source_count=source_count,
+        confidence_score=min(1.0, max(0.0, confidence)),
+    )
+
+
+def _dedup_ranked(groups: list[list[str]]) -> list[str]:
+    """合併多組句子並去除近似重複
+
+    Args:
+        groups: 每個分片的句子列表
+
+    Returns:
+        去重後的句子，依被提及次數由多到少排序 (同次數保留原順序)
+    """
+    merged: list[tuple[str, set[str]]] = []
+    counts: list[int] = []
+
+    for group in groups:
+        for sentence in group:
+            text = sentence.strip()
+            if not text:
+                continue
+            tokens = set(tokenize(text)) or {re.sub(r"\s+", "", text)}
+            for i, (_, existing) in enumerate(merged):
+                if _jaccard(tokens, existing) >= DUPLICATE_SIMILARITY:
+                    counts[i] += 1
+                    break
+            else:
+                merged.append((text, tokens))
+                counts.append(1)
+
+    order = sorted(range(len(merged)), key=lambda i: -counts[i])
+    return [merged[i][0] for i in order]
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    """兩個詞彙集合的 Jaccard 相似度"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
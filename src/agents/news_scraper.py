@@ -27,6 +27,10 @@ class NewsScraperInput(BaseModel):
     max_results_per_source: int = Field(
         default=10, ge=1, le=50, description="每來源最大結果數"
     )
+    covered_queries: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description="已由其他流程搜尋過、不需重複搜尋的查詢 (來源名稱 -> 查詢)",
+    )
 
 
 class NewsScraperOutput(BaseModel):
@@ -122,7 +126,9 @@ class NewsScraperAgent(BaseAgent[NewsScraperInput, NewsScraperOutput]):
         """為單一查詢建立搜尋任務"""
         tasks = []
 
-        if self._has_google:
+        if self._has_google and query not in input_data.covered_queries.get(
+            "google_news", []
+        ):
             tasks.append(self._search_google_news(query, input_data))
 
         if self._newsapi_key:
@@ -10,7 +10,11 @@ from pydantic import BaseModel, Field
 
 from src.agents.base import AgentContext, AgentResult, BaseAgent
 from src.models.content import ContentItem
-from src.scrapers.linkedin import LinkedInScraper
+from src.scrapers.linkedin import (
+    LinkedInBatchResult,
+    LinkedInScraper,
+    LinkedInURLHandler,
+)
 from src.scrapers.ptt import PTTScraper
 from src.scrapers.threads import ThreadsScraper
 
@@ -37,6 +41,10 @@ class SocialMediaInput(BaseModel):
         default_factory=lambda: ["Gossiping", "Stock", "Tech_Job"],
         description="PTT 看板列表",
     )
+    covered_queries: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description="已由其他流程搜尋過、不需重複搜尋的查詢 (來源名稱 -> 查詢)",
+    )
 
 
 class SocialMediaOutput(BaseModel):
@@ -65,6 +73,8 @@ class SocialMediaAgent(BaseAgent[SocialMediaInput, SocialMediaOutput]):
 
     def __init__(self) -> None:
         super().__init__()
+        # 保留 handler 以便同一代理實例重複使用已解析頁面的快取
+        self._linkedin_handler: LinkedInURLHandler | None = None
 
     async def run(
         self,
@@ -81,7 +91,10 @@ class SocialMediaAgent(BaseAgent[SocialMediaInput, SocialMediaOutput]):
 
         # PTT 任務
         if "ptt" in input_data.platforms:
+            covered = input_data.covered_queries.get("ptt", [])
             for query in input_data.queries:
+                if query in covered:
+                    continue
                 for board in input_data.ptt_boards:
                     tasks.append(
                         self._search_ptt(
@@ -96,10 +109,9 @@ class SocialMediaAgent(BaseAgent[SocialMediaInput, SocialMediaOutput]):
                     self._search_threads(query, input_data.max_results_per_source)
                 )
 
-        # LinkedIn 任務 (僅處理提供的 URL)
-        if "linkedin" in input_data.platforms:
-            for url in input_data.linkedin_urls:
-                tasks.append(self._fetch_linkedin(url))
+        # LinkedIn 任務 (僅處理提供的 URL，整批共用一個客戶端)
+        if "linkedin" in input_data.platforms and input_data.linkedin_urls:
+            tasks.append(self._fetch_linkedin(input_data.linkedin_urls))
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -107,6 +119,14 @@ class SocialMediaAgent(BaseAgent[SocialMediaInput, SocialMediaOutput]):
             if isinstance(result, Exception):
                 errors.append(str(result))
                 logger.warning("社群抓取任務失敗: %s", result)
+            elif isinstance(result, LinkedInBatchResult):
+                social_items.extend(result.items)
+                errors.extend(
+                    f"LinkedIn {url}: {reason}"
+                    for url, reason in result.failures.items()
+                )
+                if result.items and "linkedin" not in sources_used:
+                    sources_used.append("linkedin")
             elif isinstance(result, tuple):
                 source_name, items, item_type = result
                 if item_type == "forum":
@@ -165,15 +185,13 @@ class SocialMediaAgent(BaseAgent[SocialMediaInput, SocialMediaOutput]):
 
     async def _fetch_linkedin(
         self,
-        url: str,
-    ) -> tuple[str, list[ContentItem], str]:
-        """抓取 LinkedIn URL"""
-        scraper = LinkedInScraper()
+        urls: list[str],
+    ) -> LinkedInBatchResult:
+        """批次抓取 LinkedIn URL (正規化去重、並行、逐筆回報失敗)"""
+        if self._linkedin_handler is None:
+            self._linkedin_handler = LinkedInURLHandler(scraper=LinkedInScraper())
         try:
-            async with scraper:
-                item = await scraper.get_post(url)
-            items = [item] if item else []
-            return ("linkedin", items, "social")
+            return await self._linkedin_handler.process_urls(urls)
         except Exception as e:
             logger.warning("LinkedIn 抓取失敗: %s", e)
             raise
@@ -1,15 +1,20 @@
 """研究主管代理
 
 負責將使用者話題分解為可搜尋的子查詢，並決定搜尋策略。
+低深度研究使用本地關鍵字模板分解 (不呼叫 LLM)；LLM 逾時或無法使用時也會退回本地分解。
 """
 
+import asyncio
 import logging
 
 from pydantic import BaseModel, Field
 
 from src.agents.base import AgentContext, AgentResult, BaseAgent
 from src.models.content import ResearchRequest
-from src.utils.llm_factory import create_chat_model
+from src.utils.config import settings
+from src.utils.llm_cache import cached_structured_invoke
+from src.utils.llm_factory import get_chat_model
+from src.utils.text import estimate_tokens, extract_keywords
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +46,19 @@ DECOMPOSE_SYSTEM_PROMPT = """你是研究主管，負責將話題分解為可搜
 請用繁體中文回答。"""
 
 
+# 本地分解的查詢模板 (依序取用，數量由 depth 決定)
+FACT_QUERY_TEMPLATE = "{keywords} 最新消息"  # 核心事實 (新聞)
+REACTION_QUERY_TEMPLATE = "{keywords} 網友反應"  # 公眾反應 (社群/論壇)
+BROAD_QUERY_TEMPLATE = "{keywords}"  # 關鍵字本身
+
+# 子查詢中關鍵字部分的 token 上限 (CJK 約 1 字 1 token，保留模板字數)
+MAX_KEYWORD_TOKENS = 10
+
+HEURISTIC_SEARCH_STRATEGY = (
+    "本地關鍵字分解：以新聞搜尋核心事實，以社群/論壇搜尋公眾反應"
+)
+
+
 class SubQueryPlan(BaseModel):
     """子查詢計劃"""
 
@@ -79,18 +97,56 @@ class SupervisorAgent(BaseAgent[SupervisorInput, SupervisorOutput]):
         self._llm = llm
 
     async def initialize(self) -> None:
-        """初始化 LLM"""
-        if self._llm is None:
-            self._llm = create_chat_model()
+        """初始化 (LLM 延遲到需要時才建立，本地分解不需要 LLM)"""
         self._initialized = True
 
+    def _get_llm(self):
+        """取得 LLM (首次使用時建立)"""
+        if self._llm is None:
+            self._llm = get_chat_model()
+        return self._llm
+
     async def run(
         self,
         input_data: SupervisorInput,
         context: AgentContext | None = None,
     ) -> AgentResult[SupervisorOutput]:
-        """執行查詢分解"""
+        """執行查詢分解
+
+        depth <= settings.supervisor_heuristic_max_depth 時直接使用本地分解；
+        否則呼叫 LLM，逾時或失敗時 (settings.supervisor_llm_fallback) 退回本地分解。
+        """
         request = input_data.request
+
+        if request.depth <= settings.supervisor_heuristic_max_depth:
+            return self._heuristic_result(request, "heuristic")
+
+        try:
+            plan = await self._decompose_with_llm(request)
+        except Exception as e:
+            if settings.supervisor_llm_fallback and extract_keywords(request.topic):
+                logger.warning(
+                    "查詢分解 LLM 呼叫失敗，改用本地分解 (topic=%s): %r",
+                    request.topic,
+                    e,
+                )
+                return self._heuristic_result(
+                    request, "heuristic_fallback", fallback_reason=type(e).__name__
+                )
+            logger.error("查詢分解 LLM 呼叫失敗 (topic=%s): %s", request.topic, e)
+            return AgentResult(
+                success=False,
+                error=f"AI 查詢分解失敗: {type(e).__name__}",
+            )
+
+        output = SupervisorOutput(
+            plan=plan,
+            original_request=request,
+        )
+        return AgentResult(success=True, data=output, metadata={"decomposer": "llm"})
+
+    async def _decompose_with_llm(self, request: ResearchRequest) -> SubQueryPlan:
+        """以 LLM 分解查詢 (超過 settings.supervisor_llm_timeout_seconds 視為逾時)"""
         depth = request.depth
 
         min_queries = max(2, depth)
@@ -104,18 +160,63 @@ class SupervisorAgent(BaseAgent[SupervisorInput, SupervisorOutput]):
             max_queries=max_queries,
         )
 
-        structured_llm = self._llm.with_structured_output(SubQueryPlan)
-        try:
-            plan = await structured_llm.ainvoke(prompt)
-        except Exception as e:
-            logger.error("查詢分解 LLM 呼叫失敗 (topic=%s): %s", request.topic, e)
-            return AgentResult(
-                success=False,
-                error=f"AI 查詢分解失敗: {type(e).__name__}",
-            )
+        invoke = cached_structured_invoke(self._get_llm(), SubQueryPlan, prompt)
+        timeout = settings.supervisor_llm_timeout_seconds
+        if timeout:
+            return await asyncio.wait_for(invoke, timeout=timeout)
+        return await invoke
 
-        output = SupervisorOutput(
-            plan=plan,
-            original_request=request,
+    def _heuristic_result(
+        self,
+        request: ResearchRequest,
+        decomposer: str,
+        fallback_reason: str | None = None,
+    ) -> AgentResult[SupervisorOutput]:
+        """以本地分解產生結果"""
+        plan = heuristic_decompose(request)
+        metadata = {"decomposer": decomposer}
+        if fallback_reason:
+            metadata["fallback_reason"] = fallback_reason
+        return AgentResult(
+            success=True,
+            data=SupervisorOutput(plan=plan, original_request=request),
+            metadata=metadata,
         )
-        return AgentResult(success=True, data=output)
+
+
+def heuristic_decompose(request: ResearchRequest) -> SubQueryPlan:
+    """不呼叫 LLM，以關鍵字抽取加上模板分解話題
+
+    依序產生「核心事實」、「公眾反應」、「關鍵字本身」三種查詢，
+    數量與 LLM 分解相同 (至少 2 個，depth 越高越多，最多 3 個模板)。
+    抽不出關鍵字時以原始話題代替。
+
+    Args:
+        request: 研究請求
+
+    Returns:
+        SubQueryPlan
+    """
+    keywords = _join_keywords(extract_keywords(request.topic)) or request.topic.strip()
+    templates = [FACT_QUERY_TEMPLATE, REACTION_QUERY_TEMPLATE, BROAD_QUERY_TEMPLATE]
+    query_count = min(len(templates), max(2, request.depth))
+
+    queries = list(
+        dict.fromkeys(t.format(keywords=keywords) for t in templates[:query_count])
+    )
+    return SubQueryPlan(
+        sub_queries=queries,
+        search_strategy=HEURISTIC_SEARCH_STRATEGY,
+        recommended_sources=list(request.sources),
+    )
+
+
+def _join_keywords(keywords: list[str]) -> str:
+    """串接關鍵字，超過 MAX_KEYWORD_TOKENS 時捨棄後面的關鍵字 (至少保留一個)"""
+    selected: list[str] = []
+    for keyword in keywords:
+        candidate = " ".join([*selected, keyword])
+        if selected and estimate_tokens(candidate) > MAX_KEYWORD_TOKENS:
+            break
+        selected.append(keyword)
+    return " ".join(selected)
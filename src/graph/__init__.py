@@ -1,15 +1,30 @@
 """LangGraph 工作流模組"""
 
+from src.graph.checkpoint import SQLiteCheckpointer, get_checkpointer
+from src.graph.events import ResearchEvent
 from src.graph.research_graph import (
     build_research_graph,
+    clear_workflow_cache,
     create_research_workflow,
+    get_research_workflow,
+    resume_research,
     run_research,
+    stream_research,
+    warm_up_workflow,
 )
 from src.graph.state import ResearchState
 
 __all__ = [
+    "ResearchEvent",
     "ResearchState",
+    "SQLiteCheckpointer",
     "build_research_graph",
+    "clear_workflow_cache",
     "create_research_workflow",
+    "get_checkpointer",
+    "get_research_workflow",
+    "resume_research",
     "run_research",
+    "stream_research",
+    "warm_up_workflow",
 ]
@@ -0,0 +1,557 @@
+"""研究工作流檢查點
+
+以 SQLite 保存 LangGraph 每個節點完成後的狀態，讓失敗的研究可以從失敗的節點繼續，
+不必重新抓取與分析。
+
+- 每個 channel 的值只在版本變更時寫入一次 (blob)，未變更的大型列表不會重複儲存
+- channel 版本附帶隨機後綴，從舊檢查點分岔 (例如續跑) 時不會覆寫原分支的 blob
+- ContentItem 列表與 AnalysisResult 以精簡格式 (省略預設值) 序列化，較大的內容再以 zlib 壓縮
+- 超過保存期限的執行紀錄會定期清除
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.models.content import AnalysisResult, ContentItem
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 超過此大小的序列化資料以 zlib 壓縮
+COMPRESS_MIN_BYTES = 512
+
+# 精簡序列化標記
+_CONTENT_ITEMS_KEY = "__content_items__"
+_ANALYSIS_KEY = "__analysis__"
+_ZLIB_SUFFIX = "+zlib"
+
+# 允許從檢查點還原的專案型別
+_ALLOWED_MSGPACK_MODULES = [
+    ("src.models.content", "ResearchRequest"),
+    ("src.models.content", "QuorumPolicy"),
+    ("src.models.content", "ContentItem"),
+    ("src.models.content", "AnalysisResult"),
+    ("src.models.content", "EngagementMetrics"),
+    ("src.models.video_material", "VideoMaterial"),
+]
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints(created_at);
+"""
+
+
+class CompactSerializer:
+    """精簡的檢查點序列化器
+
+    包裝 JsonPlusSerializer：
+    - ContentItem 列表與 AnalysisResult 轉為省略預設值的 JSON 相容 dict
+    - 序列化後超過 COMPRESS_MIN_BYTES 的資料以 zlib 壓縮
+    """
+
+    def __init__(self, compress_min_bytes: int = COMPRESS_MIN_BYTES) -> None:
+        self._inner = JsonPlusSerializer(
+            allowed_msgpack_modules=_ALLOWED_MSGPACK_MODULES
+        )
+        self.compress_min_bytes = compress_min_bytes
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = self._inner.dumps_typed(_encode(obj))
+        if len(data) >= self.compress_min_bytes:
+            return type_ + _ZLIB_SUFFIX, zlib.compress(data)
+        return type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith(_ZLIB_SUFFIX):
+            type_ = type_.removesuffix(_ZLIB_SUFFIX)
+            payload = zlib.decompress(payload)
+        return _decode(self._inner.loads_typed((type_, payload)))
+
+
+def _encode(obj: Any) -> Any:
+    """將 ContentItem 列表與 AnalysisResult 轉為精簡 dict"""
+    if isinstance(obj, AnalysisResult):
+        return {_ANALYSIS_KEY: obj.model_dump(mode="json", exclude_defaults=True)}
+    if isinstance(obj, list):
+        if obj and all(isinstance(i, ContentItem) for i in obj):
+            return {
+                _CONTENT_ITEMS_KEY: [
+                    i.model_dump(mode="json", exclude_defaults=True) for i in obj
+                ]
+            }
+        return [_encode(i) for i in obj]
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    return obj
+
+
+def _decode(obj: Any) -> Any:
+    """還原 _encode 產生的精簡格式"""
+    if isinstance(obj, dict):
+        if len(obj) == 1 and _CONTENT_ITEMS_KEY in obj:
+            return [ContentItem.model_validate(i) for i in obj[_CONTENT_ITEMS_KEY]]
+        if len(obj) == 1 and _ANALYSIS_KEY in obj:
+            return AnalysisResult.model_validate(obj[_ANALYSIS_KEY])
+        return {k: _decode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode(i) for i in obj]
+    return obj
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[str]):
+    """SQLite LangGraph 檢查點儲存
+
+    每次操作使用短暫的連線，不綁定特定事件迴圈或執行緒，
+    因此同一個實例可以跨 Streamlit 的多次 asyncio.run 重複使用。
+    非同步方法透過 asyncio.to_thread 執行。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        retention_seconds: int | None = None,
+        prune_interval_seconds: int | None = None,
+    ) -> None:
+        super().__init__(serde=CompactSerializer())
+        self.db_path = Path(db_path)
+        self.retention_seconds = (
+            retention_seconds
+            if retention_seconds is not None
+            else settings.checkpoint_retention_hours * 3600
+        )
+        self.prune_interval_seconds = (
+            prune_interval_seconds
+            if prune_interval_seconds is not None
+            else settings.checkpoint_prune_interval_seconds
+        )
+        self._last_prune = 0.0
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def get_next_version(self, current: str | int | None, channel: None) -> str:
+        """下一個 channel 版本 (可排序的字串，附隨機後綴)
+
+        blob 以 (channel, version) 為鍵；從較早的檢查點分岔時，新分支會產生
+        相同的遞增序號，隨機後綴避免覆寫原分支檢查點仍在引用的 blob。
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # === 連線 ===
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """開啟連線並在區塊結束時提交、關閉"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._schema_ready:
+                # aget_tuple / aput 等在不同執行緒執行，可能同時首次連線
+                with self._schema_lock:
+                    if not self._schema_ready:
+                        conn.executescript(_SCHEMA_SQL)
+                        self._schema_ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # === 讀取 ===
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """取得指定 (或最新的) 檢查點"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self._transaction() as conn:
+            if checkpoint_id:
+                row = conn.execute(
+                    """SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint,
+                              metadata_type, metadata
+                       FROM checkpoints
+                       WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?""",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    """SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint,
+                              metadata_type, metadata
+                       FROM checkpoints
+                       WHERE thread_id = ? AND checkpoint_ns = ?
+                       ORDER BY checkpoint_id DESC LIMIT 1""",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._build_tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """依時間由新到舊列出檢查點"""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"""SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                           type, checkpoint, metadata_type, metadata
+                    FROM checkpoints {where}
+                    ORDER BY checkpoint_id DESC""",
+                params,
+            ).fetchall()
+
+            results: list[CheckpointTuple] = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._build_tuple(conn, row[0], row[1], row[2:]))
+
+        yield from results
+
+    def _build_tuple(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Sequence[Any],
+    ) -> CheckpointTuple:
+        """由資料列組出 CheckpointTuple (含 channel 值與待處理寫入)"""
+        checkpoint_id, parent_id, type_, payload, metadata_type, metadata = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, payload))
+
+        channel_values: dict[str, Any] = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = conn.execute(
+                """SELECT type, blob FROM checkpoint_blobs
+                   WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?""",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if blob is not None and blob[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed((blob[0], blob[1]))
+
+        writes = conn.execute(
+            """SELECT task_id, channel, type, value FROM checkpoint_writes
+               WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+               ORDER BY task_path, task_id, idx""",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value in writes
+            ],
+        )
+
+    # === 寫入 ===
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """保存檢查點 (只寫入版本有變更的 channel)"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        values = checkpoint.get("channel_values", {})
+        stored = {k: v for k, v in checkpoint.items() if k != "channel_values"}
+
+        blobs = []
+        for channel, version in new_versions.items():
+            type_, blob = (
+                self.serde.dumps_typed(values[channel])
+                if channel in values
+                else ("empty", None)
+            )
+            blobs.append((thread_id, checkpoint_ns, channel, str(version), type_, blob))
+        type_, payload = self.serde.dumps_typed(stored)
+        metadata_type, metadata_payload = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._transaction() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO checkpoint_blobs
+                   (thread_id, checkpoint_ns, channel, version, type, blob)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                blobs,
+            )
+            conn.execute(
+                """INSERT OR REPLACE INTO checkpoints
+                   (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                    type, checkpoint, metadata_type, metadata, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    type_,
+                    payload,
+                    metadata_type,
+                    metadata_payload,
+                    time.time(),
+                ),
+            )
+
+        self._maybe_prune()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """保存節點的中間寫入"""
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    configurable["thread_id"],
+                    configurable.get("checkpoint_ns", ""),
+                    configurable["checkpoint_id"],
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    blob,
+                    task_path,
+                )
+            )
+
+        # 特殊寫入 (錯誤、中斷等) 可覆寫；一般寫入已存在時保留原值
+        verb = (
+            "INSERT OR REPLACE"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE"
+        )
+        with self._transaction() as conn:
+            conn.executemany(
+                f"""{verb} INTO checkpoint_writes
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                     channel, type, value, task_path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """刪除某次執行的所有檢查點"""
+        with self._transaction() as conn:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    # === 清理 ===
+
+    def prune_expired(self, max_age_seconds: int | None = None) -> int:
+        """刪除最後更新時間超過保存期限的執行紀錄
+
+        Args:
+            max_age_seconds: 保存期限，預設使用 retention_seconds
+
+        Returns:
+            刪除的執行 (thread) 數
+        """
+        max_age = (
+            max_age_seconds if max_age_seconds is not None else self.retention_seconds
+        )
+        cutoff = time.time() - max_age
+        with self._transaction() as conn:
+            expired = [
+                row[0]
+                for row in conn.execute(
+                    """SELECT thread_id FROM checkpoints
+                       GROUP BY thread_id HAVING MAX(created_at) < ?""",
+                    (cutoff,),
+                ).fetchall()
+            ]
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                conn.executemany(
+                    f"DELETE FROM {table} WHERE thread_id = ?",
+                    [(thread_id,) for thread_id in expired],
+                )
+        self._last_prune = time.time()
+        if expired:
+            logger.info("已清除 %d 筆過期的研究檢查點", len(expired))
+        return len(expired)
+
+    def _maybe_prune(self) -> None:
+        """距離上次清理超過 prune_interval_seconds 時執行清理"""
+        if not self.retention_seconds or not self.prune_interval_seconds:
+            return
+        if time.time() - self._last_prune < self.prune_interval_seconds:
+            return
+        try:
+            self.prune_expired()
+        except sqlite3.Error as e:
+            logger.warning("清除過期檢查點失敗: %s", e)
+
+    # === 非同步介面 ===
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+@lru_cache
+def get_checkpointer() -> SQLiteCheckpointer:
+    """取得全域檢查點儲存 (單例，位於 settings.checkpoint_db_path)"""
+    return SQLiteCheckpointer(settings.checkpoint_db_path)
@@ -3,16 +3,21 @@
 定義節點之間的路由決策。
 """
 
+from src.graph.quorum import discard_gate
+from src.graph.speculation import discard_speculation
 from src.graph.state import ResearchState
 
+# 查詢分解後並行執行的抓取節點
+SCRAPER_NODES = ["news_scraper", "social_media"]
 
-def should_continue_after_supervisor(state: ResearchState) -> str:
-    """主管節點後的路由"""
+
+def should_continue_after_supervisor(state: ResearchState) -> str | list[str]:
+    """主管節點後的路由 (成功時並行分派到所有抓取節點)"""
     if state.get("error"):
         return "error_handler"
     if not state.get("sub_queries"):
         return "error_handler"
-    return "news_scraper"
+    return SCRAPER_NODES
 
 
 def should_continue_after_scraping(state: ResearchState) -> str:
@@ -36,13 +41,26 @@ def should_continue_after_analysis(state: ResearchState) -> str:
     return "content_synthesizer"
 
 
+async def scrape_join_node(state: ResearchState) -> dict:
+    """抓取匯合節點: 等待所有並行抓取節點完成"""
+    # 取消未被抓取節點取回的推測性搜尋
+    discard_speculation(state.get("run_id"))
+    return {
+        "current_step": "scraping_complete",
+        "execution_log": [
+            f"Scraping complete: {state.get('total_sources_scraped', 0)} items"
+        ],
+    }
+
+
 async def error_handler_node(state: ResearchState) -> dict:
     """錯誤處理節點"""
+    discard_gate(state.get("run_id"))
     error_msg = state.get("error") or _infer_error(state)
     return {
         "error": error_msg,
         "current_step": "error",
-        "execution_log": state.get("execution_log", []) + [f"ERROR: {error_msg}"],
+        "execution_log": [f"ERROR: {error_msg}"],
     }
 
 
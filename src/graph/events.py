@@ -0,0 +1,55 @@
+"""研究工作流進度事件
+
+stream_research 在每個節點開始與結束時產出 ResearchEvent，供 UI 即時顯示進度。
+內容合成節點以串流模式執行時，每個影片素材欄位完成時另產出 field 事件。
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+# 節點名稱 -> 完成後的 current_step
+NODE_STEPS: dict[str, str] = {
+    "supervisor": "queries_decomposed",
+    "news_scraper": "news_scraped",
+    "social_media": "social_scraped",
+    "deep_analyzer": "analysis_complete",
+    "content_synthesizer": "complete",
+}
+
+# 計入 item_count 的 state 欄位
+ITEM_FIELDS = ("news_results", "social_results", "forum_results", "web_results")
+
+
+class ResearchEvent(BaseModel):
+    """研究進度事件"""
+
+    kind: Literal["node_start", "node_end", "field", "run_end"] = Field(
+        ..., description="事件類型"
+    )
+    node: str | None = Field(default=None, description="節點名稱")
+    run_id: str = Field(..., description="執行 ID")
+    elapsed_ms: float = Field(default=0.0, description="自執行開始經過的毫秒數")
+    duration_ms: float | None = Field(
+        default=None, description="節點執行時間 (node_end)"
+    )
+    item_count: int | None = Field(
+        default=None, description="節點新增的內容數 (node_end，抓取節點)"
+    )
+    current_step: str | None = Field(default=None, description="節點回報的步驟")
+    error: str | None = Field(default=None, description="錯誤訊息")
+    field: str | None = Field(default=None, description="完成的影片素材欄位 (field)")
+    value: Any = Field(default=None, description="欄位值 (field)")
+    state: dict[str, Any] | None = Field(
+        default=None, description="最終 ResearchState (run_end)"
+    )
+
+
+def count_items(update: dict[str, Any] | None) -> int | None:
+    """計算節點更新中新增的內容數；沒有內容欄位時回傳 None"""
+    if not update:
+        return None
+    lists = [update[k] for k in ITEM_FIELDS if isinstance(update.get(k), list)]
+    if not lists:
+        return None
+    return sum(len(items) for items in lists)
@@ -1,46 +1,142 @@
 """LangGraph 圖節點實作
 
 每個節點是一個函式，接收 ResearchState 並回傳部分更新的 dict。
+execution_log 與 total_sources_scraped 由 reducer 累加，節點只回傳本次新增的部分。
 """
 
+import asyncio
 import logging
+from collections.abc import Callable
+from typing import Any
+
+from langgraph.config import get_config, get_stream_writer
 
 from src.agents.content_synthesizer import (
     ContentSynthesizerAgent,
     ContentSynthesizerInput,
 )
-from src.agents.deep_analyzer import DeepAnalyzerAgent, DeepAnalyzerInput
+from src.agents.deep_analyzer import (
+    DeepAnalyzerAgent,
+    DeepAnalyzerInput,
+    merge_analyses,
+)
 from src.agents.news_scraper import NewsScraperAgent, NewsScraperInput
 from src.agents.social_media import SocialMediaAgent, SocialMediaInput
 from src.agents.supervisor import SupervisorAgent, SupervisorInput
+from src.graph.events import ITEM_FIELDS
+from src.graph.quorum import (
+    QuorumGate,
+    discard_gate,
+    get_gate,
+    get_or_create_gate,
+    merge_updates,
+    update_items,
+)
+from src.graph.speculation import (
+    SpeculativeResult,
+    discard_speculation,
+    get_speculation,
+    merge_unique,
+    start_speculation,
+)
 from src.graph.state import ResearchState
+from src.utils.config import settings
+from src.utils.relevance import filter_by_relevance
 
 logger = logging.getLogger(__name__)
 
+# config["configurable"] 中的旗標：呼叫端會消費 custom 串流時 (stream_research) 設為 True
+STREAM_FIELDS_KEY = "stream_fields"
+
 
 async def supervisor_node(state: ResearchState) -> dict:
-    """主管節點: 分解查詢"""
+    """主管節點: 分解查詢
+
+    啟用 settings.speculative_scraping 時，分解查詢的同時以原始話題
+    先行搜尋 Google News 與 PTT，結果由後續抓取節點取回。
+    """
     request = state["request"]
+    run_id = state.get("run_id")
+    # 同一 run_id 重新執行時，清除上次遺留的 quorum 閘門
+    discard_gate(run_id)
+    speculation = (
+        start_speculation(run_id, request)
+        if settings.speculative_scraping and run_id
+        else None
+    )
+
     agent = SupervisorAgent()
     result = await agent(SupervisorInput(request=request))
 
     if not result.success:
+        discard_speculation(run_id)
         return {
             "error": result.error,
             "current_step": "supervisor_failed",
-            "execution_log": state.get("execution_log", [])
-            + [f"Supervisor failed: {result.error}"],
+            "execution_log": [f"Supervisor failed: {result.error}"],
         }
 
     plan = result.data.plan
+    log_entries = [
+        (
+            f"Decomposed into {len(plan.sub_queries)} sub-queries "
+            f"({result.metadata.get('decomposer', 'llm')}): {plan.sub_queries}"
+        )
+    ]
+    if speculation is not None:
+        cancelled = speculation.resolve(plan.sub_queries, plan.recommended_sources)
+        log_entries.append(
+            f"Speculative scraping on raw topic: kept {speculation.active_sources}, "
+            f"cancelled {cancelled}"
+        )
+
     return {
         "sub_queries": plan.sub_queries,
         "current_step": "queries_decomposed",
-        "execution_log": state.get("execution_log", [])
-        + [f"Decomposed into {len(plan.sub_queries)} sub-queries: {plan.sub_queries}"],
+        "execution_log": log_entries,
     }
 
 
+def _quorum_gate(state: ResearchState) -> QuorumGate | None:
+    """請求設定 quorum 策略時，取得本次執行共用的 quorum 閘門"""
+    policy = state["request"].quorum
+    run_id = state.get("run_id")
+    if policy is None or not run_id:
+        return None
+    return get_or_create_gate(run_id, policy)
+
+
+def _quorum_update(
+    gate: QuorumGate, updates: list[dict], late: list[str], step: str
+) -> dict:
+    """合併 quorum 閘門下各抓取任務的更新"""
+    update = merge_updates(updates)
+    update["current_step"] = step
+    if late:
+        update.setdefault("execution_log", []).append(
+            f"Quorum met ({gate.met_reason}) at {gate.met_after_ms:.0f} ms, "
+            f"continuing without {late}"
+        )
+    return update
+
+
+async def _no_speculation() -> None:
+    """未啟用推測性抓取時的佔位協程"""
+
+
+def _speculation_log(label: str, spec: SpeculativeResult, new_count: int) -> list[str]:
+    """推測性抓取的日誌項目 (含節省時間)"""
+    entries = [
+        (
+            f"{label} speculation: {len(spec.items)} items ({new_count} new) "
+            f"in {spec.duration_ms:.0f} ms, saved ~{spec.overlap_ms:.0f} ms "
+            f"by overlapping decomposition"
+        )
+    ]
+    entries.extend(f"{label} speculation error: {e}" for e in spec.errors)
+    return entries
+
+
 async def news_scraper_node(state: ResearchState) -> dict:
     """新聞抓取節點"""
     request = state["request"]
@@ -49,17 +145,34 @@ async def news_scraper_node(state: ResearchState) -> dict:
         return {
             "news_results": [],
             "current_step": "news_scraped",
-            "execution_log": state.get("execution_log", [])
-            + ["News: skipped (not in selected sources)"],
+            "execution_log": ["News: skipped (not in selected sources)"],
         }
 
+    gate = _quorum_gate(state)
+    if gate is None:
+        return await _scrape_news(state)
+
+    updates, late = await gate.run({"news": _scrape_news(state)})
+    return _quorum_update(gate, updates, late, "news_scraped")
+
+
+async def _scrape_news(state: ResearchState) -> dict:
+    """執行新聞抓取 (含推測性結果合併)"""
+    request = state["request"]
+    speculation = get_speculation(state.get("run_id"))
+    covered = speculation.covered_queries("news") if speculation else {}
+
     agent = NewsScraperAgent()
-    result = await agent(
-        NewsScraperInput(
-            queries=state["sub_queries"],
-            max_results_per_source=request.max_results_per_source,
-            language=request.language,
-        )
+    result, spec = await asyncio.gather(
+        agent(
+            NewsScraperInput(
+                queries=state["sub_queries"],
+                max_results_per_source=request.max_results_per_source,
+                language=request.language,
+                covered_queries=covered,
+            )
+        ),
+        speculation.collect("news") if speculation else _no_speculation(),
     )
 
     news_items = result.data.items if result.success else []
@@ -70,20 +183,24 @@ async def news_scraper_node(state: ResearchState) -> dict:
     ]
     if errors:
         log_entries.extend([f"News error: {e}" for e in errors])
+    if spec is not None:
+        merged = merge_unique(news_items, spec.items)
+        log_entries.extend(
+            _speculation_log("News", spec, len(merged) - len(news_items))
+        )
+        news_items = merged
 
     return {
         "news_results": news_items,
         "current_step": "news_scraped",
-        "total_sources_scraped": state.get("total_sources_scraped", 0)
-        + len(news_items),
-        "execution_log": state.get("execution_log", []) + log_entries,
+        "total_sources_scraped": len(news_items),
+        "execution_log": log_entries,
     }
 
 
 async def social_media_node(state: ResearchState) -> dict:
     """社群媒體抓取節點"""
     request = state["request"]
-    agent = SocialMediaAgent()
 
     platforms = []
     if "social" in request.sources:
@@ -96,37 +213,64 @@ async def social_media_node(state: ResearchState) -> dict:
             "forum_results": [],
             "social_results": [],
             "current_step": "social_scraped",
-            "execution_log": state.get("execution_log", [])
-            + ["Social: skipped (not in selected sources)"],
+            "execution_log": ["Social: skipped (not in selected sources)"],
         }
 
-    result = await agent(
-        SocialMediaInput(
-            queries=state["sub_queries"],
-            platforms=platforms,
-            language=request.language,
-            max_results_per_source=request.max_results_per_source,
-        )
+    gate = _quorum_gate(state)
+    if gate is None:
+        return await _scrape_social(state, platforms)
+
+    # 各平台分開執行，較慢的平台不會拖住其他平台的結果
+    updates, late = await gate.run(
+        {platform: _scrape_social(state, [platform]) for platform in platforms}
+    )
+    return _quorum_update(gate, updates, late, "social_scraped")
+
+
+async def _scrape_social(state: ResearchState, platforms: list[str]) -> dict:
+    """執行社群與論壇抓取 (含推測性結果合併)"""
+    request = state["request"]
+    agent = SocialMediaAgent()
+    speculation = get_speculation(state.get("run_id")) if "ptt" in platforms else None
+    covered = speculation.covered_queries("forum") if speculation else {}
+
+    result, spec = await asyncio.gather(
+        agent(
+            SocialMediaInput(
+                queries=state["sub_queries"],
+                platforms=platforms,
+                language=request.language,
+                max_results_per_source=request.max_results_per_source,
+                covered_queries=covered,
+            )
+        ),
+        speculation.collect("forum") if speculation else _no_speculation(),
     )
 
     forum_items = result.data.forum_items if result.success else []
     social_items = result.data.social_items if result.success else []
     errors = result.data.errors if result.success and result.data.errors else []
 
+    if spec is not None:
+        merged = merge_unique(forum_items, spec.items)
+        spec_log = _speculation_log("Forum", spec, len(merged) - len(forum_items))
+        forum_items = merged
+    else:
+        spec_log = []
+
     log_entries = [
         f"Social: {len(social_items)} items, Forum: {len(forum_items)} items"
     ]
     if errors:
         log_entries.extend([f"Social error: {e}" for e in errors])
+    log_entries.extend(spec_log)
 
     return {
         "forum_results": forum_items,
         "social_results": social_items,
         "current_step": "social_scraped",
-        "total_sources_scraped": state.get("total_sources_scraped", 0)
-        + len(forum_items)
-        + len(social_items),
-        "execution_log": state.get("execution_log", []) + log_entries,
+        "total_sources_scraped": len(forum_items) + len(social_items),
+        "execution_log": log_entries,
     }
 
 
@@ -139,44 +283,137 @@ async def deep_analyzer_node(state: ResearchState) -> dict:
     )
 
     request = state["request"]
+
+    # 本地相關性過濾，不相關的內容不送進 LLM
+    relevance = filter_by_relevance(
+        all_items, [request.topic, *state.get("sub_queries", [])]
+    )
+    relevance_log = (
+        f"Relevance filter: kept {len(relevance.kept)}/{len(all_items)} items "
+        f"(threshold={relevance.threshold})"
+    )
+
     agent = DeepAnalyzerAgent()
     result = await agent(
         DeepAnalyzerInput(
             topic=request.topic,
-            content_items=all_items,
+            content_items=relevance.kept,
             depth=request.depth,
             language=request.language,
         )
     )
 
     if not result.success:
+        discard_gate(state.get("run_id"))
         return {
             "error": result.error,
             "current_step": "analysis_failed",
-            "execution_log": state.get("execution_log", [])
-            + [f"Analysis failed: {result.error}"],
+            "relevant_items": relevance.kept,
+            "execution_log": [relevance_log, f"Analysis failed: {result.error}"],
         }
 
-    return {
+    context_log = (
+        f"Context packed: {result.metadata.get('context_estimated_tokens', 0)}"
+        f"/{result.metadata.get('context_token_budget', 0)} tokens, "
+        f"{len(result.metadata.get('truncated_items', []))} truncated, "
+        f"{len(result.metadata.get('dropped_items', []))} dropped"
+    )
+
+    update = {
         "analysis": result.data,
+        "relevant_items": relevance.kept,
         "current_step": "analysis_complete",
-        "execution_log": state.get("execution_log", [])
-        + [
-            f"Analysis complete: {len(result.data.key_insights)} insights, confidence={result.data.confidence_score}"
+        "execution_log": [
+            relevance_log,
+            context_log,
+            f"Analysis complete: {len(result.data.key_insights)} insights, confidence={result.data.confidence_score}",
         ],
     }
 
+    gate = get_gate(state.get("run_id"))
+    if gate is not None:
+        try:
+            update = await _apply_late_items(state, gate, update)
+        finally:
+            discard_gate(state.get("run_id"))
+    return update
+
+
+async def _apply_late_items(
+    state: ResearchState, gate: QuorumGate, update: dict
+) -> dict:
+    """處理 quorum 達成後才完成的抓取結果
+
+    依 QuorumPolicy.late_items 以遲到內容做一次增量補充分析並合併結果 (refine)，
+    或記錄為排除項目 (exclude)。補充分析失敗時遲到內容同樣記錄為排除。
+    """
+    late_updates, cancelled = await gate.collect_late()
+    late = merge_updates(late_updates)
+    late_items = update_items(late)
+
+    log = update["execution_log"]
+    log.extend(late.get("execution_log", []))
+    if cancelled:
+        log.append(f"Late sources cancelled: {cancelled}")
+    if not late_items:
+        return update
+
+    if gate.policy.late_items == "exclude":
+        update["excluded_items"] = late_items
+        log.append(f"Excluded {len(late_items)} late items (quorum policy)")
+        return update
+
+    request = state["request"]
+    relevance = filter_by_relevance(
+        late_items, [request.topic, *state.get("sub_queries", [])]
+    )
+    agent = DeepAnalyzerAgent()
+    result = await agent(
+        DeepAnalyzerInput(
+            topic=request.topic,
+            content_items=relevance.kept,
+            depth=request.depth,
+            language=request.language,
+            map_reduce=False,
+        )
+    )
+
+    if not result.success:
+        update["excluded_items"] = late_items
+        log.append(
+            f"Refinement failed, excluded {len(late_items)} late items: {result.error}"
+        )
+        return update
+
+    analysis = update["analysis"]
+    update["analysis"] = merge_analyses(
+        request.topic,
+        [analysis, result.data],
+        analysis.source_count + result.data.source_count,
+    )
+    update["relevant_items"] = update["relevant_items"] + relevance.kept
+    for field in ITEM_FIELDS:
+        if late.get(field):
+            update[field] = late[field]
+    update["total_sources_scraped"] = late.get("total_sources_scraped", 0)
+    log.append(
+        f"Refined with {len(relevance.kept)}/{len(late_items)} late items: "
+        f"{len(update['analysis'].key_insights)} insights"
+    )
+    return update
+
 
 async def content_synthesizer_node(state: ResearchState) -> dict:
     """內容合成節點"""
-    all_items = (
+    # 優先使用通過相關性過濾的內容作為來源
+    all_items = state.get("relevant_items") or (
         state.get("news_results", [])
         + state.get("social_results", [])
         + state.get("forum_results", [])
     )
 
     request = state["request"]
-    agent = ContentSynthesizerAgent()
+    agent = ContentSynthesizerAgent(on_field=_field_writer("content_synthesizer"))
     result = await agent(
         ContentSynthesizerInput(
             topic=request.topic,
@@ -190,13 +427,47 @@ async def content_synthesizer_node(state: ResearchState) -> dict:
         return {
             "error": result.error,
             "current_step": "synthesis_failed",
-            "execution_log": state.get("execution_log", [])
-            + [f"Synthesis failed: {result.error}"],
+            "execution_log": [f"Synthesis failed: {result.error}"],
         }
 
     return {
         "video_material": result.data,
         "current_step": "complete",
-        "execution_log": state.get("execution_log", [])
-        + [f"Synthesis complete: {result.data.title_suggestion}"],
+        "execution_log": [
+            f"Synthesis complete: {result.data.title_suggestion}"
+            + _synthesis_timing(result.metadata)
+        ],
     }
+
+
+def _field_writer(node: str) -> Callable[[str, Any], None] | None:
+    """取得回報串流欄位的函式
+
+    未啟用 settings.synthesis_streaming、呼叫端未要求串流欄位
+    (configurable 未設定 STREAM_FIELDS_KEY，例如 run_research)，
+    或不在 LangGraph 執行環境中 (例如直接呼叫節點) 時回傳 None，代理改用非串流模式。
+    """
+    if not settings.synthesis_streaming:
+        return None
+    try:
+        if not get_config().get("configurable", {}).get(STREAM_FIELDS_KEY):
+            return None
+        writer = get_stream_writer()
+    except RuntimeError:
+        return None
+
+    def write(field: str, value: Any) -> None:
+        writer({"node": node, "field": field, "value": value})
+
+    return write
+
+
+def _synthesis_timing(metadata: dict) -> str:
+    """合成耗時的日誌片段 (首個欄位 / 總時間)"""
+    if "synthesis_ms" not in metadata:
+        return ""
+    mode = "streamed" if metadata.get("streamed") else "blocking"
+    return (
+        f" ({mode}, first field {metadata['time_to_first_field_ms']:.0f} ms"
+        f" / total {metadata['synthesis_ms']:.0f} ms)"
+    )
@@ -0,0 +1,225 @@
+"""抓取 quorum 閘門
+
+ResearchRequest.quorum 設定時，抓取節點不再等待所有來源完成：
+只要已收集的內容達成 QuorumPolicy (N 筆且來自至少 K 種來源類型，或已等待 T 秒)，
+各抓取節點就以目前的結果結束，讓 deep_analyzer 提早開始。
+
+尚未完成的抓取任務成為「遲到任務」，在背景繼續執行。
+deep_analyzer 完成後取回遲到的內容，依策略做增量補充分析 (refine) 或記錄為排除 (exclude)。
+
+與推測性抓取相同，asyncio.Task 無法存入 state，閘門以 run_id 為鍵保存在模組層級的登錄表中。
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Any
+
+from src.graph.events import ITEM_FIELDS
+from src.models.content import ContentItem, QuorumPolicy
+
+logger = logging.getLogger(__name__)
+
+
+def update_items(update: dict[str, Any]) -> list[ContentItem]:
+    """取出節點更新中所有內容欄位的項目"""
+    items: list[ContentItem] = []
+    for field in ITEM_FIELDS:
+        items.extend(update.get(field) or [])
+    return items
+
+
+def merge_updates(updates: list[dict[str, Any]]) -> dict[str, Any]:
+    """合併多個抓取任務的部分更新 (列表串接、數量加總)"""
+    merged: dict[str, Any] = {}
+    for update in updates:
+        for field in (*ITEM_FIELDS, "execution_log"):
+            if field in update:
+                merged.setdefault(field, []).extend(update[field])
+        if "total_sources_scraped" in update:
+            merged["total_sources_scraped"] = (
+                merged.get("total_sources_scraped", 0) + update["total_sources_scraped"]
+            )
+    return merged
+
+
+class QuorumGate:
+    """單次執行的抓取 quorum 閘門
+
+    Args:
+        policy: quorum 策略
+    """
+
+    def __init__(self, policy: QuorumPolicy) -> None:
+        self.policy = policy
+        self.started_at = time.perf_counter()
+        self.item_count = 0
+        self.source_types: set[str] = set()
+        self.met_reason: str | None = None
+        self.met_after_ms: float | None = None
+        self._met = asyncio.Event()
+        self._late: dict[str, asyncio.Task] = {}
+
+    @property
+    def met(self) -> bool:
+        """是否已達成 quorum"""
+        return self._met.is_set()
+
+    @property
+    def late_sources(self) -> list[str]:
+        """達成 quorum 時仍未完成的抓取任務"""
+        return list(self._late)
+
+    def elapsed_ms(self) -> float:
+        """自閘門建立 (開始抓取) 起經過的毫秒數"""
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def record(self, update: dict[str, Any]) -> None:
+        """記錄抓取任務的結果並檢查是否達成 quorum"""
+        items = update_items(update)
+        self.item_count += len(items)
+        self.source_types.update(item.source_type for item in items)
+        if (
+            self.item_count >= self.policy.min_items
+            and len(self.source_types) >= self.policy.min_source_types
+        ):
+            self._mark_met(
+                f"{self.item_count} items from {len(self.source_types)} source types"
+            )
+
+    async def run(
+        self, jobs: dict[str, Awaitable[dict[str, Any]]]
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """並行執行抓取任務，直到全部完成或達成 quorum
+
+        Args:
+            jobs: 任務標籤 -> 回傳部分 state 更新的協程
+
+        Returns:
+            (已完成任務的更新, 轉為遲到任務的標籤)
+        """
+        tasks = {label: asyncio.ensure_future(job) for label, job in jobs.items()}
+        for task in tasks.values():
+            task.add_done_callback(self._on_done)
+
+        met_waiter = asyncio.create_task(self._met.wait())
+        try:
+            while not self.met:
+                pending = [t for t in tasks.values() if not t.done()]
+                if not pending:
+                    break
+                remaining = self._remaining_seconds()
+                if remaining is not None and remaining <= 0:
+                    # 逾時但尚無任何內容時，繼續等待第一個完成的任務
+                    if self.item_count:
+                        self._mark_met(f"{self.policy.max_wait_seconds}s elapsed")
+                        break
+                    remaining = None
+                await asyncio.wait(
+                    [*pending, met_waiter],
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        finally:
+            met_waiter.cancel()
+
+        updates: list[dict[str, Any]] = []
+        late: list[str] = []
+        for label, task in tasks.items():
+            if task.done():
+                updates.append(_task_update(label, task))
+            else:
+                self._late[label] = task
+                late.append(label)
+        return updates, late
+
+    async def collect_late(
+        self, timeout: float | None = None
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """取回遲到任務的結果，逾時仍未完成的任務會被取消
+
+        Args:
+            timeout: 最長等待秒數，預設使用 policy.late_grace_seconds
+
+        Returns:
+            (遲到任務的更新, 被取消的任務標籤)
+        """
+        if not self._late:
+            return [], []
+
+        _timeout = self.policy.late_grace_seconds if timeout is None else timeout
+        await asyncio.wait(self._late.values(), timeout=_timeout)
+
+        updates: list[dict[str, Any]] = []
+        cancelled: list[str] = []
+        for label, task in self._late.items():
+            if task.done():
+                updates.append(_task_update(label, task))
+            else:
+                task.cancel()
+                cancelled.append(label)
+        self._late.clear()
+        return updates, cancelled
+
+    def cancel(self) -> None:
+        """取消所有遲到任務"""
+        for task in self._late.values():
+            task.cancel()
+        self._late.clear()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.record(task.result())
+
+    def _remaining_seconds(self) -> float | None:
+        if self.policy.max_wait_seconds is None:
+            return None
+        return self.policy.max_wait_seconds - self.elapsed_ms() / 1000
+
+    def _mark_met(self, reason: str) -> None:
+        if self.met:
+            return
+        self.met_reason = reason
+        self.met_after_ms = self.elapsed_ms()
+        self._met.set()
+        logger.info("抓取 quorum 達成 (%s)，%.0f ms", reason, self.met_after_ms)
+
+
+def _task_update(label: str, task: asyncio.Task) -> dict[str, Any]:
+    """取出已完成任務的更新；任務失敗時轉為錯誤日誌"""
+    if task.cancelled():
+        return {"execution_log": [f"Scrape {label}: cancelled"]}
+    error = task.exception()
+    if error is not None:
+        logger.warning("抓取任務失敗 (%s): %s", label, error)
+        return {"execution_log": [f"Scrape {label} failed: {error}"]}
+    return task.result()
+
+
+_registry: dict[str, QuorumGate] = {}
+
+
+def get_or_create_gate(run_id: str, policy: QuorumPolicy) -> QuorumGate:
+    """取得一次執行的 quorum 閘門 (第一個抓取節點建立，並行的節點共用)"""
+    gate = _registry.get(run_id)
+    if gate is None:
+        gate = _registry[run_id] = QuorumGate(policy)
+    return gate
+
+
+def get_gate(run_id: str | None) -> QuorumGate | None:
+    """取得執行中的 quorum 閘門 (不存在時回傳 None，例如從檢查點恢復時)"""
+    if not run_id:
+        return None
+    return _registry.get(run_id)
+
+
+def discard_gate(run_id: str | None) -> None:
+    """取消遲到任務並移除閘門"""
+    if not run_id:
+        return
+    gate = _registry.pop(run_id, None)
+    if gate is not None:
+        gate.cancel()
@@ -3,20 +3,39 @@
 使用 LangGraph StateGraph 建構完整的研究管線。
 
 流程:
-supervisor -> news_scraper -> social_media -> deep_analyzer -> content_synthesizer -> END
-                                                                                      |
-              error_handler <-- (任何節點失敗) ----------------------------------------+-> END
+              +-> news_scraper -+
+supervisor ---|                 |--> scrape_join -> deep_analyzer -> content_synthesizer -> END
+              +-> social_media -+                                                          |
+              error_handler <-- (任何節點失敗) ---------------------------------------------+-> END
+
+news_scraper 與 social_media 彼此獨立，並行執行後在 scrape_join 匯合。
+
+編譯後的工作流是無狀態、可重複執行的，因此依編譯設定快取，
+避免每次請求都重新建構與編譯圖。
 """
 
+import logging
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Sequence
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
+from src.graph.checkpoint import get_checkpointer
 from src.graph.edges import (
+    SCRAPER_NODES,
     error_handler_node,
+    scrape_join_node,
     should_continue_after_analysis,
     should_continue_after_scraping,
     should_continue_after_supervisor,
 )
+from src.graph.events import ResearchEvent, count_items
 from src.graph.nodes import (
+    STREAM_FIELDS_KEY,
     content_synthesizer_node,
     deep_analyzer_node,
     news_scraper_node,
@@ -24,6 +43,13 @@ from src.graph.nodes import (
     supervisor_node,
 )
 from src.graph.state import ResearchState
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 已編譯工作流快取 (key 為編譯設定)
+_workflow_cache: dict[tuple, CompiledStateGraph] = {}
+_workflow_lock = threading.Lock()
 
 
 def build_research_graph() -> StateGraph:
@@ -34,6 +60,7 @@ def build_research_graph() -> StateGraph:
     graph.add_node("supervisor", supervisor_node)
     graph.add_node("news_scraper", news_scraper_node)
     graph.add_node("social_media", social_media_node)
+    graph.add_node("scrape_join", scrape_join_node)
     graph.add_node("deep_analyzer", deep_analyzer_node)
     graph.add_node("content_synthesizer", content_synthesizer_node)
     graph.add_node("error_handler", error_handler_node)
@@ -41,22 +68,19 @@ def build_research_graph() -> StateGraph:
     # 設定入口
     graph.set_entry_point("supervisor")
 
-    # 主管 -> 新聞抓取 或 錯誤
+    # 主管 -> 並行抓取 (新聞 + 社群) 或 錯誤
     graph.add_conditional_edges(
         "supervisor",
         should_continue_after_supervisor,
-        {
-            "news_scraper": "news_scraper",
-            "error_handler": "error_handler",
-        },
+        [*SCRAPER_NODES, "error_handler"],
     )
 
-    # 新聞抓取 -> 社群抓取
-    graph.add_edge("news_scraper", "social_media")
+    # 所有抓取節點完成後匯合
+    graph.add_edge(SCRAPER_NODES, "scrape_join")
 
-    # 社群抓取 -> 深度分析 或 錯誤
+    # 匯合 -> 深度分析 或 錯誤
     graph.add_conditional_edges(
-        "social_media",
+        "scrape_join",
         should_continue_after_scraping,
         {
             "deep_analyzer": "deep_analyzer",
@@ -81,29 +105,266 @@ def build_research_graph() -> StateGraph:
     return graph
 
 
-def create_research_workflow():
-    """建立可執行的研究工作流
+def create_research_workflow(
+    checkpointer: BaseCheckpointSaver | None = None,
+    interrupt_before: Sequence[str] | None = None,
+    interrupt_after: Sequence[str] | None = None,
+) -> CompiledStateGraph:
+    """建立可執行的研究工作流 (每次呼叫都重新建構與編譯)
+
+    Args:
+        checkpointer: LangGraph checkpointer，None 表示不保存檢查點
+        interrupt_before: 在這些節點執行前中斷
+        interrupt_after: 在這些節點執行後中斷
 
     Returns:
         已編譯的 LangGraph 工作流
     """
     graph = build_research_graph()
-    return graph.compile()
+    return graph.compile(
+        checkpointer=checkpointer,
+        interrupt_before=list(interrupt_before) if interrupt_before else None,
+        interrupt_after=list(interrupt_after) if interrupt_after else None,
+    )
+
+
+def get_research_workflow(
+    checkpointer: BaseCheckpointSaver | None = None,
+    interrupt_before: Sequence[str] | None = None,
+    interrupt_after: Sequence[str] | None = None,
+) -> CompiledStateGraph:
+    """取得已編譯的研究工作流 (依編譯設定快取，執行緒安全)
+
+    相同設定只會編譯一次；checkpointer 以物件身分區分
+    (快取會持有其參考，因此 id 不會被重複使用)。
+
+    Args:
+        checkpointer: LangGraph checkpointer
+        interrupt_before: 在這些節點執行前中斷
+        interrupt_after: 在這些節點執行後中斷
+
+    Returns:
+        已編譯的 LangGraph 工作流
+    """
+    key = (
+        None if checkpointer is None else id(checkpointer),
+        tuple(interrupt_before or ()),
+        tuple(interrupt_after or ()),
+    )
+    workflow = _workflow_cache.get(key)
+    if workflow is not None:
+        return workflow
+
+    with _workflow_lock:
+        workflow = _workflow_cache.get(key)
+        if workflow is None:
+            workflow = create_research_workflow(
+                checkpointer=checkpointer,
+                interrupt_before=interrupt_before,
+                interrupt_after=interrupt_after,
+            )
+            _workflow_cache[key] = workflow
+    return workflow
 
 
-async def run_research(initial_state: dict) -> dict:
+def warm_up_workflow() -> float:
+    """預先編譯預設工作流 (於應用程式啟動時呼叫)
+
+    Returns:
+        花費秒數 (已快取時接近 0)
+    """
+    start = time.perf_counter()
+    get_research_workflow()
+    elapsed = time.perf_counter() - start
+    logger.info("研究工作流預熱完成 (%.1f ms)", elapsed * 1000)
+    return elapsed
+
+
+def clear_workflow_cache() -> None:
+    """清除已編譯工作流快取"""
+    with _workflow_lock:
+        _workflow_cache.clear()
+
+
+async def run_research(
+    initial_state: dict,
+    run_id: str | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
+) -> dict:
     """執行完整研究流程
 
+    啟用檢查點 (settings.checkpoint_enabled) 時，每個節點完成後的狀態都會保存，
+    失敗後可用 resume_research(run_id) 從失敗的節點繼續。
+
     Args:
         initial_state: 包含 ResearchRequest 的初始狀態，例如:
             {
                 "request": ResearchRequest(topic="AI 趨勢"),
                 "execution_log": [],
             }
+        run_id: 執行 ID，預設自動產生
+        checkpointer: 檢查點儲存，預設使用 get_checkpointer()
 
     Returns:
-        最終的 ResearchState dict
+        最終的 ResearchState dict (含 run_id)
     """
-    workflow = create_research_workflow()
-    result = await workflow.ainvoke(initial_state)
+    _run_id = run_id or uuid.uuid4().hex
+    saver = _resolve_checkpointer(checkpointer)
+    workflow = get_research_workflow(checkpointer=saver)
+    result = await workflow.ainvoke(
+        {**initial_state, "run_id": _run_id}, _run_config(_run_id)
+    )
     return result
+
+
+async def stream_research(
+    initial_state: dict,
+    run_id: str | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
+) -> AsyncIterator[ResearchEvent]:
+    """執行研究流程並即時產出進度事件
+
+    使用 LangGraph 的 tasks/values/custom 串流模式：每個節點開始時產出 node_start，
+    完成時產出含執行時間與新增內容數的 node_end，最後產出含最終 state 的 run_end。
+    節點透過 stream writer 回報的影片素材欄位 (串流合成) 產出為 field 事件。
+
+    Args:
+        initial_state: 初始狀態 (同 run_research)
+        run_id: 執行 ID，預設自動產生
+        checkpointer: 檢查點儲存，預設使用 get_checkpointer()
+
+    Yields:
+        ResearchEvent
+    """
+    _run_id = run_id or uuid.uuid4().hex
+    saver = _resolve_checkpointer(checkpointer)
+    workflow = get_research_workflow(checkpointer=saver)
+
+    start = time.perf_counter()
+    started_at: dict[str, float] = {}
+    final_state: dict = {}
+
+    def elapsed_ms(since: float = start) -> float:
+        return (time.perf_counter() - since) * 1000
+
+    async for mode, payload in workflow.astream(
+        {**initial_state, "run_id": _run_id},
+        _run_config(_run_id, stream_fields=True),
+        stream_mode=["tasks", "values", "custom"],
+    ):
+        if mode == "values":
+            final_state = payload
+            continue
+        if mode == "custom":
+            if isinstance(payload, dict) and "field" in payload:
+                yield ResearchEvent(
+                    kind="field",
+                    node=payload.get("node"),
+                    run_id=_run_id,
+                    elapsed_ms=elapsed_ms(),
+                    field=payload["field"],
+                    value=payload.get("value"),
+                )
+            continue
+
+        task_id, node = payload["id"], payload["name"]
+        if "input" in payload:
+            started_at[task_id] = time.perf_counter()
+            yield ResearchEvent(
+                kind="node_start", node=node, run_id=_run_id, elapsed_ms=elapsed_ms()
+            )
+            continue
+
+        update = payload.get("result") or {}
+        if not isinstance(update, dict):
+            update = dict(update)
+        error = payload.get("error")
+        yield ResearchEvent(
+            kind="node_end",
+            node=node,
+            run_id=_run_id,
+            elapsed_ms=elapsed_ms(),
+            duration_ms=elapsed_ms(started_at.pop(task_id, start)),
+            item_count=count_items(update),
+            current_step=update.get("current_step"),
+            error=str(error) if error else update.get("error"),
+        )
+
+    yield ResearchEvent(
+        kind="run_end",
+        run_id=_run_id,
+        elapsed_ms=elapsed_ms(),
+        current_step=final_state.get("current_step"),
+        error=final_state.get("error"),
+        state=final_state,
+    )
+
+
+async def resume_research(
+    run_id: str,
+    checkpointer: BaseCheckpointSaver | None = None,
+) -> dict:
+    """從失敗的節點繼續先前的研究
+
+    - 節點拋出例外而中斷: 從中斷的節點繼續
+    - 節點回報錯誤 (state 有 error): 回到該節點執行前、尚無錯誤的檢查點重新執行
+    - 已成功完成: 直接回傳保存的結果
+
+    Args:
+        run_id: run_research 回傳的執行 ID
+        checkpointer: 檢查點儲存，預設使用 get_checkpointer()
+
+    Returns:
+        最終的 ResearchState dict
+
+    Raises:
+        ValueError: 找不到執行紀錄或未啟用檢查點
+    """
+    saver = _resolve_checkpointer(checkpointer)
+    if saver is None:
+        raise ValueError("未啟用研究檢查點，無法繼續執行")
+
+    workflow = get_research_workflow(checkpointer=saver)
+    config = _run_config(run_id)
+    snapshot = await workflow.aget_state(config)
+    if not snapshot.values:
+        raise ValueError(f"找不到研究執行紀錄: {run_id}")
+
+    if not snapshot.values.get("error"):
+        if snapshot.next:
+            logger.info("從中斷的節點繼續研究 (run_id=%s): %s", run_id, snapshot.next)
+            return await workflow.ainvoke(None, config)
+        return snapshot.values
+
+    # 由新到舊找出第一個尚無錯誤的檢查點，即失敗節點執行前的狀態
+    resume_from = None
+    async for state in workflow.aget_state_history(config):
+        if state.next and not state.values.get("error"):
+            resume_from = state
+            break
+
+    if resume_from is None:
+        raise ValueError(f"找不到可繼續的檢查點: {run_id}")
+
+    logger.info("從失敗的節點重新執行研究 (run_id=%s): %s", run_id, resume_from.next)
+    return await workflow.ainvoke(None, resume_from.config)
+
+
+def _resolve_checkpointer(
+    checkpointer: BaseCheckpointSaver | None,
+) -> BaseCheckpointSaver | None:
+    """決定要使用的檢查點儲存"""
+    if checkpointer is not None:
+        return checkpointer
+    return get_checkpointer() if settings.checkpoint_enabled else None
+
+
+def _run_config(run_id: str, stream_fields: bool = False) -> dict:
+    """執行 ID 對應的 LangGraph config
+
+    stream_fields 為 True 時節點以 stream writer 回報串流欄位 (只有 stream_research 會消費)。
+    """
+    configurable = {"thread_id": run_id}
+    if stream_fields:
+        configurable[STREAM_FIELDS_KEY] = True
+    return {"configurable": configurable}
@@ -0,0 +1,255 @@
+"""推測性抓取模組
+
+在主管節點分解查詢的同時，先以原始話題 (request.topic) 搜尋 Google News 與 PTT。
+查詢計劃產生後：
+
+- 計劃不建議的來源，其推測性搜尋會被取消
+- 子查詢與原始話題相同時，抓取節點略過該查詢 (已由推測性搜尋涵蓋)
+- 抓取節點取回推測性結果，依 URL 去重後併入
+
+推測任務是 asyncio.Task，無法存入 state (需可序列化)，
+因此以 run_id 為鍵保存在模組層級的登錄表中，只在同一次執行內有效。
+"""
+
+import asyncio
+import logging
+import time
+
+from pydantic import BaseModel, Field
+
+from src.models.content import ContentItem, ResearchRequest
+from src.scrapers.google_news import GoogleNewsScraper
+from src.scrapers.ptt import PTTScraper
+
+logger = logging.getLogger(__name__)
+
+# request.sources 中支援推測性抓取的來源 -> 使用的爬蟲名稱 (對應 covered_queries 的鍵)
+SPECULATIVE_SOURCES = {"news": "google_news", "forum": "ptt"}
+
+# 判斷計劃建議來源是否包含某來源時使用的關鍵字
+_SOURCE_ALIASES = {
+    "news": ("news", "新聞", "google"),
+    "forum": ("forum", "ptt", "論壇"),
+}
+
+DEFAULT_PTT_BOARDS = ["Gossiping", "Stock", "Tech_Job"]
+
+
+class SpeculativeResult(BaseModel):
+    """單一來源的推測性抓取結果"""
+
+    source: str = Field(..., description="來源類型 (news / forum)")
+    items: list[ContentItem] = Field(default_factory=list, description="抓取到的內容")
+    duration_ms: float = Field(default=0.0, description="推測性搜尋耗時 (毫秒)")
+    overlap_ms: float = Field(
+        default=0.0, description="與查詢分解重疊的時間 (毫秒)，即節省的等待時間"
+    )
+    errors: list[str] = Field(default_factory=list, description="錯誤訊息")
+
+
+def normalize_query(query: str) -> str:
+    """正規化查詢字串 (去除多餘空白、不分大小寫)"""
+    return " ".join(query.split()).casefold()
+
+
+def merge_unique(
+    items: list[ContentItem], extra: list[ContentItem]
+) -> list[ContentItem]:
+    """合併兩組內容並依 URL 去重 (保留先出現者)"""
+    seen: set[str] = set()
+    merged: list[ContentItem] = []
+    for item in [*items, *extra]:
+        url = str(item.url)
+        if url not in seen:
+            seen.add(url)
+            merged.append(item)
+    return merged
+
+
+class SpeculativeScrape:
+    """以原始話題進行的推測性抓取
+
+    Args:
+        request: 研究請求 (只對 request.sources 中的 news / forum 啟動)
+        ptt_boards: 搜尋的 PTT 看板
+    """
+
+    def __init__(
+        self,
+        request: ResearchRequest,
+        ptt_boards: list[str] | None = None,
+    ) -> None:
+        self.topic = request.topic
+        self.language = request.language
+        self.max_results = request.max_results_per_source
+        self.ptt_boards = ptt_boards or DEFAULT_PTT_BOARDS
+        self.sources = [s for s in SPECULATIVE_SOURCES if s in request.sources]
+        self.started_at = 0.0
+        self.plan_ready_at: float | None = None
+        self.covered: list[str] = []
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._finished_at: dict[str, float] = {}
+
+    @property
+    def active_sources(self) -> list[str]:
+        """尚未取消、也尚未取回的來源"""
+        return list(self._tasks)
+
+    def start(self) -> None:
+        """啟動推測性搜尋 (需在事件迴圈中呼叫)"""
+        self.started_at = time.perf_counter()
+        for source in self.sources:
+            self._tasks[source] = asyncio.create_task(
+                self._timed(source), name=f"speculative:{source}"
+            )
+
+    def resolve(
+        self,
+        sub_queries: list[str],
+        recommended_sources: list[str] | None = None,
+    ) -> list[str]:
+        """查詢計劃產生後，取消計劃不需要的推測性搜尋
+
+        Args:
+            sub_queries: 計劃的子查詢
+            recommended_sources: 計劃建議的來源；空值表示不限制
+
+        Returns:
+            被取消的來源列表
+        """
+        self.plan_ready_at = time.perf_counter()
+        topic = normalize_query(self.topic)
+        self.covered = [q for q in sub_queries if normalize_query(q) == topic]
+
+        cancelled: list[str] = []
+        for source in list(self._tasks):
+            if not _is_recommended(source, recommended_sources):
+                self._tasks.pop(source).cancel()
+                cancelled.append(source)
+        return cancelled
+
+    def covered_queries(self, source: str) -> dict[str, list[str]]:
+        """回傳已由推測性搜尋涵蓋、抓取節點可略過的查詢
+
+        只有子查詢包含原始話題時才略過，否則推測性結果僅作為額外來源。
+        """
+        if source not in self._tasks or not self.covered:
+            return {}
+        return {SPECULATIVE_SOURCES[source]: list(self.covered)}
+
+    async def collect(self, source: str) -> SpeculativeResult | None:
+        """等待並取回某來源的推測性結果；未啟動或已取消時回傳 None"""
+        task = self._tasks.pop(source, None)
+        if task is None:
+            return None
+
+        errors: list[str] = []
+        try:
+            items = await task
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            logger.warning("推測性抓取失敗 (%s): %s", source, e)
+            items = []
+            errors.append(str(e))
+
+        finished_at = self._finished_at.get(source, time.perf_counter())
+        plan_ready_at = self.plan_ready_at or finished_at
+        return SpeculativeResult(
+            source=source,
+            items=items,
+            duration_ms=(finished_at - self.started_at) * 1000,
+            overlap_ms=max(0.0, min(finished_at, plan_ready_at) - self.started_at)
+            * 1000,
+            errors=errors,
+        )
+
+    def cancel(self) -> None:
+        """取消所有尚未取回的推測性搜尋"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def _timed(self, source: str) -> list[ContentItem]:
+        """執行搜尋並記錄完成時間"""
+        try:
+            if source == "news":
+                return await self._search_news()
+            return await self._search_forum()
+        finally:
+            self._finished_at[source] = time.perf_counter()
+
+    async def _search_news(self) -> list[ContentItem]:
+        """以原始話題搜尋 Google News"""
+        async with GoogleNewsScraper() as scraper:
+            return await scraper.search(
+                query=self.topic,
+                max_results=self.max_results,
+                language=self.language,
+            )
+
+    async def _search_forum(self) -> list[ContentItem]:
+        """以原始話題搜尋各 PTT 看板 (單一看板失敗不影響其他看板)"""
+
+        async def search_board(board: str) -> list[ContentItem]:
+            async with PTTScraper() as scraper:
+                return await scraper.search(
+                    query=self.topic, max_results=self.max_results, board=board
+                )
+
+        results = await asyncio.gather(
+            *(search_board(board) for board in self.ptt_boards),
+            return_exceptions=True,
+        )
+        items: list[ContentItem] = []
+        failures: list[BaseException] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                failures.append(result)
+            else:
+                items.extend(result)
+        if failures and not items:
+            raise failures[0]
+        return items
+
+
+def _is_recommended(source: str, recommended_sources: list[str] | None) -> bool:
+    """判斷來源是否在計劃建議的來源中 (未提供建議時視為全部需要)"""
+    if not recommended_sources:
+        return True
+    aliases = _SOURCE_ALIASES.get(source, (source,))
+    return any(
+        alias in rec.casefold() for rec in recommended_sources for alias in aliases
+    )
+
+
+_registry: dict[str, SpeculativeScrape] = {}
+
+
+def start_speculation(
+    run_id: str, request: ResearchRequest
+) -> SpeculativeScrape | None:
+    """為一次執行啟動推測性抓取；沒有可推測的來源時回傳 None"""
+    speculation = SpeculativeScrape(request)
+    if not speculation.sources:
+        return None
+    discard_speculation(run_id)
+    speculation.start()
+    _registry[run_id] = speculation
+    return speculation
+
+
+def get_speculation(run_id: str | None) -> SpeculativeScrape | None:
+    """取得執行中的推測性抓取 (不存在時回傳 None，例如從檢查點恢復時)"""
+    if not run_id:
+        return None
+    return _registry.get(run_id)
+
+
+def discard_speculation(run_id: str | None) -> None:
+    """取消並移除一次執行的推測性抓取"""
+    if not run_id:
+        return
+    speculation = _registry.pop(run_id, None)
+    if speculation is not None:
+        speculation.cancel()
@@ -3,6 +3,7 @@
 定義研究工作流的共享狀態結構。
 """
 
+import operator
 from typing import Annotated, TypedDict
 
 from langgraph.graph.message import add_messages
@@ -11,10 +12,17 @@ from src.models.content import AnalysisResult, ContentItem, ResearchRequest
 from src.models.video_material import VideoMaterial
 
 
+def _keep_last(current: str | None, update: str | None) -> str | None:
+    """保留最後寫入的值 (允許並行節點在同一步驟寫入)"""
+    return update
+
+
 class ResearchState(TypedDict, total=False):
     """研究工作流狀態
 
     此狀態在 LangGraph 節點之間傳遞，包含研究過程的所有資料。
+    news_scraper 與 social_media 並行執行，兩者都會寫入的欄位以 reducer 合併：
+    節點只需回傳新增的部分 (例如新的日誌項目、新增的來源數)。
     """
 
     # === 輸入 ===
@@ -22,10 +30,12 @@ class ResearchState(TypedDict, total=False):
 
     # === 中間狀態 ===
     sub_queries: list[str]  # 分解後的子查詢
-    news_results: list[ContentItem]  # 新聞來源結果
-    social_results: list[ContentItem]  # 社群來源結果
-    forum_results: list[ContentItem]  # 論壇來源結果
-    web_results: list[ContentItem]  # 網頁搜尋結果
+    news_results: Annotated[list[ContentItem], operator.add]  # 新聞來源結果
+    social_results: Annotated[list[ContentItem], operator.add]  # 社群來源結果
+    forum_results: Annotated[list[ContentItem], operator.add]  # 論壇來源結果
+    web_results: Annotated[list[ContentItem], operator.add]  # 網頁搜尋結果
+    relevant_items: list[ContentItem]  # 通過相關性過濾的內容 (依分數排序)
+    excluded_items: list[ContentItem]  # quorum 達成後才抓到、未納入分析的內容
 
     # === 分析結果 ===
     analysis: AnalysisResult  # 深度分析結果
@@ -38,8 +48,9 @@ class ResearchState(TypedDict, total=False):
 
     # === 錯誤處理 ===
     error: str | None  # 錯誤訊息
-    current_step: str  # 目前步驟名稱
+    current_step: Annotated[str, _keep_last]  # 目前步驟名稱
 
     # === 元數據 ===
-    total_sources_scraped: int  # 已抓取來源數
-    execution_log: list[str]  # 執行日誌
+    run_id: str  # 執行 ID (檢查點 thread_id)
+    total_sources_scraped: Annotated[int, operator.add]  # 已抓取來源數 (累加)
+    execution_log: Annotated[list[str], operator.add]  # 執行日誌 (累加)
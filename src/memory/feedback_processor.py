@@ -3,6 +3,7 @@
 使用 LLM 將使用者反饋轉換為 LearnedCorrection。
 """
 
+import asyncio
 import logging
 import uuid
 
@@ -11,7 +12,8 @@ from pydantic import BaseModel, Field
 from src.memory.manager import MemoryManager
 from src.memory.models.feedback import UserFeedback
 from src.memory.models.learned_correction import LearnedCorrection
-from src.utils.llm_factory import create_chat_model
+from src.utils.llm_cache import cached_structured_invoke
+from src.utils.llm_factory import get_chat_model
 
 logger = logging.getLogger(__name__)
 
@@ -64,42 +66,17 @@ class FeedbackProcessor:
         self._manager = memory_manager
         self._llm = llm
 
-    async def _ensure_llm(self) -> None:
-        """確保 LLM 已初始化"""
-        if self._llm is None:
-            self._llm = create_chat_model()
+    def _get_llm(self):
+        """取得 LLM (未注入時使用模型註冊表的共用模型)
+
+        不保存在實例上：處理器可能跨多次 asyncio.run 使用，
+        共用模型的連線池綁定事件迴圈，每次都向註冊表取得目前迴圈的模型。
+        """
+        return self._llm if self._llm is not None else get_chat_model()
 
     async def process_feedback(self, feedback: UserFeedback) -> LearnedCorrection:
         """將單筆反饋轉換為 LearnedCorrection"""
-        await self._ensure_llm()
-
-        prompt = FEEDBACK_ANALYSIS_PROMPT.format(
-            feedback_type=feedback.feedback_type.value,
-            agent_type=feedback.agent_type,
-            original_content=feedback.original_content[:500],
-            original_analysis=feedback.original_analysis[:500],
-            user_correction=feedback.user_correction,
-            user_explanation=feedback.user_explanation or "（未提供）",
-            topics=", ".join(feedback.topics) if feedback.topics else "（未標記）",
-        )
-
-        structured_llm = self._llm.with_structured_output(CorrectionExtraction)
-        try:
-            extraction = await structured_llm.ainvoke(prompt)
-        except Exception as e:
-            logger.error(
-                "反饋分析 LLM 呼叫失敗 (feedback=%s): %s", feedback.feedback_id, e
-            )
-            raise
-
-        correction = LearnedCorrection(
-            correction_id=str(uuid.uuid4()),
-            user_id=feedback.user_id,
-            pattern=extraction.pattern,
-            correction=extraction.correction,
-            context=extraction.context,
-            confidence=extraction.confidence,
-        )
+        correction = await self._extract_correction(feedback)
 
         # 儲存到 SQLite + Vector Store
         await self._manager.store_correction(correction)
@@ -119,17 +96,68 @@ class FeedbackProcessor:
     async def process_all_pending(self, user_id: str) -> int:
         """處理所有待處理反饋
 
+        LLM 萃取並行進行 (由 LLM 調節器以背景優先順序控制並行數)，
+        成功的修正與已處理標記再以批次 API 各一次寫入。
+
         Returns:
             處理的反饋數量
         """
         pending = await self._manager.get_unprocessed_feedback(user_id)
-        count = 0
+        if not pending:
+            return 0
 
-        for feedback in pending:
-            try:
-                await self.process_feedback(feedback)
-                count += 1
-            except Exception as e:
-                logger.warning("處理反饋 %s 失敗: %s", feedback.feedback_id, e)
+        results = await asyncio.gather(
+            *(self._extract_correction(feedback) for feedback in pending),
+            return_exceptions=True,
+        )
 
-        return count
+        corrections: list[LearnedCorrection] = []
+        processed_ids: list[str] = []
+        for feedback, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.warning("處理反饋 %s 失敗: %s", feedback.feedback_id, result)
+                continue
+            corrections.append(result)
+            processed_ids.append(feedback.feedback_id)
+
+        if corrections:
+            await self._manager.store_corrections_many(corrections)
+            await self._manager.mark_feedback_processed_many(processed_ids)
+            logger.info("批次處理反饋: %d/%d 筆成功", len(corrections), len(pending))
+
+        return len(corrections)
+
+    async def _extract_correction(self, feedback: UserFeedback) -> LearnedCorrection:
+        """以 LLM 從反饋萃取修正 (不寫入儲存層)"""
+        prompt = FEEDBACK_ANALYSIS_PROMPT.format(
+            feedback_type=feedback.feedback_type.value,
+            agent_type=feedback.agent_type,
+            original_content=feedback.original_content[:500],
+            original_analysis=feedback.original_analysis[:500],
+            user_correction=feedback.user_correction,
+            user_explanation=feedback.user_explanation or "（未提供）",
+            topics=", ".join(feedback.topics) if feedback.topics else "（未標記）",
+        )
+
+        try:
+            # 反饋處理是背景工作，讓出 LLM 名額給互動式研究請求
+            extraction = await cached_structured_invoke(
+                self._get_llm(),
+                CorrectionExtraction,
+                prompt,
+                priority="background",
+            )
+        except Exception as e:
+            logger.error(
+                "反饋分析 LLM 呼叫失敗 (feedback=%s): %s", feedback.feedback_id, e
+            )
+            raise
+
+        return LearnedCorrection(
+            correction_id=str(uuid.uuid4()),
+            user_id=feedback.user_id,
+            pattern=extraction.pattern,
+            correction=extraction.correction,
+            context=extraction.context,
+            confidence=extraction.confidence,
+        )
@@ -10,7 +10,12 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from src.memory.models.feedback import UserFeedback
-from src.memory.models.knowledge_graph import KnowledgeNode, NodeType
+from src.memory.models.knowledge_graph import (
+    KnowledgeEdge,
+    KnowledgeNode,
+    KnowledgePath,
+    NodeType,
+)
 from src.memory.models.learned_correction import LearnedCorrection
 from src.memory.models.user_profile import TopicPreference, UserProfile
 from src.memory.storage.sqlite_store import SQLiteStore
@@ -27,6 +32,9 @@ class MemoryManager:
 
     協調 SQLiteStore (結構化資料) 和 VectorStore (語意搜尋)。
     提供使用者管理、反饋儲存、修正檢索等功能。
+
+    每位使用者有一個資料版本號，影響個人化內容的寫入 (使用者檔案、話題偏好、
+    修正、知識節點) 會遞增版本，供 PersonalizationEngine 判斷快取是否過期。
     """
 
     def __init__(
@@ -37,6 +45,7 @@ class MemoryManager:
         self._sqlite = sqlite_store
         self._vector = vector_store
         self._user_cache: dict[str, UserProfile] = {}
+        self._versions: dict[str, int] = {}
 
     async def initialize(self) -> None:
         """初始化儲存層"""
@@ -55,6 +64,15 @@ class MemoryManager:
         if self._sqlite:
             await self._sqlite.close()
 
+    # === 資料版本 ===
+
+    def data_version(self, user_id: str) -> int:
+        """使用者個人化資料的版本號 (本實例內單調遞增)"""
+        return self._versions.get(user_id, 0)
+
+    def _bump_version(self, user_id: str) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
     # === 使用者管理 ===
 
     async def get_or_create_user(self, user_id: str) -> UserProfile:
@@ -71,6 +89,18 @@ class MemoryManager:
         self._user_cache[user_id] = profile
         return profile
 
+    async def get_users(self, user_ids: list[str]) -> dict[str, UserProfile]:
+        """批次取得已存在的使用者 (快取未命中的部分以單一查詢取得，不建立新使用者)"""
+        found = {
+            uid: self._user_cache[uid] for uid in user_ids if uid in self._user_cache
+        }
+        missing = [uid for uid in user_ids if uid not in found]
+        if missing:
+            loaded = await self._sqlite.get_users(missing)
+            self._user_cache.update(loaded)
+            found.update(loaded)
+        return found
+
     async def update_user_profile(self, profile: UserProfile) -> None:
         """更新使用者檔案"""
         updated_profile = profile.model_copy(
@@ -78,6 +108,7 @@ class MemoryManager:
         )
         await self._sqlite.update_user(updated_profile)
         self._user_cache[updated_profile.user_id] = updated_profile
+        self._bump_version(updated_profile.user_id)
 
     # === 反饋管理 ===
 
@@ -85,6 +116,10 @@ class MemoryManager:
         """儲存使用者反饋"""
         await self._sqlite.save_feedback(feedback)
 
+    async def store_feedback_many(self, feedbacks: list[UserFeedback]) -> None:
+        """批次儲存使用者反饋"""
+        await self._sqlite.save_feedback_many(feedbacks)
+
     async def get_unprocessed_feedback(self, user_id: str) -> list[UserFeedback]:
         """取得未處理的反饋"""
         return await self._sqlite.get_unprocessed_feedback(user_id)
@@ -93,12 +128,26 @@ class MemoryManager:
         """標記反饋為已處理"""
         await self._sqlite.mark_feedback_processed(feedback_id)
 
+    async def mark_feedback_processed_many(self, feedback_ids: list[str]) -> None:
+        """批次標記反饋為已處理"""
+        await self._sqlite.mark_feedback_processed_many(feedback_ids)
+
     # === 修正管理 ===
 
     async def store_correction(self, correction: LearnedCorrection) -> None:
         """儲存修正 (SQLite + Vector Store)"""
         await self._sqlite.save_correction(correction)
         await self._vector.store_correction(correction.user_id, correction)
+        self._bump_version(correction.user_id)
+
+    async def store_corrections_many(
+        self, corrections: list[LearnedCorrection]
+    ) -> None:
+        """批次儲存修正 (SQLite 單一交易 + Vector Store 分批嵌入與寫入)"""
+        await self._sqlite.save_corrections_many(corrections)
+        await self._vector.store_corrections_many(corrections)
+        for user_id in {c.user_id for c in corrections}:
+            self._bump_version(user_id)
 
     async def get_relevant_corrections(
         self, user_id: str, query: str, limit: int = 5
@@ -121,9 +170,8 @@ class MemoryManager:
         # 從 topic_preferences 取得偏好
         topic_pref = profile.topic_preferences.get(topic)
 
-        # 從知識圖譜取得相關節點
-        nodes = await self._sqlite.get_nodes(user_id, NodeType.TOPIC)
-        related_nodes = [n for n in nodes if topic.lower() in n.name.lower()]
+        # 從知識圖譜取得相關節點 (名稱索引查詢)
+        related_nodes = await self._sqlite.find_nodes(user_id, topic, NodeType.TOPIC)
 
         # 搜尋相關對話
         conversations = await self._vector.search_conversations(user_id, topic, limit=3)
@@ -143,7 +191,7 @@ class MemoryManager:
         interest_level: float,
         notes: str = "",
     ) -> None:
-        """更新話題偏好"""
+        """更新話題偏好 (經由 update_user_profile 遞增資料版本)"""
         profile = await self.get_or_create_user(user_id)
         new_prefs = {
             **profile.topic_preferences,
@@ -161,6 +209,36 @@ class MemoryManager:
     async def save_knowledge_node(self, node: KnowledgeNode) -> None:
         """儲存知識節點"""
         await self._sqlite.save_node(node)
+        self._bump_version(node.user_id)
+
+    async def save_knowledge_nodes(self, nodes: list[KnowledgeNode]) -> None:
+        """批次儲存知識節點 (例如匯入知識圖譜)"""
+        await self._sqlite.save_nodes_many(nodes)
+        for user_id in {n.user_id for n in nodes}:
+            self._bump_version(user_id)
+
+    async def save_knowledge_edges(self, edges: list[KnowledgeEdge]) -> None:
+        """批次儲存知識邊"""
+        await self._sqlite.save_edges_many(edges)
+
+    async def get_related_knowledge(
+        self,
+        user_id: str,
+        node_id: str,
+        max_depth: int = 2,
+        relation_types: list[str] | None = None,
+        min_weight: float = 0.0,
+        limit: int | None = None,
+    ) -> list[KnowledgePath]:
+        """取得由節點出發、多跳可達的相關知識 (含路徑與累積權重)"""
+        return await self._sqlite.traverse(
+            user_id,
+            node_id,
+            max_depth=max_depth,
+            relation_types=relation_types,
+            min_weight=min_weight,
+            limit=limit,
+        )
 
     # === GDPR ===
 
@@ -181,4 +259,5 @@ class MemoryManager:
         await self._sqlite.delete_user(user_id)
         await self._vector.delete_user_data(user_id)
         self._user_cache.pop(user_id, None)
+        self._bump_version(user_id)
         return True
@@ -1,7 +1,12 @@
 """記憶系統資料模型"""
 
 from src.memory.models.feedback import FeedbackSeverity, FeedbackType, UserFeedback
-from src.memory.models.knowledge_graph import KnowledgeEdge, KnowledgeNode, NodeType
+from src.memory.models.knowledge_graph import (
+    KnowledgeEdge,
+    KnowledgeNode,
+    KnowledgePath,
+    NodeType,
+)
 from src.memory.models.learned_correction import LearnedCorrection
 from src.memory.models.user_profile import (
     AnalysisDepth,
@@ -18,6 +23,7 @@ __all__ = [
     "FeedbackType",
     "KnowledgeEdge",
     "KnowledgeNode",
+    "KnowledgePath",
     "LearnedCorrection",
     "NodeType",
     "SourceTrust",
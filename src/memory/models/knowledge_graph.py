@@ -50,3 +50,17 @@ class KnowledgeEdge(BaseModel):
     user_confirmed: bool = False
     notes: str | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class KnowledgePath(BaseModel):
+    """從起始節點沿知識邊走到 node 的路徑"""
+
+    node: KnowledgeNode = Field(description="路徑終點節點")
+    node_ids: list[str] = Field(description="路徑上的節點 ID (含起點與終點)")
+    relations: list[str] = Field(description="路徑上依序經過的關係類型")
+    weight: float = Field(description="累積權重 (路徑上各邊權重的乘積)")
+
+    @property
+    def depth(self) -> int:
+        """路徑的邊數"""
+        return len(self.relations)
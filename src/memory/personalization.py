@@ -1,11 +1,18 @@
 """個人化引擎
 
 將使用者偏好和歷史修正注入到代理 prompt 中。
+
+組合好的個人化段落以 (user_id, agent_type, 正規化輸入) 快取在記憶體 LRU，
+並記錄組合時的使用者資料版本 (MemoryManager.data_version)；
+使用者檔案、話題偏好、修正或知識節點更新後版本遞增，舊項目即失效。
 """
 
 import logging
+from collections import OrderedDict
 
 from src.memory.manager import MemoryManager
+from src.utils.config import settings
+from src.utils.text import normalize_text
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +22,24 @@ class PersonalizationEngine:
 
     組合使用者偏好、相關修正、話題上下文，
     產生個人化的 prompt 附加段落。
+
+    Args:
+        memory_manager: 記憶管理器
+        cache_entries: 個人化段落快取項目數，預設使用
+            settings.personalization_cache_entries (0 表示停用)
     """
 
-    def __init__(self, memory_manager: MemoryManager) -> None:
+    def __init__(
+        self, memory_manager: MemoryManager, cache_entries: int | None = None
+    ) -> None:
         self._manager = memory_manager
+        self._cache_entries = (
+            settings.personalization_cache_entries
+            if cache_entries is None
+            else cache_entries
+        )
+        # (user_id, agent_type, 正規化輸入) -> (資料版本, 個人化段落)
+        self._cache: OrderedDict[tuple[str, str, str], tuple[int, str]] = OrderedDict()
 
     async def get_personalized_prompt(
         self,
@@ -38,6 +59,27 @@ class PersonalizationEngine:
         Returns:
             加上個人化附加段落的完整 prompt
         """
+        if self._cache_entries <= 0:
+            personalization = await self._build_personalization(user_id, current_input)
+            return f"{base_prompt}\n\n{personalization}"
+
+        key = (user_id, agent_type, normalize_text(current_input))
+        # 組合前先讀取版本：組合期間有寫入時，存入的項目會直接視為過期
+        version = self._manager.data_version(user_id)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(key)
+            return f"{base_prompt}\n\n{cached[1]}"
+
+        personalization = await self._build_personalization(user_id, current_input)
+        self._cache[key] = (version, personalization)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+        return f"{base_prompt}\n\n{personalization}"
+
+    async def _build_personalization(self, user_id: str, current_input: str) -> str:
+        """組合個人化附加段落"""
         profile = await self._manager.get_or_create_user(user_id)
 
         # 搜尋相關修正
@@ -91,5 +133,4 @@ class PersonalizationEngine:
         if profile.blocked_sources:
             sections.append(f"## 避免引用的來源\n{', '.join(profile.blocked_sources)}")
 
-        personalization = "\n\n".join(sections)
-        return f"{base_prompt}\n\n{personalization}"
+        return "\n\n".join(sections)
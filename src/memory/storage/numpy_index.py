@@ -0,0 +1,323 @@
+"""NumPy 暴力搜尋向量索引
+
+每位使用者的 collection 通常只有數千個向量，暴力計算內積比經過 Chroma 的
+client / 持久化層更快。每個 collection 一個目錄：
+
+- vectors-{generation}.npy: float32 矩陣 (容量 x 維度)，以 memory-map 開啟，
+  寫入前 L2 正規化
+- records-{generation}.jsonl: 每列一行 {"id", "document", "metadata"}，與矩陣列一一對應
+- manifest.json: 目前使用的 generation
+
+upsert 只追加列 (相同 ID 的舊列標記為失效)，容量不足時加倍；失效列超過一半時
+壓縮：以下一個 generation 寫出兩個只含有效列的新檔案，再原子替換 manifest，
+中途當機時仍讀取舊 generation 的一致檔案。查詢以正規化內積 + argpartition 取 top-k，
+距離為餘弦距離 (1 - 相似度)。
+
+介面與 Chroma collection 的 upsert / count / query 相同，
+VectorStore 以 VECTOR_BACKEND=numpy 切換。單一行程使用。
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 新矩陣的初始列數
+_INITIAL_CAPACITY = 256
+
+# 失效列至少達此數量且超過有效列時壓縮
+_COMPACT_MIN_DEAD = 64
+
+_MANIFEST_FILE = "manifest.json"
+
+
+class NumpyIndex:
+    """單一 collection 的 memory-mapped 向量矩陣
+
+    Args:
+        path: collection 目錄
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._matrix: np.memmap | None = None
+        self._size = 0
+        # 各列的 (id, document, metadata)；失效列為 None
+        self._records: list[tuple[str, str, dict] | None] = []
+        self._rows: dict[str, int] = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._generation = 0
+        self._load()
+
+    def _vectors_path(self, generation: int | None = None) -> Path:
+        generation = self._generation if generation is None else generation
+        return self._path / f"vectors-{generation}.npy"
+
+    def _records_path(self, generation: int | None = None) -> Path:
+        generation = self._generation if generation is None else generation
+        return self._path / f"records-{generation}.jsonl"
+
+    def _load(self) -> None:
+        """讀取 manifest 指向的檔案
+
+        以記錄行數為準：矩陣已寫入但記錄未寫入的列，以及寫到一半的最後一行都捨棄
+        (記錄檔截斷到最後一筆完整記錄之後)。
+        """
+        manifest = self._path / _MANIFEST_FILE
+        if not manifest.exists():
+            return
+        self._generation = json.loads(manifest.read_text(encoding="utf-8"))[
+            "generation"
+        ]
+        self._matrix = np.load(self._vectors_path(), mmap_mode="r+")
+
+        # 只接受以換行結尾的完整記錄；之後的位元組 (當機時寫到一半的行) 截斷，
+        # 否則之後追加的記錄會接在殘缺行後面而在下次載入時遺失
+        lines = []
+        offsets = [0]
+        if self._records_path().exists():
+            with self._records_path().open("rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        lines.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+                    offsets.append(offsets[-1] + len(line))
+        self._size = min(len(lines), self._matrix.shape[0])
+        if self._records_path().exists():
+            with self._records_path().open("r+b") as f:
+                f.truncate(offsets[self._size])
+
+        # 超過 _size 的矩陣列視為未使用，下次 upsert 由 _size 起覆寫
+        self._live = np.zeros(self._matrix.shape[0], dtype=bool)
+        for row, record in enumerate(lines[: self._size]):
+            self._mark(row, record["id"], record["document"], record["metadata"])
+
+    def _mark(self, row: int, doc_id: str, document: str, metadata: dict) -> None:
+        """將列設為 doc_id 的有效列，舊列失效"""
+        previous = self._rows.get(doc_id)
+        if previous is not None:
+            self._records[previous] = None
+            self._live[previous] = False
+        self._rows[doc_id] = row
+        if row < len(self._records):
+            self._records[row] = (doc_id, document, metadata)
+        else:
+            self._records.append((doc_id, document, metadata))
+        self._live[row] = True
+
+    def count(self) -> int:
+        """有效向量數"""
+        return len(self._rows)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: Sequence[str],
+        metadatas: Sequence[dict],
+    ) -> None:
+        """追加向量；已存在的 ID 以新列取代"""
+        if not ids:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            self._ensure_capacity(len(ids), vectors.shape[1])
+            start = self._size
+            self._matrix[start : start + len(ids)] = vectors
+            self._matrix.flush()
+
+            with self._records_path().open("a", encoding="utf-8") as f:
+                for doc_id, document, metadata in zip(
+                    ids, documents, metadatas, strict=True
+                ):
+                    f.write(_record_line(doc_id, document, metadata))
+            for offset, (doc_id, document, metadata) in enumerate(
+                zip(ids, documents, metadatas, strict=True)
+            ):
+                self._mark(start + offset, doc_id, document, metadata)
+            self._size += len(ids)
+
+            dead = self._size - len(self._rows)
+            if dead >= _COMPACT_MIN_DEAD and dead > len(self._rows):
+                self._compact()
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int,
+        include: Sequence[str] = ("documents", "metadatas", "distances"),
+    ) -> dict:
+        """以正規化內積搜尋，回傳與 Chroma query 相同格式的結果"""
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+        result: dict[str, list] = {"ids": []}
+        for field in ("documents", "metadatas", "distances"):
+            result[field] = [] if field in include else None
+
+        with self._lock:
+            k = min(n_results, len(self._rows))
+            for query in queries:
+                rows, scores = self._top_k(query, k)
+                records = [self._records[row] for row in rows]
+                result["ids"].append([r[0] for r in records])
+                if result["documents"] is not None:
+                    result["documents"].append([r[1] for r in records])
+                if result["metadatas"] is not None:
+                    result["metadatas"].append([r[2] for r in records])
+                if result["distances"] is not None:
+                    result["distances"].append((1.0 - scores).tolist())
+        return result
+
+    def _top_k(self, query: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """分數最高的 k 個有效列 (依分數遞減)"""
+        if k <= 0 or self._matrix is None:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+        scores = self._matrix[: self._size] @ query
+        scores[~self._live[: self._size]] = -np.inf
+        if k < self._size:
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(self._size)
+        rows = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+        return rows, scores[rows]
+
+    def compact(self) -> None:
+        """移除失效列"""
+        with self._lock:
+            self._compact()
+
+    def _ensure_capacity(self, extra: int, dim: int) -> None:
+        """確保矩陣可再容納 extra 列 (容量加倍)"""
+        if self._matrix is not None and self._matrix.shape[1] != dim:
+            raise ValueError(
+                f"向量維度不符: collection 為 {self._matrix.shape[1]}，寫入 {dim}"
+            )
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        needed = self._size + extra
+        if needed <= capacity:
+            return
+
+        new_capacity = max(capacity, _INITIAL_CAPACITY)
+        while new_capacity < needed:
+            new_capacity *= 2
+        self._path.mkdir(parents=True, exist_ok=True)
+        is_new = self._matrix is None
+        # 擴充容量不改變列的對應，直接原子取代同一 generation 的矩陣檔
+        self._write_matrix(
+            np.arange(self._size), new_capacity, dim, self._vectors_path()
+        )
+        if is_new:
+            self._write_manifest()
+
+    def _write_matrix(
+        self, rows: np.ndarray, capacity: int, dim: int, path: Path
+    ) -> None:
+        """將指定列寫入新的矩陣檔 (原子取代 path) 並改用新矩陣"""
+        tmp_path = path.with_suffix(".tmp.npy")
+        matrix = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(capacity, dim)
+        )
+        if len(rows):
+            matrix[: len(rows)] = self._matrix[rows]
+        matrix.flush()
+        del matrix
+        self._matrix = None
+        os.replace(tmp_path, path)
+        self._matrix = np.load(path, mmap_mode="r+")
+
+        live = np.zeros(capacity, dtype=bool)
+        if len(rows):
+            live[: len(rows)] = self._live[rows]
+        self._live = live
+
+    def _write_manifest(self) -> None:
+        """原子寫入目前的 generation"""
+        tmp_path = self._path / f"{_MANIFEST_FILE}.tmp"
+        tmp_path.write_text(
+            json.dumps({"generation": self._generation}), encoding="utf-8"
+        )
+        os.replace(tmp_path, self._path / _MANIFEST_FILE)
+
+    def _compact(self) -> None:
+        if self._matrix is None or len(self._rows) == self._size:
+            return
+        rows = np.flatnonzero(self._live[: self._size])
+        records = [self._records[row] for row in rows]
+
+        # 新 generation 的兩個檔案都寫完後才切換 manifest
+        previous = self._generation
+        generation = previous + 1
+        with self._records_path(generation).open("w", encoding="utf-8") as f:
+            for doc_id, document, metadata in records:
+                f.write(_record_line(doc_id, document, metadata))
+        capacity = max(_INITIAL_CAPACITY, self._matrix.shape[0] // 2, len(rows))
+        self._write_matrix(
+            rows, capacity, self._matrix.shape[1], self._vectors_path(generation)
+        )
+        self._generation = generation
+        self._write_manifest()
+        self._vectors_path(previous).unlink(missing_ok=True)
+        self._records_path(previous).unlink(missing_ok=True)
+
+        logger.debug(
+            "壓縮向量索引 %s: %d -> %d 列", self._path.name, self._size, len(rows)
+        )
+        self._records = records
+        self._rows = {record[0]: row for row, record in enumerate(records)}
+        self._size = len(records)
+
+
+class NumpyIndexClient:
+    """NumpyIndex 的 collection 管理，介面對應 chromadb client
+
+    Args:
+        root: 索引根目錄 (每個 collection 一個子目錄)
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._indexes: dict[str, NumpyIndex] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str) -> NumpyIndex:
+        with self._lock:
+            index = self._indexes.get(name)
+            if index is None:
+                index = NumpyIndex(self._root / name)
+                self._indexes[name] = index
+            return index
+
+    def delete_collection(self, name: str) -> None:
+        """刪除 collection；不存在時拋出 ValueError"""
+        with self._lock:
+            self._indexes.pop(name, None)
+            path = self._root / name
+            if not path.exists():
+                raise ValueError(f"Collection {name} 不存在")
+            shutil.rmtree(path)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(vectors)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _record_line(doc_id: str, document: str, metadata: dict) -> str:
+    return (
+        json.dumps(
+            {"id": doc_id, "document": document, "metadata": metadata},
+            ensure_ascii=False,
+        )
+        + "\n"
+    )
@@ -1,18 +1,37 @@
 """SQLite 儲存層
 
 使用 aiosqlite 提供非同步 CRUD 操作。
+
+- 以 WAL 模式開啟，搭配可調整的 synchronous (預設 NORMAL，只在 WAL 檢查點 fsync)
+- transaction() 將多筆寫入合併為一次提交
+- commit_interval_ms > 0 時啟用合併提交：寫入後最多延遲 N 毫秒才提交，
+  以少量持久性 (當機時可能遺失最後 N 毫秒的寫入) 換取寫入吞吐量
+- 知識節點以正規化名稱 (name_norm) 建立 (user_id, node_type, name_norm) 複合索引，
+  並以 FTS5 trigram 影子表支援中文子字串查詢 (SQLite 未編入 FTS5 時退回 LIKE)
+- traverse() 以遞迴 CTE 做多跳圖譜走訪；啟用鄰接表快取時改在記憶體中走訪，
+  快取於該使用者的邊寫入時失效 (多個行程同時寫入同一資料庫時應關閉快取)
 """
 
+import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import aiosqlite
 
 from src.memory.models.feedback import UserFeedback
-from src.memory.models.knowledge_graph import KnowledgeEdge, KnowledgeNode, NodeType
+from src.memory.models.knowledge_graph import (
+    KnowledgeEdge,
+    KnowledgeNode,
+    KnowledgePath,
+    NodeType,
+)
 from src.memory.models.learned_correction import LearnedCorrection
 from src.memory.models.user_profile import UserProfile
+from src.utils.config import settings
+from src.utils.text import normalize_text
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +86,7 @@ CREATE TABLE IF NOT EXISTS knowledge_nodes (
     user_id TEXT NOT NULL,
     node_type TEXT NOT NULL,
     name TEXT NOT NULL,
+    name_norm TEXT,
     description TEXT,
     user_sentiment REAL DEFAULT 0.0,
     user_notes TEXT,
@@ -99,15 +119,152 @@ CREATE INDEX IF NOT EXISTS idx_feedback_processed ON feedback(user_id, processed
 CREATE INDEX IF NOT EXISTS idx_corrections_user ON learned_corrections(user_id);
 CREATE INDEX IF NOT EXISTS idx_nodes_user ON knowledge_nodes(user_id);
 CREATE INDEX IF NOT EXISTS idx_edges_user ON knowledge_edges(user_id);
+CREATE INDEX IF NOT EXISTS idx_edges_source
+    ON knowledge_edges(source_node_id, relation_type);
 """
 
+# 需在 name_norm 欄位遷移後才能建立的索引
+_NODE_NAME_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_nodes_user_type_name
+    ON knowledge_nodes(user_id, node_type, name_norm);
+"""
 
-class SQLiteStore:
-    """SQLite 非同步儲存層"""
+# FTS5 外部內容表：只索引 name_norm，由 trigger 與 knowledge_nodes 同步
+_NODE_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_nodes_fts USING fts5(
+    name_norm, content='knowledge_nodes', content_rowid='rowid', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS knowledge_nodes_fts_insert
+AFTER INSERT ON knowledge_nodes BEGIN
+    INSERT INTO knowledge_nodes_fts(rowid, name_norm)
+    VALUES (new.rowid, new.name_norm);
+END;
+
+CREATE TRIGGER IF NOT EXISTS knowledge_nodes_fts_delete
+AFTER DELETE ON knowledge_nodes BEGIN
+    INSERT INTO knowledge_nodes_fts(knowledge_nodes_fts, rowid, name_norm)
+    VALUES ('delete', old.rowid, old.name_norm);
+END;
+
+CREATE TRIGGER IF NOT EXISTS knowledge_nodes_fts_update
+AFTER UPDATE OF name_norm ON knowledge_nodes BEGIN
+    INSERT INTO knowledge_nodes_fts(knowledge_nodes_fts, rowid, name_norm)
+    VALUES ('delete', old.rowid, old.name_norm);
+    INSERT INTO knowledge_nodes_fts(rowid, name_norm)
+    VALUES (new.rowid, new.name_norm);
+END;
+"""
 
-    def __init__(self, db_path: str = "data/memory/memory.db") -> None:
+# trigram 分詞器最短可比對的字數，較短的查詢改用 LIKE
+_FTS_MIN_QUERY_CHARS = 3
+
+_INSERT_FEEDBACK_SQL = """INSERT INTO feedback
+(feedback_id, user_id, session_id, feedback_type, severity,
+ original_content, original_analysis, agent_type,
+ user_correction, user_explanation, topics_json, sources_json, processed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_MARK_PROCESSED_SQL = (
+    "UPDATE feedback SET processed = 1, learned_at = CURRENT_TIMESTAMP "
+    "WHERE feedback_id = ?"
+)
+
+_INSERT_CORRECTION_SQL = """INSERT INTO learned_corrections
+(correction_id, user_id, pattern, correction, context,
+ confidence, times_applied, times_confirmed, times_rejected, embedding_key)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# 使用 UPSERT 而非 INSERT OR REPLACE：REPLACE 的隱含刪除不會觸發 FTS 同步 trigger
+_UPSERT_NODE_SQL = """INSERT INTO knowledge_nodes
+(node_id, user_id, node_type, name, name_norm, description,
+ user_sentiment, user_notes, interaction_count, embedding_key)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(node_id) DO UPDATE SET
+    user_id = excluded.user_id,
+    node_type = excluded.node_type,
+    name = excluded.name,
+    name_norm = excluded.name_norm,
+    description = excluded.description,
+    user_sentiment = excluded.user_sentiment,
+    user_notes = excluded.user_notes,
+    interaction_count = excluded.interaction_count,
+    embedding_key = excluded.embedding_key,
+    updated_at = CURRENT_TIMESTAMP"""
+
+_UPSERT_EDGE_SQL = """INSERT OR REPLACE INTO knowledge_edges
+(edge_id, user_id, source_node_id, target_node_id,
+ relation_type, weight, user_confirmed, notes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# 多跳走訪：由起點沿出邊展開，path 以 JSON 陣列記錄已走過的節點以避免環路
+_TRAVERSE_SQL = """WITH RECURSIVE walk(node_id, depth, weight, path, relations) AS (
+    SELECT ?, 0, 1.0, json_array(?), json_array()
+    UNION ALL
+    SELECT e.target_node_id, w.depth + 1, w.weight * e.weight,
+           json_insert(w.path, '$[#]', e.target_node_id),
+           json_insert(w.relations, '$[#]', e.relation_type)
+    FROM walk w
+    JOIN knowledge_edges e ON e.source_node_id = w.node_id
+    WHERE w.depth < ? AND e.user_id = ? AND e.weight >= ? {relation_filter}
+      AND NOT EXISTS (SELECT 1 FROM json_each(w.path) WHERE value = e.target_node_id)
+)
+SELECT w.weight AS path_weight, w.path AS path_json,
+       w.relations AS relations_json, n.*
+FROM walk w JOIN knowledge_nodes n ON n.node_id = w.node_id
+WHERE w.depth > 0"""
+
+# 鄰接表：source_node_id -> [(target_node_id, relation_type, weight)]
+_Adjacency = dict[str, list[tuple[str, str, float]]]
+
+# 以 ID 列表查詢時每批的 ID 數 (低於 SQLite 舊版 999 個參數上限)
+_ID_BATCH_SIZE = 500
+
+
+def _escape_like(text: str) -> str:
+    """跳脫 LIKE 的萬用字元 (搭配 ESCAPE '!')"""
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+class SQLiteStore:
+    """SQLite 非同步儲存層
+
+    Args:
+        db_path: 資料庫路徑
+        synchronous: PRAGMA synchronous，預設使用 settings.memory_sqlite_synchronous
+        commit_interval_ms: 合併提交間隔，預設使用 settings.memory_commit_interval_ms
+            (0 表示每次寫入立即提交)
+        adjacency_cache: 是否快取知識圖譜鄰接表，預設使用 settings.memory_adjacency_cache
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/memory/memory.db",
+        synchronous: str | None = None,
+        commit_interval_ms: int | None = None,
+        adjacency_cache: bool | None = None,
+    ) -> None:
         self._db_path = Path(db_path)
         self._db: aiosqlite.Connection | None = None
+        self._synchronous = synchronous or settings.memory_sqlite_synchronous
+        self._commit_interval = (
+            commit_interval_ms
+            if commit_interval_ms is not None
+            else settings.memory_commit_interval_ms
+        ) / 1000
+        self._write_lock = asyncio.Lock()
+        self._tx_owner: asyncio.Task | None = None
+        self._dirty = False
+        self._flush_task: asyncio.Task | None = None
+        self._fts_enabled = False
+        self._adjacency_enabled = (
+            adjacency_cache
+            if adjacency_cache is not None
+            else settings.memory_adjacency_cache
+        )
+        self._adjacency: dict[str, _Adjacency] = {}
+        # 每次失效遞增；載入期間有寫入時不寫回快取
+        self._adjacency_generation = 0
 
     @property
     def _conn(self) -> aiosqlite.Connection:
@@ -120,16 +277,130 @@ class SQLiteStore:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
         self._db = await aiosqlite.connect(str(self._db_path))
         self._db.row_factory = aiosqlite.Row
+        await self._db.execute("PRAGMA journal_mode = WAL")
+        await self._db.execute(f"PRAGMA synchronous = {self._synchronous}")
         await self._db.execute("PRAGMA foreign_keys = ON")
         await self._db.executescript(_SCHEMA_SQL)
+        await self._migrate_node_names()
+        await self._db.executescript(_NODE_NAME_INDEX_SQL)
+        await self._setup_node_fts()
         await self._db.commit()
 
+    async def _migrate_node_names(self) -> None:
+        """為舊資料庫加入 name_norm 欄位並回填"""
+        async with self._conn.execute("PRAGMA table_info(knowledge_nodes)") as cursor:
+            columns = {row["name"] async for row in cursor}
+        if "name_norm" not in columns:
+            await self._conn.execute(
+                "ALTER TABLE knowledge_nodes ADD COLUMN name_norm TEXT"
+            )
+
+        async with self._conn.execute(
+            "SELECT node_id, name FROM knowledge_nodes WHERE name_norm IS NULL"
+        ) as cursor:
+            pending = [
+                (normalize_text(row["name"]), row["node_id"]) async for row in cursor
+            ]
+        if pending:
+            await self._conn.executemany(
+                "UPDATE knowledge_nodes SET name_norm = ? WHERE node_id = ?", pending
+            )
+            logger.info("已回填 %d 個知識節點的 name_norm", len(pending))
+
+    async def _setup_node_fts(self) -> None:
+        """建立知識節點名稱的 FTS5 影子表 (不支援時退回 LIKE 查詢)"""
+        async with self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'knowledge_nodes_fts'"
+        ) as cursor:
+            exists = await cursor.fetchone() is not None
+        try:
+            await self._conn.executescript(_NODE_FTS_SQL)
+        except aiosqlite.OperationalError as e:
+            logger.warning("SQLite 不支援 FTS5 trigram，節點名稱查詢改用 LIKE: %s", e)
+            return
+        if not exists:
+            # 新建的影子表需由既有節點重建索引
+            await self._conn.execute(
+                "INSERT INTO knowledge_nodes_fts(knowledge_nodes_fts) VALUES ('rebuild')"
+            )
+        self._fts_enabled = True
+
     async def close(self) -> None:
-        """關閉資料庫連線"""
+        """關閉資料庫連線 (先提交合併中的寫入)"""
         if self._db:
+            await self.flush()
             await self._db.close()
             self._db = None
 
+    # === 交易與提交 ===
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """將區塊內的寫入合併為單一交易
+
+        區塊正常結束時提交一次，發生例外時全部回滾。
+        可巢狀使用 (內層併入外層交易)；交易期間其他協程的寫入會等待交易結束。
+        """
+        if self._tx_owner is not None and self._tx_owner is asyncio.current_task():
+            yield
+            return
+
+        async with self._write_lock:
+            # 先提交合併中的寫入，避免回滾時一併丟失
+            await self._commit_pending()
+            self._tx_owner = asyncio.current_task()
+            try:
+                yield
+            except BaseException:
+                await self._conn.rollback()
+                # 交易中載入的鄰接表可能包含已回滾的邊
+                self._adjacency.clear()
+                self._adjacency_generation += 1
+                raise
+            else:
+                await self._conn.commit()
+            finally:
+                self._tx_owner = None
+
+    async def flush(self) -> None:
+        """立即提交合併中的寫入"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        async with self._write_lock:
+            await self._commit_pending()
+
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[None]:
+        """單一寫入操作：在交易中時併入交易，否則立即或延遲提交"""
+        if self._tx_owner is not None and self._tx_owner is asyncio.current_task():
+            yield
+            return
+
+        async with self._write_lock:
+            yield
+            if self._commit_interval > 0:
+                self._dirty = True
+                self._schedule_flush()
+            else:
+                await self._conn.commit()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self._commit_interval)
+        async with self._write_lock:
+            self._flush_task = None
+            await self._commit_pending()
+
+    async def _commit_pending(self) -> None:
+        """提交合併中的寫入 (呼叫時需持有 _write_lock)"""
+        if self._dirty and self._db is not None:
+            await self._db.commit()
+            self._dirty = False
+
     # === User CRUD ===
 
     async def get_user(self, user_id: str) -> UserProfile | None:
@@ -142,26 +413,33 @@ class SQLiteStore:
                 return None
             return UserProfile.model_validate_json(row[0])
 
+    async def get_users(self, user_ids: list[str]) -> dict[str, UserProfile]:
+        """依 ID 列表取得使用者 (user_id -> UserProfile，不存在的 ID 略過)"""
+        rows = await self._fetch_by_ids("users", "user_id", user_ids)
+        return {
+            row["user_id"]: UserProfile.model_validate_json(row["profile_json"])
+            for row in rows
+        }
+
     async def create_user(self, profile: UserProfile) -> None:
         """建立使用者"""
-        await self._conn.execute(
-            "INSERT INTO users (user_id, profile_json) VALUES (?, ?)",
-            (profile.user_id, profile.model_dump_json()),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(
+                "INSERT INTO users (user_id, profile_json) VALUES (?, ?)",
+                (profile.user_id, profile.model_dump_json()),
+            )
 
     async def update_user(self, profile: UserProfile) -> None:
         """更新使用者"""
-        await self._conn.execute(
-            "UPDATE users SET profile_json = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
-            (profile.model_dump_json(), profile.user_id),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(
+                "UPDATE users SET profile_json = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+                (profile.model_dump_json(), profile.user_id),
+            )
 
     async def delete_user(self, user_id: str) -> None:
         """刪除使用者及其所有資料"""
-        await self._conn.execute("BEGIN")
-        try:
+        async with self.transaction():
             await self._conn.execute(
                 "DELETE FROM knowledge_edges WHERE user_id = ?", (user_id,)
             )
@@ -171,40 +449,29 @@ class SQLiteStore:
             await self._conn.execute(
                 "DELETE FROM learned_corrections WHERE user_id = ?", (user_id,)
             )
-            await self._conn.execute("DELETE FROM feedback WHERE user_id = ?", (user_id,))
+            await self._conn.execute(
+                "DELETE FROM feedback WHERE user_id = ?", (user_id,)
+            )
             await self._conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
-            await self._conn.commit()
-        except Exception:
-            await self._conn.rollback()
-            raise
+            self._invalidate_adjacency([user_id])
 
     # === Feedback CRUD ===
 
     async def save_feedback(self, feedback: UserFeedback) -> None:
         """儲存反饋"""
-        await self._conn.execute(
-            """INSERT INTO feedback
-            (feedback_id, user_id, session_id, feedback_type, severity,
-             original_content, original_analysis, agent_type,
-             user_correction, user_explanation, topics_json, sources_json, processed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                feedback.feedback_id,
-                feedback.user_id,
-                feedback.session_id,
-                feedback.feedback_type.value,
-                feedback.severity.value,
-                feedback.original_content,
-                feedback.original_analysis,
-                feedback.agent_type,
-                feedback.user_correction,
-                feedback.user_explanation,
-                json.dumps(feedback.topics, ensure_ascii=False),
-                json.dumps(feedback.sources_mentioned, ensure_ascii=False),
-                int(feedback.processed),
-            ),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(
+                _INSERT_FEEDBACK_SQL, self._feedback_params(feedback)
+            )
+
+    async def save_feedback_many(self, feedbacks: list[UserFeedback]) -> None:
+        """批次儲存反饋 (單一交易)"""
+        if not feedbacks:
+            return
+        async with self.transaction():
+            await self._conn.executemany(
+                _INSERT_FEEDBACK_SQL, [self._feedback_params(f) for f in feedbacks]
+            )
 
     async def get_unprocessed_feedback(self, user_id: str) -> list[UserFeedback]:
         """取得未處理的反饋"""
@@ -219,35 +486,50 @@ class SQLiteStore:
 
     async def mark_feedback_processed(self, feedback_id: str) -> None:
         """標記反饋為已處理"""
-        await self._conn.execute(
-            "UPDATE feedback SET processed = 1, learned_at = CURRENT_TIMESTAMP WHERE feedback_id = ?",
-            (feedback_id,),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(_MARK_PROCESSED_SQL, (feedback_id,))
+
+    async def mark_feedback_processed_many(self, feedback_ids: list[str]) -> None:
+        """批次標記反饋為已處理 (單一交易)"""
+        if not feedback_ids:
+            return
+        async with self.transaction():
+            await self._conn.executemany(
+                _MARK_PROCESSED_SQL, [(feedback_id,) for feedback_id in feedback_ids]
+            )
+
+    async def get_feedback_by_ids(self, feedback_ids: list[str]) -> list[UserFeedback]:
+        """依 ID 列表取得反饋 (不存在的 ID 略過)"""
+        rows = await self._fetch_by_ids("feedback", "feedback_id", feedback_ids)
+        return [self._row_to_feedback(row) for row in rows]
 
     # === Corrections CRUD ===
 
     async def save_correction(self, correction: LearnedCorrection) -> None:
         """儲存學習到的修正"""
-        await self._conn.execute(
-            """INSERT INTO learned_corrections
-            (correction_id, user_id, pattern, correction, context,
-             confidence, times_applied, times_confirmed, times_rejected, embedding_key)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                correction.correction_id,
-                correction.user_id,
-                correction.pattern,
-                correction.correction,
-                correction.context,
-                correction.confidence,
-                correction.times_applied,
-                correction.times_confirmed,
-                correction.times_rejected,
-                correction.embedding_key,
-            ),
+        async with self._write():
+            await self._conn.execute(
+                _INSERT_CORRECTION_SQL, self._correction_params(correction)
+            )
+
+    async def save_corrections_many(self, corrections: list[LearnedCorrection]) -> None:
+        """批次儲存修正 (單一交易)"""
+        if not corrections:
+            return
+        async with self.transaction():
+            await self._conn.executemany(
+                _INSERT_CORRECTION_SQL,
+                [self._correction_params(c) for c in corrections],
+            )
+
+    async def get_corrections_by_ids(
+        self, correction_ids: list[str]
+    ) -> list[LearnedCorrection]:
+        """依 ID 列表取得修正 (不存在的 ID 略過)"""
+        rows = await self._fetch_by_ids(
+            "learned_corrections", "correction_id", correction_ids
         )
-        await self._conn.commit()
+        return [self._row_to_correction(row) for row in rows]
 
     async def get_corrections(
         self, user_id: str, limit: int = 10
@@ -267,48 +549,46 @@ class SQLiteStore:
         self, correction_id: str, confirmed: bool
     ) -> None:
         """更新修正統計"""
-        if confirmed:
-            await self._conn.execute(
-                """UPDATE learned_corrections
-                SET times_confirmed = times_confirmed + 1,
-                    times_applied = times_applied + 1,
-                    confidence = MIN(1.0, confidence + 0.05)
-                WHERE correction_id = ?""",
-                (correction_id,),
-            )
-        else:
-            await self._conn.execute(
-                """UPDATE learned_corrections
-                SET times_rejected = times_rejected + 1,
-                    times_applied = times_applied + 1,
-                    confidence = MAX(0.0, confidence - 0.1)
-                WHERE correction_id = ?""",
-                (correction_id,),
-            )
-        await self._conn.commit()
+        async with self._write():
+            if confirmed:
+                await self._conn.execute(
+                    """UPDATE learned_corrections
+                    SET times_confirmed = times_confirmed + 1,
+                        times_applied = times_applied + 1,
+                        confidence = MIN(1.0, confidence + 0.05)
+                    WHERE correction_id = ?""",
+                    (correction_id,),
+                )
+            else:
+                await self._conn.execute(
+                    """UPDATE learned_corrections
+                    SET times_rejected = times_rejected + 1,
+                        times_applied = times_applied + 1,
+                        confidence = MAX(0.0, confidence - 0.1)
+                    WHERE correction_id = ?""",
+                    (correction_id,),
+                )
 
     # === Knowledge Graph ===
 
     async def save_node(self, node: KnowledgeNode) -> None:
         """儲存知識節點"""
-        await self._conn.execute(
-            """INSERT OR REPLACE INTO knowledge_nodes
-            (node_id, user_id, node_type, name, description,
-             user_sentiment, user_notes, interaction_count, embedding_key)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                node.node_id,
-                node.user_id,
-                node.node_type.value,
-                node.name,
-                node.description,
-                node.user_sentiment,
-                node.user_notes,
-                node.interaction_count,
-                node.embedding_key,
-            ),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(_UPSERT_NODE_SQL, self._node_params(node))
+
+    async def save_nodes_many(self, nodes: list[KnowledgeNode]) -> None:
+        """批次儲存知識節點 (單一交易)"""
+        if not nodes:
+            return
+        async with self.transaction():
+            await self._conn.executemany(
+                _UPSERT_NODE_SQL, [self._node_params(n) for n in nodes]
+            )
+
+    async def get_nodes_by_ids(self, node_ids: list[str]) -> list[KnowledgeNode]:
+        """依 ID 列表取得知識節點 (不存在的 ID 略過)"""
+        rows = await self._fetch_by_ids("knowledge_nodes", "node_id", node_ids)
+        return [self._row_to_node(row) for row in rows]
 
     async def get_nodes(
         self, user_id: str, node_type: NodeType | None = None
@@ -327,25 +607,77 @@ class SQLiteStore:
                 results.append(self._row_to_node(row))
         return results
 
+    async def find_nodes(
+        self,
+        user_id: str,
+        query: str,
+        node_type: NodeType | None = None,
+        limit: int | None = None,
+    ) -> list[KnowledgeNode]:
+        """依名稱搜尋知識節點 (不分大小寫、全半形)
+
+        以正規化名稱比對子字串：3 字以上使用 FTS5 trigram 索引，較短的查詢以
+        (user_id, node_type, name_norm) 索引限定範圍後用 LIKE 比對。
+        結果依完全相符、前綴相符、其他子字串相符排序，同級以名稱較短者優先。
+
+        Args:
+            user_id: 使用者 ID
+            query: 查詢字串
+            node_type: 節點類型，None 表示不限
+            limit: 最多回傳筆數，None 表示不限
+
+        Returns:
+            符合的知識節點列表
+        """
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+
+        escaped = _escape_like(normalized)
+        conditions = ["user_id = ?"]
+        params: list = [user_id]
+        if node_type:
+            conditions.append("node_type = ?")
+            params.append(node_type.value)
+        if self._fts_enabled and len(normalized) >= _FTS_MIN_QUERY_CHARS:
+            conditions.append(
+                "rowid IN (SELECT rowid FROM knowledge_nodes_fts "
+                "WHERE knowledge_nodes_fts MATCH ?)"
+            )
+            params.append('"' + normalized.replace('"', '""') + '"')
+        else:
+            conditions.append("name_norm LIKE ? ESCAPE '!'")
+            params.append(f"%{escaped}%")
+
+        sql = f"""SELECT * FROM knowledge_nodes WHERE {" AND ".join(conditions)}
+            ORDER BY CASE
+                WHEN name_norm = ? THEN 0
+                WHEN name_norm LIKE ? ESCAPE '!' THEN 1
+                ELSE 2
+            END, length(name_norm), name_norm"""
+        params.extend([normalized, f"{escaped}%"])
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        async with self._conn.execute(sql, params) as cursor:
+            return [self._row_to_node(row) async for row in cursor]
+
     async def save_edge(self, edge: KnowledgeEdge) -> None:
         """儲存知識邊"""
-        await self._conn.execute(
-            """INSERT OR REPLACE INTO knowledge_edges
-            (edge_id, user_id, source_node_id, target_node_id,
-             relation_type, weight, user_confirmed, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                edge.edge_id,
-                edge.user_id,
-                edge.source_node_id,
-                edge.target_node_id,
-                edge.relation_type,
-                edge.weight,
-                int(edge.user_confirmed),
-                edge.notes,
-            ),
-        )
-        await self._conn.commit()
+        async with self._write():
+            await self._conn.execute(_UPSERT_EDGE_SQL, self._edge_params(edge))
+            self._invalidate_adjacency([edge.user_id])
+
+    async def save_edges_many(self, edges: list[KnowledgeEdge]) -> None:
+        """批次儲存知識邊 (單一交易)"""
+        if not edges:
+            return
+        async with self.transaction():
+            await self._conn.executemany(
+                _UPSERT_EDGE_SQL, [self._edge_params(e) for e in edges]
+            )
+            self._invalidate_adjacency({e.user_id for e in edges})
 
     async def get_related_nodes(self, node_id: str) -> list[tuple[KnowledgeNode, str]]:
         """取得與指定節點相關的節點"""
@@ -362,8 +694,228 @@ class SQLiteStore:
                 results.append((node, relation))
         return results
 
+    async def traverse(
+        self,
+        user_id: str,
+        node_id: str,
+        max_depth: int = 2,
+        relation_types: Iterable[str] | None = None,
+        min_weight: float = 0.0,
+        limit: int | None = None,
+    ) -> list[KnowledgePath]:
+        """由節點沿出邊做多跳走訪
+
+        同一節點可經由不同路徑到達 (各自回傳)，路徑不重複經過節點。
+        啟用鄰接表快取時在記憶體中走訪，否則以遞迴 CTE 查詢，兩者結果相同。
+
+        Args:
+            user_id: 使用者 ID
+            node_id: 起始節點 ID
+            max_depth: 最多走幾跳
+            relation_types: 只走這些關係類型的邊，None 表示不限
+            min_weight: 邊權重下限，低於此值的邊不走
+            limit: 最多回傳的路徑數，None 表示不限
+
+        Returns:
+            依累積權重由高到低、再依路徑長度由短到長排序的路徑列表
+        """
+        if max_depth < 1:
+            return []
+        relations = set(relation_types) if relation_types is not None else None
+        if self._adjacency_enabled:
+            walks = await self._traverse_cached(
+                user_id, node_id, max_depth, relations, min_weight
+            )
+        else:
+            walks = await self._traverse_sql(
+                user_id, node_id, max_depth, relations, min_weight
+            )
+        walks.sort(key=lambda p: (-p.weight, p.depth, p.node_ids))
+        return walks[:limit] if limit is not None else walks
+
+    async def _traverse_sql(
+        self,
+        user_id: str,
+        node_id: str,
+        max_depth: int,
+        relations: set[str] | None,
+        min_weight: float,
+    ) -> list[KnowledgePath]:
+        """以遞迴 CTE 走訪 (使用 idx_edges_source 索引)"""
+        params: list = [node_id, node_id, max_depth, user_id, min_weight]
+        relation_filter = ""
+        if relations is not None:
+            if not relations:
+                return []
+            relation_filter = (
+                f"AND e.relation_type IN ({', '.join('?' * len(relations))})"
+            )
+            params.extend(sorted(relations))
+
+        sql = _TRAVERSE_SQL.format(relation_filter=relation_filter)
+        async with self._conn.execute(sql, params) as cursor:
+            return [
+                KnowledgePath(
+                    node=self._row_to_node(row),
+                    node_ids=json.loads(row["path_json"]),
+                    relations=json.loads(row["relations_json"]),
+                    weight=row["path_weight"],
+                )
+                async for row in cursor
+            ]
+
+    async def _traverse_cached(
+        self,
+        user_id: str,
+        node_id: str,
+        max_depth: int,
+        relations: set[str] | None,
+        min_weight: float,
+    ) -> list[KnowledgePath]:
+        """以快取的鄰接表在記憶體中走訪，最後一次查詢取得終點節點"""
+        adjacency = await self._get_adjacency(user_id)
+        found: list[tuple[list[str], list[str], float]] = []
+        frontier = [([node_id], [], 1.0)]
+        for _ in range(max_depth):
+            next_frontier = []
+            for path, path_relations, weight in frontier:
+                for target, relation, edge_weight in adjacency.get(path[-1], ()):
+                    if edge_weight < min_weight or target in path:
+                        continue
+                    if relations is not None and relation not in relations:
+                        continue
+                    step = (
+                        [*path, target],
+                        [*path_relations, relation],
+                        weight * edge_weight,
+                    )
+                    found.append(step)
+                    next_frontier.append(step)
+            frontier = next_frontier
+
+        nodes = {
+            n.node_id: n
+            for n in await self.get_nodes_by_ids([path[-1] for path, _, _ in found])
+        }
+        return [
+            KnowledgePath(
+                node=nodes[path[-1]],
+                node_ids=path,
+                relations=path_relations,
+                weight=weight,
+            )
+            for path, path_relations, weight in found
+            if path[-1] in nodes
+        ]
+
+    async def _get_adjacency(self, user_id: str) -> _Adjacency:
+        """取得使用者的鄰接表 (未快取時以單一查詢載入)"""
+        cached = self._adjacency.get(user_id)
+        if cached is not None:
+            return cached
+
+        generation = self._adjacency_generation
+        adjacency: _Adjacency = {}
+        async with self._conn.execute(
+            """SELECT source_node_id, target_node_id, relation_type, weight
+            FROM knowledge_edges WHERE user_id = ? ORDER BY rowid""",
+            (user_id,),
+        ) as cursor:
+            async for row in cursor:
+                adjacency.setdefault(row["source_node_id"], []).append(
+                    (row["target_node_id"], row["relation_type"], row["weight"])
+                )
+        # 載入期間有邊寫入時，結果可能是寫入前的狀態，不寫回快取
+        if generation == self._adjacency_generation:
+            self._adjacency[user_id] = adjacency
+        return adjacency
+
+    def _invalidate_adjacency(self, user_ids: Iterable[str]) -> None:
+        """邊寫入後使鄰接表快取失效 (在寫入鎖內、寫入完成後呼叫)"""
+        self._adjacency_generation += 1
+        for user_id in user_ids:
+            self._adjacency.pop(user_id, None)
+
     # === Private helpers ===
 
+    async def _fetch_by_ids(
+        self, table: str, id_column: str, ids: list[str]
+    ) -> list[aiosqlite.Row]:
+        """以 IN (...) 查詢多個 ID (每批最多 _ID_BATCH_SIZE 個，依輸入順序回傳)"""
+        unique_ids = list(dict.fromkeys(ids))
+        by_id: dict[str, aiosqlite.Row] = {}
+        for i in range(0, len(unique_ids), _ID_BATCH_SIZE):
+            batch = unique_ids[i : i + _ID_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            async with self._conn.execute(
+                f"SELECT * FROM {table} WHERE {id_column} IN ({placeholders})",
+                batch,
+            ) as cursor:
+                async for row in cursor:
+                    by_id[row[id_column]] = row
+        return [by_id[i] for i in unique_ids if i in by_id]
+
+    @staticmethod
+    def _feedback_params(feedback: UserFeedback) -> tuple:
+        return (
+            feedback.feedback_id,
+            feedback.user_id,
+            feedback.session_id,
+            feedback.feedback_type.value,
+            feedback.severity.value,
+            feedback.original_content,
+            feedback.original_analysis,
+            feedback.agent_type,
+            feedback.user_correction,
+            feedback.user_explanation,
+            json.dumps(feedback.topics, ensure_ascii=False),
+            json.dumps(feedback.sources_mentioned, ensure_ascii=False),
+            int(feedback.processed),
+        )
+
+    @staticmethod
+    def _correction_params(correction: LearnedCorrection) -> tuple:
+        return (
+            correction.correction_id,
+            correction.user_id,
+            correction.pattern,
+            correction.correction,
+            correction.context,
+            correction.confidence,
+            correction.times_applied,
+            correction.times_confirmed,
+            correction.times_rejected,
+            correction.embedding_key,
+        )
+
+    @staticmethod
+    def _node_params(node: KnowledgeNode) -> tuple:
+        return (
+            node.node_id,
+            node.user_id,
+            node.node_type.value,
+            node.name,
+            normalize_text(node.name),
+            node.description,
+            node.user_sentiment,
+            node.user_notes,
+            node.interaction_count,
+            node.embedding_key,
+        )
+
+    @staticmethod
+    def _edge_params(edge: KnowledgeEdge) -> tuple:
+        return (
+            edge.edge_id,
+            edge.user_id,
+            edge.source_node_id,
+            edge.target_node_id,
+            edge.relation_type,
+            edge.weight,
+            int(edge.user_confirmed),
+            edge.notes,
+        )
+
     def _row_to_feedback(self, row) -> UserFeedback:
         """將 DB row 轉為 UserFeedback"""
         topics = json.loads(row["topics_json"]) if row["topics_json"] else []
@@ -1,88 +1,289 @@
 """向量儲存層
 
-使用 Chroma 提供向量相似度搜尋。
+使用 Chroma 提供向量相似度搜尋。文字 embedding 經由 EmbeddingCache 快取，
+相同文字 (同一模型) 只會呼叫一次 embedding API。
+批次寫入 (store_*_many) 以 embed_documents 分批嵌入，每批一次 upsert。
+
+collection handle 與文件數在首次使用時載入並快取，之後的搜尋只需一次執行緒切換
+(collection.query)；空的 collection 直接回傳，不需嵌入查詢文字。
+文件數只追蹤本實例的寫入，其他行程寫入同一目錄時需重新建立 VectorStore。
+
+VECTOR_BACKEND=numpy 時改用 NumpyIndex (memory-mapped 矩陣暴力搜尋)，
+資料存放在 persist_dir/numpy，與 Chroma 的資料互不相通。
 """
 
 import asyncio
 import hashlib
 import logging
+import sqlite3
+from collections.abc import Sequence
 from pathlib import Path
 
 import chromadb
+from chromadb.api.models.Collection import Collection
+from chromadb.errors import NotFoundError
 
 from src.memory.models.learned_correction import LearnedCorrection
+from src.memory.storage.numpy_index import NumpyIndex, NumpyIndexClient
+from src.utils.config import settings
+from src.utils.embedding_cache import EmbeddingCache, get_embedding_cache
 from src.utils.llm_factory import create_embedding_model
 
 logger = logging.getLogger(__name__)
 
 
 class VectorStore:
-    """Chroma 向量儲存
+    """向量儲存 (Chroma 或 NumpyIndex)
 
     按 user_id 隔離 collection，提供語意搜尋功能。
+
+    Args:
+        persist_dir: Chroma 資料目錄
+        embedding_cache: Embedding 快取，預設在 settings.embedding_cache_enabled 時
+            使用全域快取
+        embeddings: Embedding 模型，預設使用 create_embedding_model()
+        backend: 向量索引後端 ("chroma" 或 "numpy")，預設使用 settings.vector_backend
     """
 
-    def __init__(self, persist_dir: str = "data/memory/vectorstore") -> None:
+    def __init__(
+        self,
+        persist_dir: str = "data/memory/vectorstore",
+        embedding_cache: EmbeddingCache | None = None,
+        embeddings=None,
+        backend: str | None = None,
+    ) -> None:
         self._persist_dir = Path(persist_dir)
-        self._client: chromadb.ClientAPI | None = None
-        self._embedding_fn = None
+        self._backend = backend or settings.vector_backend
+        self._client: chromadb.ClientAPI | NumpyIndexClient | None = None
+        self._embedding_fn = embeddings
+        self._embedding_cache = embedding_cache
+        # collection 名稱 -> handle / 文件數
+        self._collections: dict[str, Collection | NumpyIndex] = {}
+        self._counts: dict[str, int] = {}
 
     async def initialize(self) -> None:
-        """初始化 Chroma 客戶端"""
+        """初始化向量索引客戶端"""
         self._persist_dir.mkdir(parents=True, exist_ok=True)
 
-        self._client = await asyncio.to_thread(
-            chromadb.PersistentClient,
-            path=str(self._persist_dir),
-        )
+        if self._backend == "numpy":
+            self._client = NumpyIndexClient(self._persist_dir / "numpy")
+        else:
+            self._client = await asyncio.to_thread(
+                chromadb.PersistentClient,
+                path=str(self._persist_dir),
+            )
+
+        if self._embedding_fn is None:
+            self._embedding_fn = create_embedding_model()
+        if self._embedding_cache is None and settings.embedding_cache_enabled:
+            self._embedding_cache = get_embedding_cache()
+
+    @staticmethod
+    def _collection_name(user_id: str, collection_type: str) -> str:
+        # Chroma collection 名稱限制: 3-63 字元, [a-zA-Z0-9_-]
+        return f"{user_id}_{collection_type}"[:63].replace(".", "_")
+
+    def _get_collection(
+        self, user_id: str, collection_type: str
+    ) -> Collection | NumpyIndex:
+        """取得或建立 collection (快取 handle，首次取得時一併讀取文件數)"""
+        name = self._collection_name(user_id, collection_type)
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._client.get_or_create_collection(name=name)
+            self._counts[name] = collection.count()
+            self._collections[name] = collection
+        return collection
+
+    async def _collection(
+        self, user_id: str, collection_type: str
+    ) -> tuple[str, Collection | NumpyIndex]:
+        """取得 (名稱, collection)；已快取時不切換執行緒"""
+        name = self._collection_name(user_id, collection_type)
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = await asyncio.to_thread(
+                self._get_collection, user_id, collection_type
+            )
+        return name, collection
+
+    def _upsert(
+        self, name: str, collection: Collection | NumpyIndex, **records
+    ) -> None:
+        """寫入並更新文件數 (在執行緒中執行，與 upsert 同一次切換)"""
+        collection.upsert(**records)
+        self._counts[name] = collection.count()
 
-        self._embedding_fn = create_embedding_model()
+    async def _query(
+        self,
+        user_id: str,
+        collection_type: str,
+        query: str,
+        limit: int,
+        include: list[str],
+    ) -> dict | None:
+        """以查詢文字搜尋 collection；collection 為空時回傳 None"""
+        name, collection = await self._collection(user_id, collection_type)
+        count = self._counts.get(name, 0)
+        if count == 0:
+            return None
 
-    def _get_collection(self, user_id: str, collection_type: str):
-        """取得或建立 collection"""
-        name = f"{user_id}_{collection_type}"
-        # Chroma collection 名稱限制: 3-63 字元, [a-zA-Z0-9_-]
-        safe_name = name[:63].replace(".", "_")
-        return self._client.get_or_create_collection(name=safe_name)
+        query_embedding = await self._embed_text(query)
+        return await asyncio.to_thread(
+            collection.query,
+            query_embeddings=[query_embedding],
+            n_results=min(limit, count),
+            include=include,
+        )
 
     async def _embed_text(self, text: str) -> list[float]:
-        """將文字轉為 embedding"""
+        """將文字轉為 embedding (先查 embedding 快取)"""
+        (cached,) = await self._cache_lookup([text])
+        if cached is not None:
+            return cached
+
         result = await asyncio.to_thread(self._embedding_fn.embed_query, text)
+        await self._cache_store([text], [result])
         return result
 
+    async def _embed_texts(self, texts: Sequence[str]) -> list[list[float]]:
+        """批次將文字轉為 embedding
+
+        快取未命中的文字去重後以 embed_documents 分批嵌入
+        (每批最多 settings.embedding_batch_size 段)。
+        """
+        vectors = await self._cache_lookup(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+
+        computed: dict[str, list[float]] = {}
+        batch_size = settings.embedding_batch_size
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i : i + batch_size]
+            embedded = await asyncio.to_thread(
+                self._embedding_fn.embed_documents, batch
+            )
+            computed.update(zip(batch, embedded, strict=True))
+            await self._cache_store(batch, embedded)
+
+        return [v if v is not None else computed[t] for t, v in zip(texts, vectors)]
+
+    def _cache_model(self) -> str | None:
+        """embedding 快取使用的模型名稱 (無法取得或停用快取時為 None)"""
+        model = getattr(self._embedding_fn, "model", None)
+        if self._embedding_cache is None or not isinstance(model, str):
+            return None
+        return model
+
+    async def _cache_lookup(self, texts: Sequence[str]) -> list[list[float] | None]:
+        model = self._cache_model()
+        if model is None:
+            return [None] * len(texts)
+        try:
+            return await self._embedding_cache.get_many(model, texts)
+        except sqlite3.Error as e:
+            logger.warning("Embedding 快取讀取失敗，直接呼叫 embedding API: %s", e)
+            return [None] * len(texts)
+
+    async def _cache_store(
+        self, texts: Sequence[str], vectors: Sequence[list[float]]
+    ) -> None:
+        model = self._cache_model()
+        if model is None:
+            return
+        try:
+            await self._embedding_cache.set_many(model, texts, vectors)
+        except sqlite3.Error as e:
+            logger.warning("Embedding 快取寫入失敗: %s", e)
+
+    async def _upsert_batches(
+        self,
+        user_id: str,
+        collection_type: str,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """分批嵌入文件並寫入 collection (每批一次 embedding 呼叫與一次 upsert)"""
+        name, collection = await self._collection(user_id, collection_type)
+        batch_size = settings.embedding_batch_size
+        for i in range(0, len(ids), batch_size):
+            batch = slice(i, i + batch_size)
+            embeddings = await self._embed_texts(documents[batch])
+            await asyncio.to_thread(
+                self._upsert,
+                name,
+                collection,
+                ids=ids[batch],
+                embeddings=embeddings,
+                documents=documents[batch],
+                metadatas=metadatas[batch],
+            )
+
     # === Corrections ===
 
+    @staticmethod
+    def _correction_document(correction: LearnedCorrection) -> tuple[str, dict]:
+        """修正的向量文件與 metadata"""
+        text = f"{correction.pattern} | {correction.correction} | {correction.context}"
+        metadata = {
+            "correction_id": correction.correction_id,
+            "pattern": correction.pattern,
+            "correction": correction.correction,
+            "context": correction.context,
+            "confidence": correction.confidence,
+        }
+        return text, metadata
+
     async def store_correction(
         self,
         user_id: str,
         correction: LearnedCorrection,
     ) -> str:
         """儲存修正到向量庫"""
-        collection = await asyncio.to_thread(
-            self._get_collection, user_id, "corrections"
-        )
+        name, collection = await self._collection(user_id, "corrections")
 
-        text = f"{correction.pattern} | {correction.correction} | {correction.context}"
+        text, metadata = self._correction_document(correction)
         embedding = await self._embed_text(text)
 
         await asyncio.to_thread(
-            collection.upsert,
+            self._upsert,
+            name,
+            collection,
             ids=[correction.correction_id],
             embeddings=[embedding],
             documents=[text],
-            metadatas=[
-                {
-                    "correction_id": correction.correction_id,
-                    "pattern": correction.pattern,
-                    "correction": correction.correction,
-                    "context": correction.context,
-                    "confidence": correction.confidence,
-                }
-            ],
+            metadatas=[metadata],
         )
 
         return correction.correction_id
 
+    async def store_corrections_many(
+        self, corrections: list[LearnedCorrection]
+    ) -> list[str]:
+        """批次儲存修正 (依 correction.user_id 分到各使用者的 collection)
+
+        Returns:
+            依輸入順序的 correction_id 列表
+        """
+        # 同一 correction_id 以最後一筆為準，Chroma 不允許單次 upsert 含重複 ID
+        by_user: dict[str, dict[str, LearnedCorrection]] = {}
+        for correction in corrections:
+            by_user.setdefault(correction.user_id, {})[correction.correction_id] = (
+                correction
+            )
+
+        for user_id, unique in by_user.items():
+            items = list(unique.values())
+            documents = [self._correction_document(c) for c in items]
+            await self._upsert_batches(
+                user_id,
+                "corrections",
+                ids=[c.correction_id for c in items],
+                documents=[text for text, _ in documents],
+                metadatas=[metadata for _, metadata in documents],
+            )
+        return [c.correction_id for c in corrections]
+
     async def search_corrections(
         self,
         user_id: str,
@@ -90,22 +291,8 @@ class VectorStore:
         limit: int = 5,
     ) -> list[dict]:
         """搜尋相關修正"""
-        collection = await asyncio.to_thread(
-            self._get_collection, user_id, "corrections"
-        )
-
-        # 檢查 collection 是否有資料
-        count = await asyncio.to_thread(collection.count)
-        if count == 0:
-            return []
-
-        query_embedding = await self._embed_text(query)
-
-        results = await asyncio.to_thread(
-            collection.query,
-            query_embeddings=[query_embedding],
-            n_results=min(limit, count),
-            include=["metadatas", "distances"],
+        results = await self._query(
+            user_id, "corrections", query, limit, ["metadatas", "distances"]
         )
 
         corrections = []
@@ -124,21 +311,49 @@ class VectorStore:
         content: str,
     ) -> None:
         """儲存對話到向量庫"""
-        collection = await asyncio.to_thread(
-            self._get_collection, user_id, "conversations"
-        )
+        name, collection = await self._collection(user_id, "conversations")
 
         embedding = await self._embed_text(content)
-        doc_id = f"{session_id}_{hashlib.sha256(content.encode()).hexdigest()[:10]}"
+        doc_id = self._conversation_id(session_id, content)
 
         await asyncio.to_thread(
-            collection.upsert,
+            self._upsert,
+            name,
+            collection,
             ids=[doc_id],
             embeddings=[embedding],
             documents=[content],
             metadatas=[{"session_id": session_id}],
         )
 
+    async def store_conversations_many(
+        self,
+        user_id: str,
+        conversations: list[tuple[str, str]],
+    ) -> None:
+        """批次儲存對話
+
+        Args:
+            user_id: 使用者 ID
+            conversations: (session_id, content) 列表
+        """
+        # 相同 session 與內容的對話 ID 相同，Chroma 不允許單次 upsert 含重複 ID
+        unique = {
+            self._conversation_id(session_id, content): (session_id, content)
+            for session_id, content in conversations
+        }
+        await self._upsert_batches(
+            user_id,
+            "conversations",
+            ids=list(unique),
+            documents=[content for _, content in unique.values()],
+            metadatas=[{"session_id": session_id} for session_id, _ in unique.values()],
+        )
+
+    @staticmethod
+    def _conversation_id(session_id: str, content: str) -> str:
+        return f"{session_id}_{hashlib.sha256(content.encode()).hexdigest()[:10]}"
+
     async def search_conversations(
         self,
         user_id: str,
@@ -146,21 +361,12 @@ class VectorStore:
         limit: int = 5,
     ) -> list[dict]:
         """搜尋相關對話"""
-        collection = await asyncio.to_thread(
-            self._get_collection, user_id, "conversations"
-        )
-
-        count = await asyncio.to_thread(collection.count)
-        if count == 0:
-            return []
-
-        query_embedding = await self._embed_text(query)
-
-        results = await asyncio.to_thread(
-            collection.query,
-            query_embeddings=[query_embedding],
-            n_results=min(limit, count),
-            include=["documents", "metadatas", "distances"],
+        results = await self._query(
+            user_id,
+            "conversations",
+            query,
+            limit,
+            ["documents", "metadatas", "distances"],
         )
 
         conversations = []
@@ -183,10 +389,12 @@ class VectorStore:
     async def delete_user_data(self, user_id: str) -> None:
         """刪除使用者的所有向量資料"""
         for collection_type in ["corrections", "conversations"]:
-            name = f"{user_id}_{collection_type}"[:63].replace(".", "_")
+            name = self._collection_name(user_id, collection_type)
+            self._collections.pop(name, None)
+            self._counts.pop(name, None)
             try:
                 await asyncio.to_thread(self._client.delete_collection, name)
-            except ValueError:
+            except (ValueError, NotFoundError):
                 # Collection 不存在時安全忽略
                 logger.debug("Collection %s 不存在，跳過刪除", name)
             except Exception as e:
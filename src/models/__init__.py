@@ -4,6 +4,7 @@ from src.models.content import (
     AnalysisResult,
     ContentItem,
     EngagementMetrics,
+    QuorumPolicy,
     ResearchRequest,
 )
 from src.models.video_material import (
@@ -17,6 +18,7 @@ __all__ = [
     "AnalysisResult",
     "ContentItem",
     "EngagementMetrics",
+    "QuorumPolicy",
     "ResearchRequest",
     # video_material.py
     "PlatformVariant",
@@ -66,6 +66,33 @@ class ContentItem(BaseModel):
 
     # 元數據
     raw_data: dict | None = Field(default=None, description="原始資料 (除錯用)")
+    relevance_score: float | None = Field(
+        default=None, description="與研究主題的相關性分數 (0-1，本地 BM25 評分)"
+    )
+
+
+class QuorumPolicy(BaseModel):
+    """抓取法定數量 (quorum) 策略
+
+    達成條件任一成立時，深度分析即以目前已收集的內容開始，不等待較慢的來源：
+    - 已收集 min_items 筆，且來自至少 min_source_types 種來源類型
+    - 自開始抓取起已過 max_wait_seconds 秒
+    """
+
+    min_items: int = Field(default=20, ge=1, description="最少內容數")
+    min_source_types: int = Field(default=2, ge=1, le=4, description="最少來源類型數")
+    max_wait_seconds: float | None = Field(
+        default=None, gt=0, description="最長等待秒數 (None 表示不限時間)"
+    )
+    late_items: Literal["refine", "exclude"] = Field(
+        default="refine",
+        description="遲到內容的處理方式: refine=增量補充分析, exclude=記錄為排除",
+    )
+    late_grace_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="分析完成後等待遲到來源的秒數，逾時仍未完成的來源會被取消",
+    )
 
 
 class ResearchRequest(BaseModel):
@@ -83,6 +110,9 @@ class ResearchRequest(BaseModel):
         default=10, ge=1, le=50, description="每個來源最大結果數"
     )
     tone: str = Field(default="中性", description="內容調性 (嚴肅/中性/輕鬆/幽默)")
+    quorum: QuorumPolicy | None = Field(
+        default=None, description="提早開始分析的 quorum 策略 (None 表示等待所有來源)"
+    )
 
 
 class AnalysisResult(BaseModel):
@@ -2,7 +2,12 @@
 
 from src.scrapers.base import BaseScraper
 from src.scrapers.google_news import GoogleNewsScraper
-from src.scrapers.linkedin import LinkedInScraper, LinkedInURLHandler
+from src.scrapers.linkedin import (
+    LinkedInBatchResult,
+    LinkedInScraper,
+    LinkedInURLHandler,
+    normalize_linkedin_url,
+)
 from src.scrapers.news_api import NewsAPIScraper
 from src.scrapers.ptt import PTTScraper
 from src.scrapers.threads import ThreadsScraper
@@ -10,9 +15,11 @@ from src.scrapers.threads import ThreadsScraper
 __all__ = [
     "BaseScraper",
     "GoogleNewsScraper",
+    "LinkedInBatchResult",
     "LinkedInScraper",
     "LinkedInURLHandler",
     "NewsAPIScraper",
     "PTTScraper",
     "ThreadsScraper",
+    "normalize_linkedin_url",
 ]
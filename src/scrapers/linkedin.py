@@ -9,11 +9,14 @@
 - 過度抓取可能導致 IP 被封鎖
 """
 
+import asyncio
 import logging
+from collections import OrderedDict
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
 
 from bs4 import BeautifulSoup
+from pydantic import BaseModel, Field
 
 from src.models.content import ContentItem
 from src.scrapers.base import BaseScraper
@@ -23,6 +26,55 @@ logger = logging.getLogger(__name__)
 
 LINKEDIN_BASE_URL = "https://www.linkedin.com"
 
+# 批次抓取的預設並行數 (實際速率仍受 rate_limit("linkedin") 控制)
+DEFAULT_BATCH_CONCURRENCY = 5
+
+# LinkedInURLHandler 快取的已解析頁面數上限 (LRU)
+DEFAULT_CACHE_SIZE = 256
+
+
+def normalize_linkedin_url(url: str) -> str | None:
+    """正規化 LinkedIn URL，用於去重與快取
+
+    - 補上 https 協議、統一主機為 www.linkedin.com (含 m. 與地區子網域)
+    - 移除 query string 與 fragment (追蹤參數如 utm_*、trk)
+    - 移除結尾斜線
+
+    Args:
+        url: 使用者提供的 URL
+
+    Returns:
+        正規化後的 URL；非 LinkedIn URL 時回傳 None
+    """
+    text = url.strip()
+    if not text:
+        return None
+    if "://" not in text:
+        text = f"https://{text}"
+
+    try:
+        parsed = urlparse(text)
+    except ValueError:
+        return None
+
+    host = (parsed.hostname or "").lower()
+    if host != "linkedin.com" and not host.endswith(".linkedin.com"):
+        return None
+
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse(("https", "www.linkedin.com", path, "", "", ""))
+
+
+class LinkedInBatchResult(BaseModel):
+    """LinkedIn 批次抓取結果"""
+
+    items: list[ContentItem] = Field(default_factory=list, description="成功解析的內容")
+    failures: dict[str, str] = Field(
+        default_factory=dict, description="失敗的 URL 與原因"
+    )
+    duplicates: int = Field(default=0, description="被去重略過的 URL 數")
+    cache_hits: int = Field(default=0, description="命中快取的 URL 數")
+
 
 class LinkedInScraper(BaseScraper):
     """LinkedIn 爬蟲
@@ -79,15 +131,25 @@ class LinkedInScraper(BaseScraper):
         Returns:
             ContentItem 或 None
         """
-        await rate_limit("linkedin")
-
         try:
-            response = await self._fetch(url)
-            return self._parse_linkedin_page(response.text, url)
+            return await self.fetch_post(url)
         except Exception:
             logger.warning("LinkedIn 貼文抓取失敗: %s", url, exc_info=True)
             return None
 
+    async def fetch_post(self, url: str) -> ContentItem | None:
+        """抓取並解析 LinkedIn 頁面
+
+        與 get_post 相同，但錯誤直接拋出，供批次處理記錄原因。
+
+        Returns:
+            ContentItem，頁面沒有可解析的內容時為 None
+        """
+        await rate_limit("linkedin")
+
+        response = await self._fetch(url)
+        return self._parse_linkedin_page(response.text, url)
+
     async def get_company_posts(
         self,
         company_url: str,
@@ -235,10 +297,21 @@ class LinkedInURLHandler:
 
     專門處理用戶提供的 LinkedIn URL。
     提供更友善的錯誤處理和提示。
+    批次處理時共用同一個 HTTP 客戶端，並依正規化 URL 快取解析結果 (LRU)。
+
+    Args:
+        scraper: LinkedIn 爬蟲，預設建立新的 LinkedInScraper
+        cache_size: 快取的頁面數上限
     """
 
-    def __init__(self) -> None:
-        self.scraper = LinkedInScraper()
+    def __init__(
+        self,
+        scraper: LinkedInScraper | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.scraper = scraper or LinkedInScraper()
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, ContentItem] = OrderedDict()
 
     async def process_url(self, url: str) -> ContentItem | None:
         """處理 LinkedIn URL
@@ -257,6 +330,83 @@ class LinkedInURLHandler:
 
         return await self.scraper.get_post(url)
 
+    async def process_urls(
+        self,
+        urls: list[str],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> LinkedInBatchResult:
+        """批次處理多個 LinkedIn URL
+
+        URL 先正規化並去重，再以同一個 HTTP 客戶端並行抓取。
+        單一 URL 失敗只記錄在 failures，不影響整批結果。
+
+        Args:
+            urls: LinkedIn URL 列表
+            max_concurrency: 最大並行抓取數
+
+        Returns:
+            LinkedInBatchResult (items 依輸入順序排列)
+        """
+        failures: dict[str, str] = {}
+        unique_urls: list[str] = []
+        seen: set[str] = set()
+        duplicates = 0
+
+        for url in urls:
+            normalized = normalize_linkedin_url(url)
+            if normalized is None:
+                failures[url] = "Invalid LinkedIn URL"
+                continue
+            if normalized in seen:
+                duplicates += 1
+                continue
+            seen.add(normalized)
+            unique_urls.append(normalized)
+
+        # 本批結果另外保存，批次大於快取上限時仍能回傳全部內容
+        results: dict[str, ContentItem] = {}
+        for url in unique_urls:
+            cached = self._cache.get(url)
+            if cached is not None:
+                self._cache.move_to_end(url)
+                results[url] = cached
+        cache_hits = len(results)
+        pending = [url for url in unique_urls if url not in results]
+
+        if pending:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_one(url: str) -> None:
+                async with semaphore:
+                    try:
+                        item = await self.scraper.fetch_post(url)
+                    except Exception as e:
+                        logger.warning("LinkedIn 批次抓取失敗: %s (%s)", url, e)
+                        failures[url] = f"{type(e).__name__}: {e}"
+                        return
+                if item is None:
+                    failures[url] = "頁面沒有可解析的內容"
+                    return
+                results[url] = item
+                self._cache[url] = item
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+            async with self.scraper:
+                await asyncio.gather(*(fetch_one(url) for url in pending))
+
+        items = [results[url] for url in unique_urls if url in results]
+        return LinkedInBatchResult(
+            items=items,
+            failures=failures,
+            duplicates=duplicates,
+            cache_hits=cache_hits,
+        )
+
+    def clear_cache(self) -> None:
+        """清除已解析頁面的快取"""
+        self._cache.clear()
+
     async def close(self) -> None:
         """關閉爬蟲"""
         await self.scraper.close()
@@ -1,16 +1,41 @@
 """工具模組"""
 
 from src.utils.config import Settings, get_settings, settings
-from src.utils.llm_factory import create_chat_model, create_embedding_model
+from src.utils.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.utils.llm_cache import LLMResponseCache, cached_structured_invoke
+from src.utils.llm_factory import (
+    ModelRegistry,
+    aclose_chat_models,
+    create_chat_model,
+    create_embedding_model,
+    get_chat_model,
+    get_model_registry,
+)
+from src.utils.llm_governor import LLMGovernor, get_llm_governor
+from src.utils.local_embeddings import LocalNgramEmbeddings
 from src.utils.rate_limiter import RateLimiter, get_rate_limiter, rate_limit
+from src.utils.relevance import RelevanceScorer, filter_by_relevance
 
 __all__ = [
     "Settings",
     "get_settings",
     "settings",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "ModelRegistry",
+    "aclose_chat_models",
     "create_chat_model",
     "create_embedding_model",
+    "get_chat_model",
+    "get_model_registry",
+    "LLMGovernor",
+    "get_llm_governor",
+    "LocalNgramEmbeddings",
+    "LLMResponseCache",
+    "cached_structured_invoke",
     "RateLimiter",
     "get_rate_limiter",
     "rate_limit",
+    "RelevanceScorer",
+    "filter_by_relevance",
 ]
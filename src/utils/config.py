@@ -51,7 +51,16 @@ class Settings(BaseSettings):
         default="gpt-4o-mini", description="LLM 模型名稱 (LLM_MODEL)"
     )
     embedding_model: str = Field(
-        default="text-embedding-3-small", description="Embedding 模型 (EMBEDDING_MODEL)"
+        default="text-embedding-3-small",
+        description='Embedding 模型，"local" 使用本地 n-gram 雜湊向量 (EMBEDDING_MODEL)',
+    )
+    local_embedding_dim: int = Field(
+        default=512, ge=16, description="本地 embedding 向量維度 (LOCAL_EMBEDDING_DIM)"
+    )
+    embedding_batch_size: int = Field(
+        default=256,
+        ge=1,
+        description="批次寫入向量庫時每次 embedding 呼叫與 upsert 的文件數 (EMBEDDING_BATCH_SIZE)",
     )
     llm_temperature: float = Field(
         default=0.7, ge=0.0, le=2.0, description="LLM 溫度 (LLM_TEMPERATURE)"
@@ -60,22 +69,175 @@ class Settings(BaseSettings):
         default=4096, ge=1, description="最大 token 數 (LLM_MAX_TOKENS)"
     )
 
+    llm_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description="共用 LLM HTTP 連線池的最大連線數 (LLM_MAX_CONNECTIONS)",
+    )
+    llm_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="所有代理共用的 LLM 最大並行呼叫數 (LLM_MAX_CONCURRENCY)",
+    )
+    llm_tokens_per_minute: int = Field(
+        default=0,
+        ge=0,
+        description="LLM 每分鐘 token 上限，0 表示不限制 (LLM_TOKENS_PER_MINUTE)",
+    )
+    llm_rate_limit_max_retries: int = Field(
+        default=3,
+        ge=0,
+        description="LLM 回應 429 後的最大重試次數 (LLM_RATE_LIMIT_MAX_RETRIES)",
+    )
+    llm_rate_limit_backoff_seconds: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="LLM 429 退避的基準秒數，每次重試加倍 (LLM_RATE_LIMIT_BACKOFF_SECONDS)",
+    )
+
+    analysis_context_tokens: int = Field(
+        default=6000,
+        ge=500,
+        description="深度分析 prompt 中來源摘要的 token 預算 (ANALYSIS_CONTEXT_TOKENS)",
+    )
+
+    analysis_map_reduce_min_items: int = Field(
+        default=40,
+        ge=2,
+        description="項目數達此值時使用 map-reduce 分析 (ANALYSIS_MAP_REDUCE_MIN_ITEMS)",
+    )
+    analysis_map_reduce_token_ratio: float = Field(
+        default=1.5,
+        gt=0.0,
+        description="估計 token 數超過預算的倍數時使用 map-reduce 分析 (ANALYSIS_MAP_REDUCE_TOKEN_RATIO)",
+    )
+    analysis_map_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="map-reduce 分析的最大並行 LLM 呼叫數 (ANALYSIS_MAP_CONCURRENCY)",
+    )
+
+    # === 查詢分解 ===
+    supervisor_heuristic_max_depth: int = Field(
+        default=2,
+        ge=0,
+        le=5,
+        description="研究深度不超過此值時以本地關鍵字分解查詢，0 表示一律使用 LLM (SUPERVISOR_HEURISTIC_MAX_DEPTH)",
+    )
+    supervisor_llm_timeout_seconds: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="LLM 查詢分解逾時秒數，0 表示不限 (SUPERVISOR_LLM_TIMEOUT_SECONDS)",
+    )
+    supervisor_llm_fallback: bool = Field(
+        default=True,
+        description="LLM 查詢分解逾時或失敗時退回本地分解 (SUPERVISOR_LLM_FALLBACK)",
+    )
+
+    # === 推測性抓取 ===
+    speculative_scraping: bool = Field(
+        default=False,
+        description="分解查詢時先以原始話題搜尋 Google News 與 PTT (SPECULATIVE_SCRAPING)",
+    )
+
+    # === 內容合成 ===
+    synthesis_streaming: bool = Field(
+        default=True,
+        description="串流輸出影片素材，每個欄位完成即顯示於 UI (SYNTHESIS_STREAMING)",
+    )
+
     # === 速率限制 ===
     rate_limit_requests_per_minute: int = Field(
         default=60, ge=1, description="每分鐘最大請求數"
     )
 
+    # === 相關性過濾 ===
+    relevance_threshold: float = Field(
+        default=0.25,
+        ge=0.0,
+        le=1.0,
+        description="BM25 相關性門檻，低於此分數的內容不送入分析 (RELEVANCE_THRESHOLD)",
+    )
+    relevance_min_items: int = Field(
+        default=5, ge=0, description="過濾後最少保留的內容數 (RELEVANCE_MIN_ITEMS)"
+    )
+
     # === 快取設定 ===
     cache_ttl_seconds: int = Field(default=3600, ge=0, description="快取 TTL (秒)")
     cache_dir: str = Field(default="data/cache", description="快取目錄")
+    llm_cache_enabled: bool = Field(
+        default=True, description="是否快取 LLM 結構化輸出 (LLM_CACHE_ENABLED)"
+    )
+    llm_cache_ttl_seconds: int = Field(
+        default=86400,
+        ge=0,
+        description="LLM 快取 TTL (秒)，0 表示不過期 (LLM_CACHE_TTL_SECONDS)",
+    )
+    llm_cache_max_entries: int = Field(
+        default=2000, ge=1, description="LLM 快取最大項目數 (LLM_CACHE_MAX_ENTRIES)"
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True, description="是否快取文字 embedding (EMBEDDING_CACHE_ENABLED)"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=50000,
+        ge=1,
+        description="Embedding 快取 (SQLite) 最大項目數 (EMBEDDING_CACHE_MAX_ENTRIES)",
+    )
+    embedding_cache_memory_entries: int = Field(
+        default=2048,
+        ge=0,
+        description="Embedding 快取記憶體 LRU 項目數，0 表示停用記憶體層 (EMBEDDING_CACHE_MEMORY_ENTRIES)",
+    )
+
+    # === 研究檢查點 ===
+    checkpoint_enabled: bool = Field(
+        default=True, description="是否保存研究檢查點 (CHECKPOINT_ENABLED)"
+    )
+    checkpoint_db_path: str = Field(
+        default="data/checkpoints/research.db",
+        description="研究檢查點 SQLite 路徑 (CHECKPOINT_DB_PATH)",
+    )
+    checkpoint_retention_hours: int = Field(
+        default=72,
+        ge=0,
+        description="檢查點保存時數，0 表示不清除 (CHECKPOINT_RETENTION_HOURS)",
+    )
+    checkpoint_prune_interval_seconds: int = Field(
+        default=3600,
+        ge=0,
+        description="清除過期檢查點的間隔秒數 (CHECKPOINT_PRUNE_INTERVAL_SECONDS)",
+    )
 
     # === 記憶系統 ===
     memory_db_path: str = Field(
         default="data/memory/memory.db", description="SQLite 路徑"
     )
+    memory_sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = Field(
+        default="NORMAL",
+        description="記憶 SQLite 的 PRAGMA synchronous (MEMORY_SQLITE_SYNCHRONOUS)",
+    )
+    memory_commit_interval_ms: int = Field(
+        default=0,
+        ge=0,
+        description="記憶 SQLite 合併提交間隔 (毫秒)，0 表示每次寫入立即提交 (MEMORY_COMMIT_INTERVAL_MS)",
+    )
+    memory_adjacency_cache: bool = Field(
+        default=True,
+        description="在記憶體中快取每位使用者的知識圖譜鄰接表，供多跳查詢使用 (MEMORY_ADJACENCY_CACHE)",
+    )
+    personalization_cache_entries: int = Field(
+        default=1024,
+        ge=0,
+        description="個人化 prompt 段落的記憶體快取項目數，0 表示停用 (PERSONALIZATION_CACHE_ENTRIES)",
+    )
     vectorstore_dir: str = Field(
         default="data/memory/vectorstore", description="向量儲存目錄"
     )
+    vector_backend: Literal["chroma", "numpy"] = Field(
+        default="chroma",
+        description="向量索引後端：chroma 或 numpy (memory-mapped 暴力搜尋) (VECTOR_BACKEND)",
+    )
 
     # === 應用程式 ===
     debug: bool = Field(default=False, description="除錯模式 (DEBUG)")
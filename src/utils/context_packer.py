@@ -0,0 +1,263 @@
+"""Context 打包模組
+
+在固定的 token 預算內，將 ContentItem 列表打包成 LLM 可消化的來源摘要。
+依相關性、互動數與新鮮度排序，並為每個項目動態分配內容長度。
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.models.content import ContentItem
+from src.utils.text import estimate_tokens, truncate_to_tokens
+
+# 排序權重
+RELEVANCE_WEIGHT = 0.5
+ENGAGEMENT_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.25
+
+# 缺少分數時的預設值
+DEFAULT_RELEVANCE = 0.5
+DEFAULT_RECENCY = 0.3
+
+# 新鮮度半衰期 (天)
+RECENCY_HALF_LIFE_DAYS = 3.0
+
+# 每個項目的內容 token 下限與上限
+MIN_ITEM_TOKENS = 40
+MAX_ITEM_TOKENS = 600
+
+EMPTY_CONTEXT_TEXT = "（無來源資料）"
+
+
+class PackedContext(BaseModel):
+    """打包結果"""
+
+    text: str = Field(..., description="格式化後的來源摘要")
+    included_count: int = Field(default=0, description="納入的項目數")
+    estimated_tokens: int = Field(default=0, description="估計使用的 token 數")
+    token_budget: int = Field(default=0, description="token 預算")
+    truncated: list[dict] = Field(
+        default_factory=list,
+        description="內容被截斷的項目 (title, url, kept/full tokens)",
+    )
+    dropped: list[dict] = Field(
+        default_factory=list, description="超出預算而未納入的項目 (title, url)"
+    )
+
+    def metadata(self) -> dict:
+        """轉為可放入 AgentResult.metadata 的 dict"""
+        return {
+            "context_token_budget": self.token_budget,
+            "context_estimated_tokens": self.estimated_tokens,
+            "context_included_count": self.included_count,
+            "truncated_items": self.truncated,
+            "dropped_items": self.dropped,
+        }
+
+
+class ContextPacker:
+    """Token 預算 Context 打包器
+
+    1. 依 相關性 / 互動數 / 新鮮度 計算優先度並排序
+    2. 依序納入項目，直到標題與最低內容長度放不下為止
+    3. 剩餘預算依優先度比例分配給各項目內容 (超出需求的部分回收再分配)
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        min_item_tokens: int = MIN_ITEM_TOKENS,
+        max_item_tokens: int = MAX_ITEM_TOKENS,
+    ) -> None:
+        self.token_budget = token_budget
+        self.min_item_tokens = min_item_tokens
+        self.max_item_tokens = max_item_tokens
+
+    def priorities(
+        self,
+        items: list[ContentItem],
+        now: datetime | None = None,
+    ) -> np.ndarray:
+        """計算每個項目的優先度 (0-1)"""
+        if not items:
+            return np.zeros(0, dtype=np.float64)
+
+        _now = now or datetime.now(timezone.utc)
+
+        relevance = np.array(
+            [
+                DEFAULT_RELEVANCE if i.relevance_score is None else i.relevance_score
+                for i in items
+            ],
+            dtype=np.float64,
+        )
+
+        raw_engagement = np.array(
+            [self._engagement(i) for i in items], dtype=np.float64
+        )
+        engagement = np.log1p(raw_engagement)
+        if engagement.max() > 0:
+            engagement /= engagement.max()
+
+        recency = np.array(
+            [self._recency(i.published_at, _now) for i in items], dtype=np.float64
+        )
+
+        return (
+            RELEVANCE_WEIGHT * relevance
+            + ENGAGEMENT_WEIGHT * engagement
+            + RECENCY_WEIGHT * recency
+        )
+
+    def pack(self, items: list[ContentItem]) -> PackedContext:
+        """在預算內打包項目
+
+        Args:
+            items: 要打包的內容
+
+        Returns:
+            PackedContext (text 依優先度由高到低編號)
+        """
+        if not items:
+            return PackedContext(
+                text=EMPTY_CONTEXT_TEXT, token_budget=self.token_budget
+            )
+
+        weights = self.priorities(items)
+        order = np.argsort(-weights, kind="stable").tolist()
+
+        headers = [self._format_header(item) for item in items]
+        header_costs = [estimate_tokens(h) for h in headers]
+        full_costs = [estimate_tokens(item.content) for item in items]
+        needs = [min(cost, self.max_item_tokens) for cost in full_costs]
+
+        # 依序納入，保留每項的標題與最低內容長度
+        selected: list[int] = []
+        dropped: list[int] = []
+        allocations: dict[int, int] = {}
+        used = 0
+        for idx in order:
+            floor = min(needs[idx], self.min_item_tokens)
+            cost = header_costs[idx] + floor
+            if used + cost > self.token_budget:
+                dropped.append(idx)
+                continue
+            selected.append(idx)
+            allocations[idx] = floor
+            used += cost
+
+        # 剩餘預算依優先度比例分配
+        remaining = self.token_budget - used
+        active = [i for i in selected if needs[i] > allocations[i]]
+        while active and remaining > 0:
+            total_weight = sum(float(weights[i]) + 1e-6 for i in active)
+            shares = {
+                i: remaining * (float(weights[i]) + 1e-6) / total_weight for i in active
+            }
+            satisfied = [i for i in active if needs[i] - allocations[i] <= shares[i]]
+            if not satisfied:
+                for i in active:
+                    extra = int(shares[i])
+                    allocations[i] += extra
+                    remaining -= extra
+                break
+            for i in satisfied:
+                remaining -= needs[i] - allocations[i]
+                allocations[i] = needs[i]
+                active.remove(i)
+
+        entries: list[str] = []
+        truncated: list[dict] = []
+        for number, idx in enumerate(selected, 1):
+            item = items[idx]
+            content = item.content
+            if allocations[idx] < full_costs[idx]:
+                content = truncate_to_tokens(item.content, allocations[idx]) + "..."
+                truncated.append(
+                    {
+                        "title": item.title,
+                        "url": str(item.url),
+                        "kept_tokens": allocations[idx],
+                        "full_tokens": full_costs[idx],
+                    }
+                )
+            entries.append(f"{number}. {headers[idx]}\n   內容: {content}")
+
+        return PackedContext(
+            text="\n\n".join(entries),
+            included_count=len(selected),
+            estimated_tokens=self.token_budget - remaining,
+            token_budget=self.token_budget,
+            truncated=truncated,
+            dropped=[
+                {"title": items[i].title, "url": str(items[i].url)} for i in dropped
+            ],
+        )
+
+    def item_cost(self, item: ContentItem) -> int:
+        """項目完整放入時的估計 token 數 (內容以 max_item_tokens 為上限)"""
+        content_cost = min(estimate_tokens(item.content), self.max_item_tokens)
+        return estimate_tokens(self._format_header(item)) + content_cost
+
+    def shard(self, items: list[ContentItem]) -> list[list[ContentItem]]:
+        """將項目切分為多個不超過 token 預算的分片
+
+        項目依優先度排序後，以輪流分配 (round-robin) 的方式放入目前最空的分片，
+        讓每個分片都混合高低優先度的內容，分析品質較平均。
+
+        Args:
+            items: 要切分的內容
+
+        Returns:
+            分片列表；每個分片都能在 token_budget 內完整打包
+        """
+        if not items:
+            return []
+
+        weights = self.priorities(items)
+        order = np.argsort(-weights, kind="stable").tolist()
+        costs = [self.item_cost(item) for item in items]
+
+        total = sum(costs)
+        shard_count = max(1, -(-total // self.token_budget))
+        shards: list[list[int]] = [[] for _ in range(shard_count)]
+        loads = [0] * shard_count
+
+        for idx in order:
+            target = min(range(len(shards)), key=loads.__getitem__)
+            if loads[target] and loads[target] + costs[idx] > self.token_budget:
+                shards.append([])
+                loads.append(0)
+                target = len(shards) - 1
+            shards[target].append(idx)
+            loads[target] += costs[idx]
+
+        return [[items[i] for i in shard] for shard in shards if shard]
+
+    def _format_header(self, item: ContentItem) -> str:
+        """格式化項目的來源與標題資訊"""
+        source_info = f"[{item.source_type}] {item.source_name}"
+        engagement_info = ""
+        if item.engagement:
+            engagement_info = (
+                f" (讚:{item.engagement.likes} 留言:{item.engagement.comments})"
+            )
+        return f"{source_info}{engagement_info}\n   標題: {item.title}"
+
+    def _engagement(self, item: ContentItem) -> float:
+        """互動指標加權總和 (分享 > 留言 > 讚)"""
+        if item.engagement is None:
+            return 0.0
+        e = item.engagement
+        return float(max(0, e.likes + 2 * e.comments + 3 * e.shares))
+
+    def _recency(self, published_at: datetime | None, now: datetime) -> float:
+        """依發布時間計算新鮮度 (指數衰減)"""
+        if published_at is None:
+            return DEFAULT_RECENCY
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc)
+        age_days = max(0.0, (now - published_at).total_seconds() / 86400)
+        return float(0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS))
@@ -0,0 +1,233 @@
+"""Embedding 快取模組
+
+將文字的 embedding 持久化到 SQLite，以 (model, sha256(text)) 為鍵，
+向量以 float32 blob 儲存 (1536 維約 6 KB)。前端有一層記憶體 LRU，
+同一請求內重複嵌入相同文字 (例如個人化 prompt 同時搜尋修正與對話) 不需讀取磁碟。
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB_FILENAME = "embedding_cache.db"
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_accessed
+    ON embedding_cache(accessed_at);
+"""
+
+# 單次 IN (...) 查詢的鍵數上限 (低於 SQLite 舊版 999 個參數上限)
+_KEY_BATCH_SIZE = 400
+
+
+def text_hash(text: str) -> str:
+    """文字的 sha256 雜湊 (快取鍵的一部分)"""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """兩層 embedding 快取：記憶體 LRU + SQLite
+
+    - 記憶體層最多保留 memory_entries 個向量，超過時淘汰最久未使用者
+    - SQLite 層超過 max_entries 時刪除最久未存取的項目
+    - 讀寫透過 asyncio.to_thread 執行，不阻塞事件迴圈
+
+    Args:
+        db_path: SQLite 路徑
+        max_entries: SQLite 層最大項目數，預設使用 settings.embedding_cache_max_entries
+        memory_entries: 記憶體層最大項目數，預設使用 settings.embedding_cache_memory_entries
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_entries: int | None = None,
+        memory_entries: int | None = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries or settings.embedding_cache_max_entries
+        self.memory_entries = (
+            memory_entries
+            if memory_entries is not None
+            else settings.embedding_cache_memory_entries
+        )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        # 全域單例會被 Streamlit 腳本執行緒與 to_thread 工作同時使用
+        self._memory_lock = threading.Lock()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """建立連線 (首次使用時建立資料表)"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        if not self._schema_ready:
+            # get_many / set_many 在 to_thread 中執行，首次連線可能同時發生
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA_SQL)
+                    self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """開啟連線並在區塊結束時提交、關閉"""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    async def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> list[list[float] | None]:
+        """依序取得多段文字的 embedding，未命中的位置為 None"""
+        hashes = [text_hash(t) for t in texts]
+        results: list[list[float] | None] = [None] * len(texts)
+        missing: dict[str, list[int]] = {}
+        for i, h in enumerate(hashes):
+            vector = self._memory_get(model, h)
+            if vector is not None:
+                self.memory_hits += 1
+                results[i] = vector
+            else:
+                missing.setdefault(h, []).append(i)
+
+        if missing:
+            found = await asyncio.to_thread(self._get_many_sync, model, list(missing))
+            for h, positions in missing.items():
+                vector = found.get(h)
+                if vector is None:
+                    self.misses += len(positions)
+                    continue
+                self.disk_hits += len(positions)
+                self._memory_put(model, h, vector)
+                for i in positions:
+                    results[i] = vector
+        return results
+
+    async def set_many(
+        self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """寫入多段文字的 embedding"""
+        # 以 float32 精度存入記憶體層，使記憶體與磁碟命中回傳相同的值
+        entries = {
+            text_hash(t): np.asarray(v, dtype=np.float32).tolist()
+            for t, v in zip(texts, vectors, strict=True)
+        }
+        for h, vector in entries.items():
+            self._memory_put(model, h, vector)
+        await asyncio.to_thread(self._set_many_sync, model, entries)
+
+    async def clear(self) -> None:
+        """清除所有快取"""
+        with self._memory_lock:
+            self._memory.clear()
+        await asyncio.to_thread(self._clear_sync)
+
+    def stats(self) -> dict[str, Any]:
+        """命中統計 (hit_rate 包含記憶體與磁碟命中)"""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        with self._memory_lock:
+            memory_entries = len(self._memory)
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "memory_entries": memory_entries,
+        }
+
+    def _memory_get(self, model: str, h: str) -> list[float] | None:
+        with self._memory_lock:
+            vector = self._memory.get((model, h))
+            if vector is not None:
+                self._memory.move_to_end((model, h))
+            return vector
+
+    def _memory_put(self, model: str, h: str, vector: list[float]) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._memory_lock:
+            self._memory[(model, h)] = vector
+            self._memory.move_to_end((model, h))
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _get_many_sync(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        now = time.time()
+        found: dict[str, list[float]] = {}
+        with self._transaction() as conn:
+            for i in range(0, len(hashes), _KEY_BATCH_SIZE):
+                batch = hashes[i : i + _KEY_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = conn.execute(
+                    f"""SELECT text_hash, vector FROM embedding_cache
+                    WHERE model = ? AND text_hash IN ({placeholders})""",
+                    (model, *batch),
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                conn.executemany(
+                    """UPDATE embedding_cache SET accessed_at = ?
+                    WHERE model = ? AND text_hash = ?""",
+                    [(now, model, h) for h in found],
+                )
+        return found
+
+    def _set_many_sync(self, model: str, entries: dict[str, list[float]]) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO embedding_cache
+                   (model, text_hash, vector, accessed_at) VALUES (?, ?, ?, ?)""",
+                [
+                    (model, h, np.asarray(v, dtype=np.float32).tobytes(), now)
+                    for h, v in entries.items()
+                ],
+            )
+            conn.execute(
+                """DELETE FROM embedding_cache WHERE (model, text_hash) IN (
+                       SELECT model, text_hash FROM embedding_cache
+                       ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,),
+            )
+
+    def _clear_sync(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM embedding_cache")
+
+
+@lru_cache
+def get_embedding_cache() -> EmbeddingCache:
+    """取得全域 embedding 快取 (單例，位於 settings.cache_dir)"""
+    return EmbeddingCache(Path(settings.cache_dir) / CACHE_DB_FILENAME)
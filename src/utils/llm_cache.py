@@ -0,0 +1,372 @@
+"""LLM 回應快取模組
+
+將 `with_structured_output(...).ainvoke(prompt)` 的結構化輸出持久化到 SQLite，
+相同 (provider, model, temperature, schema, prompt) 的呼叫直接回傳驗證過的 pydantic 物件，
+不需再次呼叫 LLM。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from src.utils.config import settings
+from src.utils.llm_governor import Priority, get_llm_governor
+from src.utils.text import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+CACHE_DB_FILENAME = "llm_cache.db"
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    schema_name TEXT NOT NULL,
+    response_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at);
+"""
+
+
+class LLMResponseCache:
+    """SQLite LLM 回應快取
+
+    - 過期 (超過 ttl_seconds) 的項目視為未命中並刪除
+    - 項目數超過 max_entries 時，刪除最久未存取的項目
+    - 讀寫透過 asyncio.to_thread 執行，不阻塞事件迴圈
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.llm_cache_ttl_seconds
+        )
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """建立連線 (首次使用時建立資料表)"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        if not self._schema_ready:
+            # 並行的快取讀寫可能同時首次連線，只由一個執行緒建立資料表
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA_SQL)
+                    self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """開啟連線並在區塊結束時提交、關閉"""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    async def get(self, key: str, schema: type[T]) -> T | None:
+        """讀取快取並驗證為 schema 物件；未命中、過期或驗證失敗時回傳 None"""
+        payload = await asyncio.to_thread(self._get_sync, key)
+        if payload is None:
+            self.misses += 1
+            return None
+        try:
+            value = schema.model_validate_json(payload)
+        except ValidationError:
+            logger.warning("LLM 快取內容無法驗證，已忽略 (schema=%s)", schema.__name__)
+            await asyncio.to_thread(self._delete_sync, key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: BaseModel) -> None:
+        """寫入快取"""
+        await asyncio.to_thread(
+            self._set_sync, key, type(value).__name__, value.model_dump_json()
+        )
+
+    async def clear(self) -> None:
+        """清除所有快取"""
+        await asyncio.to_thread(self._clear_sync)
+
+    def stats(self) -> dict[str, Any]:
+        """命中統計"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _get_sync(self, key: str) -> str | None:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT response_json, created_at FROM llm_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (now, key)
+            )
+            return row[0]
+
+    def _set_sync(self, key: str, schema_name: str, payload: str) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_cache
+                   (cache_key, schema_name, response_json, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (key, schema_name, payload, now, now),
+            )
+            if self.ttl_seconds:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+            conn.execute(
+                """DELETE FROM llm_cache WHERE cache_key IN (
+                       SELECT cache_key FROM llm_cache
+                       ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,),
+            )
+
+    def _delete_sync(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+
+    def _clear_sync(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+def make_cache_key(llm: Any, schema: type[BaseModel], prompt: str) -> str | None:
+    """由 LLM 設定、輸出 schema 與 prompt 產生快取鍵
+
+    無法取得穩定的 model 名稱 (例如測試用的 mock) 時回傳 None，表示不快取。
+    schema 以其 JSON Schema 的雜湊識別，欄位變更後舊快取自動失效。
+    """
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    if not isinstance(model, str):
+        return None
+
+    provider = getattr(llm, "_llm_type", None)
+    if not isinstance(provider, str):
+        provider = type(llm).__name__
+    temperature = getattr(llm, "temperature", None)
+    if not isinstance(temperature, int | float):
+        temperature = None
+
+    schema_json = json.dumps(schema.model_json_schema(), sort_keys=True)
+    key_source = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "schema": schema.__name__,
+            "schema_hash": hashlib.sha256(schema_json.encode()).hexdigest(),
+            "prompt_hash": hashlib.sha256(prompt.encode()).hexdigest(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_source.encode()).hexdigest()
+
+
+def _estimate_call_tokens(llm: Any, prompt: str) -> int:
+    """預估一次呼叫的 token 數 (prompt + 最大輸出)，供調節器預留 TPM"""
+    max_tokens = getattr(llm, "max_tokens", None)
+    if not isinstance(max_tokens, int):
+        max_tokens = settings.llm_max_tokens
+    return estimate_tokens(prompt) + max_tokens
+
+
+@lru_cache
+def get_llm_cache() -> LLMResponseCache:
+    """取得全域 LLM 回應快取 (單例，位於 settings.cache_dir)"""
+    return LLMResponseCache(Path(settings.cache_dir) / CACHE_DB_FILENAME)
+
+
+async def _lookup(
+    llm: Any,
+    schema: type[T],
+    prompt: str,
+    use_cache: bool | None,
+    cache: LLMResponseCache | None,
+) -> tuple[LLMResponseCache | None, str | None, T | None]:
+    """查詢快取，回傳 (可寫入的快取, 快取鍵, 命中的結果)"""
+    enabled = settings.llm_cache_enabled if use_cache is None else use_cache
+    key = make_cache_key(llm, schema, prompt) if enabled else None
+    if key is None:
+        return None, None, None
+
+    _cache = cache or get_llm_cache()
+    try:
+        cached = await _cache.get(key, schema)
+    except sqlite3.Error as e:
+        logger.warning("LLM 快取讀取失敗，直接呼叫 LLM: %s", e)
+        return None, key, None
+    if cached is not None:
+        logger.debug("LLM 快取命中 (schema=%s)", schema.__name__)
+    return _cache, key, cached
+
+
+async def _store(
+    _cache: LLMResponseCache | None, key: str | None, result: Any, schema: type[T]
+) -> None:
+    """寫入快取 (寫入失敗只記錄警告)"""
+    if _cache is None or key is None or not isinstance(result, schema):
+        return
+    try:
+        await _cache.set(key, result)
+    except sqlite3.Error as e:
+        logger.warning("LLM 快取寫入失敗: %s", e)
+
+
+async def cached_structured_invoke(
+    llm: Any,
+    schema: type[T],
+    prompt: str,
+    use_cache: bool | None = None,
+    cache: LLMResponseCache | None = None,
+    priority: Priority = "interactive",
+) -> T:
+    """以快取包裝 `llm.with_structured_output(schema).ainvoke(prompt)`
+
+    未命中快取時，呼叫經由全域 LLM 調節器 (並行上限、TPM、429 退避) 執行。
+
+    Args:
+        llm: Chat 模型
+        schema: 結構化輸出的 pydantic 類別
+        prompt: 完整 prompt
+        use_cache: 是否使用快取，預設使用 settings.llm_cache_enabled
+        cache: 指定快取實例，預設使用 get_llm_cache()
+        priority: 調節器優先順序，背景工作 (例如反饋處理) 使用 "background"
+
+    Returns:
+        schema 實例 (命中時不呼叫 LLM)
+    """
+    _cache, key, cached = await _lookup(llm, schema, prompt, use_cache, cache)
+    if cached is not None:
+        return cached
+
+    structured_llm = llm.with_structured_output(schema)
+    result = await get_llm_governor().run(
+        lambda callbacks: structured_llm.ainvoke(
+            prompt, config={"callbacks": callbacks}
+        ),
+        priority=priority,
+        estimated_tokens=_estimate_call_tokens(llm, prompt),
+    )
+
+    await _store(_cache, key, result, schema)
+    return result
+
+
+def completed_fields(partial: dict[str, Any], emitted: set[str]) -> list[str]:
+    """找出部分 JSON 中已完整輸出、尚未通知的欄位
+
+    模型依序輸出 JSON 物件的欄位，出現下一個鍵時前一個欄位的值即已完整，
+    因此除了最後一個鍵之外的欄位都視為完成。
+    """
+    keys = list(partial)[:-1]
+    return [k for k in keys if k not in emitted]
+
+
+async def cached_structured_stream(
+    llm: Any,
+    schema: type[T],
+    prompt: str,
+    on_field: Callable[[str, Any], None],
+    use_cache: bool | None = None,
+    cache: LLMResponseCache | None = None,
+    priority: Priority = "interactive",
+) -> T:
+    """串流版的 cached_structured_invoke：每個欄位完成時立即呼叫 on_field
+
+    以 JSON Schema (dict) 取得結構化輸出，串流時可取得逐步成長的部分 dict；
+    全部完成後以 schema 驗證，結果與非串流版相同，並共用同一個快取鍵。
+    快取命中時依欄位順序立即通知所有欄位。
+
+    Args:
+        llm: Chat 模型
+        schema: 結構化輸出的 pydantic 類別
+        prompt: 完整 prompt
+        on_field: 欄位完成時的回呼 (欄位名稱, 原始值)
+        use_cache: 是否使用快取，預設使用 settings.llm_cache_enabled
+        cache: 指定快取實例，預設使用 get_llm_cache()
+        priority: 調節器優先順序
+
+    Returns:
+        schema 實例
+
+    Raises:
+        ValueError: 模型沒有輸出任何內容
+        ValidationError: 最終輸出不符合 schema
+    """
+    _cache, key, cached = await _lookup(llm, schema, prompt, use_cache, cache)
+    if cached is not None:
+        for field, value in cached.model_dump().items():
+            on_field(field, value)
+        return cached
+
+    structured_llm = llm.with_structured_output(schema.model_json_schema())
+    emitted: set[str] = set()
+
+    async def stream(callbacks: list) -> dict[str, Any]:
+        final: dict[str, Any] | None = None
+        async for partial in structured_llm.astream(
+            prompt, config={"callbacks": callbacks}
+        ):
+            if not isinstance(partial, dict):
+                continue
+            final = partial
+            for field in completed_fields(partial, emitted):
+                emitted.add(field)
+                on_field(field, partial[field])
+        if final is None:
+            raise ValueError(f"LLM 沒有輸出任何內容 (schema={schema.__name__})")
+        return final
+
+    final = await get_llm_governor().run(
+        stream,
+        priority=priority,
+        estimated_tokens=_estimate_call_tokens(llm, prompt),
+    )
+    for field, value in final.items():
+        if field not in emitted:
+            on_field(field, value)
+
+    result = schema.model_validate(final)
+    await _store(_cache, key, result, schema)
+    return result
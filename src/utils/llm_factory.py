@@ -1,14 +1,49 @@
 """LLM 工廠模組
 
 提供統一的 LLM 和 Embedding 模型建立介面。
+
+代理應透過 get_chat_model() 取得共用的 Chat 模型：相同設定的模型只建立一次，
+OpenAI 模型共用同一組 HTTP 連線池，避免每次執行都重新建立客戶端與連線。
 """
 
+import asyncio
+import atexit
+import logging
+import threading
+from functools import lru_cache
 from typing import Literal
 
+import httpx
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from src.utils.config import settings
+from src.utils.local_embeddings import LOCAL_EMBEDDING_MODEL, LocalNgramEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# (provider, model, temperature, max_tokens)
+ModelKey = tuple[str, str, float, int]
+
+# 閒置連線保留秒數
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+
+def resolve_model_key(
+    model: str | None = None,
+    temperature: float | None = None,
+    max_tokens: int | None = None,
+    provider: Literal["openai", "anthropic"] | None = None,
+) -> ModelKey:
+    """套用 settings 預設值，回傳實際使用的 (provider, model, temperature, max_tokens)"""
+    _provider = provider or settings.llm_provider
+    _model = model or settings.llm_model
+    if _provider == "anthropic" and _model == "gpt-4o-mini":
+        _model = "claude-3-5-haiku-latest"
+    _temperature = temperature if temperature is not None else settings.llm_temperature
+    _max_tokens = max_tokens or settings.llm_max_tokens
+    return (_provider, _model, float(_temperature), _max_tokens)
 
 
 def create_chat_model(
@@ -16,28 +51,31 @@ def create_chat_model(
     temperature: float | None = None,
     max_tokens: int | None = None,
     provider: Literal["openai", "anthropic"] | None = None,
+    http_client: httpx.Client | None = None,
+    http_async_client: httpx.AsyncClient | None = None,
 ) -> BaseChatModel:
-    """建立 Chat 模型
+    """建立 Chat 模型 (每次呼叫都建立新實例，一般請使用 get_chat_model)
 
     Args:
         model: 模型名稱，預設使用 settings.llm_model
         temperature: 溫度參數，預設使用 settings.llm_temperature
         max_tokens: 最大 token 數，預設使用 settings.llm_max_tokens
         provider: LLM 提供者，預設使用 settings.llm_provider
+        http_client: 共用的同步 HTTP 客戶端 (僅 OpenAI)
+        http_async_client: 共用的非同步 HTTP 客戶端 (僅 OpenAI)
 
     Returns:
         ChatOpenAI 或 ChatAnthropic 實例
     """
-    _provider = provider or settings.llm_provider
-    _model = model or settings.llm_model
-    _temperature = temperature if temperature is not None else settings.llm_temperature
-    _max_tokens = max_tokens or settings.llm_max_tokens
+    _provider, _model, _temperature, _max_tokens = resolve_model_key(
+        model, temperature, max_tokens, provider
+    )
 
     if _provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
 
         return ChatAnthropic(
-            model=_model if _model != "gpt-4o-mini" else "claude-3-5-haiku-latest",
+            model=_model,
             temperature=_temperature,
             max_tokens=_max_tokens,
             api_key=settings.get_anthropic_api_key(),
@@ -49,21 +87,171 @@ def create_chat_model(
         temperature=_temperature,
         max_tokens=_max_tokens,
         api_key=settings.get_openai_api_key(),
+        http_client=http_client,
+        http_async_client=http_async_client,
     )
 
 
+class ModelRegistry:
+    """Chat 模型註冊表
+
+    - 依 (provider, model, temperature, max_tokens) 快取 Chat 模型，所有代理共用
+    - OpenAI 模型共用一個同步 httpx 連線池，以及每個事件迴圈一個非同步連線池
+      (httpx 非同步連線綁定建立時的事件迴圈，因此非同步客戶端與使用它的模型以事件迴圈區分)
+    - Anthropic 模型由 langchain-anthropic 內部共用 HTTP 客戶端，這裡只快取模型實例
+    - aclose() 關閉目前事件迴圈的連線；close() 關閉全部 (程式結束時自動呼叫)
+
+    Args:
+        max_connections: 每個連線池的最大連線數
+    """
+
+    def __init__(self, max_connections: int | None = None) -> None:
+        self.max_connections = max_connections or settings.llm_max_connections
+        self._lock = threading.Lock()
+        self._models: dict[
+            tuple[ModelKey, asyncio.AbstractEventLoop | None], BaseChatModel
+        ] = {}
+        self._sync_client: httpx.Client | None = None
+        self._async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self.created = 0
+
+    def get(
+        self,
+        model: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        provider: Literal["openai", "anthropic"] | None = None,
+    ) -> BaseChatModel:
+        """取得 (必要時建立) 共用的 Chat 模型"""
+        key = resolve_model_key(model, temperature, max_tokens, provider)
+        loop = _running_loop() if key[0] == "openai" else None
+
+        with self._lock:
+            self._drop_closed_loops()
+            cached = self._models.get((key, loop))
+            if cached is None:
+                cached = self._create(key, loop)
+                self._models[(key, loop)] = cached
+                self.created += 1
+            return cached
+
+    async def aclose(self) -> None:
+        """關閉目前事件迴圈的非同步連線池，並移除綁定此迴圈的模型"""
+        loop = _running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+            for scope in [s for s in self._models if s[1] is loop]:
+                del self._models[scope]
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """關閉所有連線池並清空快取
+
+        其他事件迴圈的非同步連線無法在此關閉，只會被移除，由事件迴圈結束時釋放。
+        """
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+            self._async_clients.clear()
+            self._models.clear()
+
+    def stats(self) -> dict[str, int]:
+        """快取統計"""
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "created": self.created,
+                "async_pools": len(self._async_clients),
+            }
+
+    def _create(
+        self, key: ModelKey, loop: asyncio.AbstractEventLoop | None
+    ) -> BaseChatModel:
+        provider, model, temperature, max_tokens = key
+        if provider != "openai":
+            return create_chat_model(model, temperature, max_tokens, provider)
+
+        async_client = None
+        if loop is not None:
+            async_client = self._async_clients.get(loop)
+            if async_client is None:
+                async_client = httpx.AsyncClient(limits=self._limits())
+                self._async_clients[loop] = async_client
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(limits=self._limits())
+
+        return create_chat_model(
+            model,
+            temperature,
+            max_tokens,
+            provider,
+            http_client=self._sync_client,
+            http_async_client=async_client,
+        )
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+
+    def _drop_closed_loops(self) -> None:
+        """移除已關閉事件迴圈的連線池與模型 (連線已隨迴圈失效)"""
+        closed = [loop for loop in self._async_clients if loop.is_closed()]
+        for loop in closed:
+            del self._async_clients[loop]
+        for scope in [s for s in self._models if s[1] is not None and s[1].is_closed()]:
+            del self._models[scope]
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+@lru_cache
+def get_model_registry() -> ModelRegistry:
+    """取得全域模型註冊表 (單例，程式結束時關閉連線)"""
+    registry = ModelRegistry()
+    atexit.register(registry.close)
+    return registry
+
+
+def get_chat_model(
+    model: str | None = None,
+    temperature: float | None = None,
+    max_tokens: int | None = None,
+    provider: Literal["openai", "anthropic"] | None = None,
+) -> BaseChatModel:
+    """取得共用的 Chat 模型 (參數同 create_chat_model)"""
+    return get_model_registry().get(model, temperature, max_tokens, provider)
+
+
+async def aclose_chat_models() -> None:
+    """關閉目前事件迴圈的共用 LLM 連線 (在 asyncio.run 結束前呼叫)"""
+    await get_model_registry().aclose()
+
+
 def create_embedding_model(
     model: str | None = None,
-) -> OpenAIEmbeddings:
+) -> Embeddings:
     """建立 Embedding 模型
 
     Args:
-        model: 模型名稱，預設使用 settings.embedding_model
+        model: 模型名稱，預設使用 settings.embedding_model；
+            "local" 使用不需網路的 LocalNgramEmbeddings
 
     Returns:
-        OpenAIEmbeddings 實例
+        OpenAIEmbeddings 或 LocalNgramEmbeddings 實例
     """
     _model = model or settings.embedding_model
+    if _model == LOCAL_EMBEDDING_MODEL:
+        return LocalNgramEmbeddings(dim=settings.local_embedding_dim)
 
     return OpenAIEmbeddings(
         model=_model,
@@ -0,0 +1,279 @@
+"""LLM 呼叫調節器 (governor)
+
+所有代理與 FeedbackProcessor 的 LLM 呼叫都經過同一個調節器：
+
+- 並行上限: 同時進行的 LLM 呼叫數不超過 max_concurrency
+- 優先順序: 等待中的互動式呼叫 (interactive) 優先於背景呼叫 (background，例如反饋處理)
+- TPM 控制: 以 60 秒滑動視窗累計 token 用量 (呼叫前以估計值預留，完成後改為實際用量)
+- 429 退避: 遇到速率限制錯誤時，全域暫停 (優先採用 Retry-After) 後重試
+
+Streamlit 的每次執行與每個使用者各有自己的事件迴圈，
+因此內部狀態以 threading.Lock 保護，喚醒等待者時透過 call_soon_threadsafe 回到其事件迴圈。
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, Literal, TypeVar
+
+from langchain_core.callbacks import BaseCallbackHandler, UsageMetadataCallbackHandler
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Priority = Literal["interactive", "background"]
+
+# 數字越小越優先
+PRIORITY_RANKS: dict[str, int] = {"interactive": 0, "background": 1}
+
+TPM_WINDOW_SECONDS = 60.0
+
+# 退避延遲的隨機抖動比例，避免所有呼叫同時重試
+BACKOFF_JITTER = 0.25
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判斷例外是否為 HTTP 429 速率限制錯誤 (OpenAI / Anthropic SDK 或 httpx)"""
+    if type(error).__name__ == "RateLimitError":
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429
+
+
+def _retry_after_seconds(error: BaseException) -> float | None:
+    """讀取回應的 Retry-After 標頭 (秒)"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGovernor:
+    """LLM 呼叫調節器
+
+    Args:
+        max_concurrency: 最大並行呼叫數，預設使用 settings.llm_max_concurrency
+        tokens_per_minute: 每分鐘 token 上限，0 表示不限，預設使用 settings.llm_tokens_per_minute
+        max_retries: 429 後的最大重試次數，預設使用 settings.llm_rate_limit_max_retries
+        backoff_seconds: 429 退避的基準秒數 (指數成長)，預設使用 settings.llm_rate_limit_backoff_seconds
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_retries: int | None = None,
+        backoff_seconds: float | None = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.tokens_per_minute = (
+            tokens_per_minute
+            if tokens_per_minute is not None
+            else settings.llm_tokens_per_minute
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else settings.llm_rate_limit_max_retries
+        )
+        self.backoff_seconds = (
+            backoff_seconds
+            if backoff_seconds is not None
+            else settings.llm_rate_limit_backoff_seconds
+        )
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: list[
+            tuple[int, int, asyncio.AbstractEventLoop, asyncio.Future]
+        ] = []
+        self._seq = itertools.count()
+        self._window: deque[list[float]] = deque()
+        self._cooldown_until = 0.0
+
+        self.calls = 0
+        self.rate_limited = 0
+        self.tokens_used = 0
+
+    async def run(
+        self,
+        call: Callable[[list[BaseCallbackHandler]], Awaitable[T]],
+        priority: Priority = "interactive",
+        estimated_tokens: int = 0,
+    ) -> T:
+        """在調節下執行一次 LLM 呼叫
+
+        Args:
+            call: 接收 callbacks 列表並發出 LLM 呼叫的函式
+                (callbacks 需傳入 ainvoke 的 config，以取得 usage metadata)
+            priority: interactive 或 background
+            estimated_tokens: 預估 token 數 (prompt + 最大輸出)，用於 TPM 預留
+
+        Returns:
+            call 的回傳值
+        """
+        rank = PRIORITY_RANKS[priority]
+        attempt = 0
+        while True:
+            await self._acquire(rank)
+            try:
+                reservation = await self._reserve_tokens(estimated_tokens)
+                usage = UsageMetadataCallbackHandler()
+                try:
+                    result = await call([usage])
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff_delay(e, attempt)
+                    attempt += 1
+                    self._start_cooldown(delay)
+                    logger.warning(
+                        "LLM 速率限制 (429)，%.1f 秒後重試 (%d/%d)",
+                        delay,
+                        attempt,
+                        self.max_retries,
+                    )
+                    continue
+                finally:
+                    self._settle(reservation, usage)
+                self.calls += 1
+                return result
+            finally:
+                self._release()
+
+    def stats(self) -> dict[str, Any]:
+        """目前狀態與累計統計"""
+        with self._lock:
+            self._trim_window(time.monotonic())
+            return {
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "tokens_last_minute": int(sum(e[1] for e in self._window)),
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "tokens_used": self.tokens_used,
+            }
+
+    # === 並行與優先順序 ===
+
+    async def _acquire(self, rank: int) -> None:
+        """取得呼叫名額；額滿時依 (優先順序, 先來後到) 排隊"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self.max_concurrency and not self._waiters:
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+            entry = (rank, next(self._seq), loop, future)
+            heapq.heappush(self._waiters, entry)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            # 已被喚醒 (名額已轉交) 才取消時，交出名額
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """釋放名額；有等待者時直接轉交給優先順序最高者"""
+        with self._lock:
+            while self._waiters:
+                _, _, loop, future = heapq.heappop(self._waiters)
+                if future.done() or loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._grant, future)
+                return
+            self._in_flight -= 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        """在等待者的事件迴圈中喚醒它 (等待者已取消時轉交給下一位)"""
+        if future.done():
+            self._release()
+        else:
+            future.set_result(None)
+
+    # === TPM 與 429 退避 ===
+
+    async def _reserve_tokens(self, tokens: int) -> list[float]:
+        """等待 TPM 額度與 429 冷卻結束，並預留 token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._trim_window(now)
+                wait = self._cooldown_until - now
+                if wait <= 0:
+                    wait = self._tpm_wait(tokens, now)
+                if wait <= 0:
+                    reservation = [now, float(tokens)]
+                    self._window.append(reservation)
+                    return reservation
+            await asyncio.sleep(wait)
+
+    def _tpm_wait(self, tokens: int, now: float) -> float:
+        """預留 tokens 前需等待的秒數 (呼叫時需持有鎖)"""
+        if not self.tokens_per_minute or not self._window:
+            return 0.0
+        excess = sum(e[1] for e in self._window) + tokens - self.tokens_per_minute
+        if excess <= 0:
+            return 0.0
+        freed = 0.0
+        for timestamp, used in self._window:
+            freed += used
+            if freed >= excess:
+                return timestamp + TPM_WINDOW_SECONDS - now
+        # 單次呼叫就超過上限時，等視窗清空後放行
+        return self._window[-1][0] + TPM_WINDOW_SECONDS - now
+
+    def _settle(
+        self, reservation: list[float], usage: UsageMetadataCallbackHandler
+    ) -> None:
+        """以實際用量取代預留值 (沒有 usage metadata 時保留估計值)"""
+        actual = sum(u.get("total_tokens", 0) for u in usage.usage_metadata.values())
+        with self._lock:
+            if actual:
+                reservation[1] = float(actual)
+            self.tokens_used += int(reservation[1])
+
+    def _trim_window(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - TPM_WINDOW_SECONDS:
+            self._window.popleft()
+
+    def _backoff_delay(self, error: BaseException, attempt: int) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+        base = self.backoff_seconds * (2**attempt)
+        return base * (1 + random.uniform(0, BACKOFF_JITTER))
+
+    def _start_cooldown(self, delay: float) -> None:
+        """全域暫停新呼叫，避免 429 風暴"""
+        with self._lock:
+            self.rate_limited += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+
+
+@lru_cache
+def get_llm_governor() -> LLMGovernor:
+    """取得全域 LLM 調節器 (單例)"""
+    return LLMGovernor()
@@ -0,0 +1,91 @@
+"""本地 Embedding 模組
+
+不需網路的 embedding 後端：將文字切成 CJK n-gram 與英數字詞，以 sublinear TF
+乘上依特徵長度的 IDF 先驗加權，再以特徵雜湊 (每個特徵對應 2 個帶正負號的維度，
+相當於稀疏隨機投影) 投影到固定維度並 L2 正規化。
+
+IDF 不依語料擬合，使向量只取決於文字本身：向量庫成長後既有向量不需重算。
+適合測試、離線環境與對延遲敏感的部署；語意品質低於 API 模型。
+"""
+
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.utils.text import ngram_features
+
+# EMBEDDING_MODEL 設為此值時使用本地 embedding
+LOCAL_EMBEDDING_MODEL = "local"
+
+# 演算法版本：特徵或加權方式變更時遞增，使 embedding 快取自動失效
+_ALGORITHM_VERSION = 1
+
+# 單字 CJK 特徵極常見，權重較低 (IDF 先驗)；二字以上與英數字詞為主要訊號
+_UNIGRAM_WEIGHT = 0.3
+
+# 每個特徵投影到的維度數
+_HASHES_PER_FEATURE = 2
+
+
+def _feature_weight(feature: str) -> float:
+    return _UNIGRAM_WEIGHT if len(feature) == 1 else 1.0
+
+
+@lru_cache(maxsize=65536)
+def _feature_slots(feature: str, dim: int) -> tuple[tuple[int, float], ...]:
+    """特徵對應的 (維度, 正負號)，以穩定雜湊計算 (不受 PYTHONHASHSEED 影響)"""
+    digest = hashlib.blake2b(
+        feature.encode(), digest_size=4 * _HASHES_PER_FEATURE
+    ).digest()
+    slots = []
+    for i in range(_HASHES_PER_FEATURE):
+        value = int.from_bytes(digest[4 * i : 4 * i + 4], "little")
+        slots.append((value % dim, 1.0 if value & 0x80000000 else -1.0))
+    return tuple(slots)
+
+
+class LocalNgramEmbeddings(Embeddings):
+    """雜湊 n-gram TF-IDF embedding
+
+    Args:
+        dim: 向量維度
+        max_n: CJK n-gram 的最大長度
+    """
+
+    def __init__(self, dim: int = 512, max_n: int = 3) -> None:
+        self.dim = dim
+        self.max_n = max_n
+        # 供 EmbeddingCache 區分模型
+        self.model = (
+            f"{LOCAL_EMBEDDING_MODEL}-ngram-v{_ALGORITHM_VERSION}-{dim}-{max_n}"
+        )
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """嵌入多段文字"""
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        """嵌入查詢文字"""
+        return self._embed(text).tolist()
+
+    def _embed(self, text: str) -> np.ndarray:
+        counts = Counter(ngram_features(text, self.max_n))
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not counts:
+            return vector
+
+        indices: list[int] = []
+        values: list[float] = []
+        for feature, tf in counts.items():
+            weight = (1.0 + math.log(tf)) * _feature_weight(feature)
+            for index, sign in _feature_slots(feature, self.dim):
+                indices.append(index)
+                values.append(sign * weight)
+        np.add.at(vector, indices, values)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -19,6 +19,13 @@ class RateLimitConfig:
     burst_size: int = 5
 
 
+# 各 API 專屬的速率限制 (未列出的 key 使用 RateLimiter.config)
+DEFAULT_KEY_CONFIGS: dict[str, RateLimitConfig] = {
+    # LinkedIn 反爬嚴格，批次抓取時需放慢速度
+    "linkedin": RateLimitConfig(requests_per_minute=30),
+}
+
+
 @dataclass
 class RateLimiter:
     """速率限制器
@@ -33,6 +40,9 @@ class RateLimiter:
     """
 
     config: RateLimitConfig = field(default_factory=RateLimitConfig)
+    key_configs: dict[str, RateLimitConfig] = field(
+        default_factory=lambda: dict(DEFAULT_KEY_CONFIGS)
+    )
     _buckets: dict[str, list[datetime]] = field(
         default_factory=lambda: defaultdict(list)
     )
@@ -40,6 +50,19 @@ class RateLimiter:
         default_factory=lambda: defaultdict(asyncio.Lock)
     )
 
+    def configure(self, key: str, config: RateLimitConfig) -> None:
+        """設定特定 key 的速率限制
+
+        Args:
+            key: 限制器 key
+            config: 該 key 專屬的速率限制配置
+        """
+        self.key_configs[key] = config
+
+    def get_config(self, key: str) -> RateLimitConfig:
+        """取得特定 key 的速率限制配置"""
+        return self.key_configs.get(key, self.config)
+
     async def acquire(self, key: str = "default") -> None:
         """獲取請求許可
 
@@ -56,7 +79,7 @@ class RateLimiter:
             self._buckets[key] = [ts for ts in self._buckets[key] if ts > window_start]
 
             # 檢查是否超過限制
-            if len(self._buckets[key]) >= self.config.requests_per_minute:
+            if len(self._buckets[key]) >= self.get_config(key).requests_per_minute:
                 # 計算需要等待的時間
                 oldest = self._buckets[key][0]
                 wait_time = (oldest + timedelta(minutes=1) - now).total_seconds()
@@ -0,0 +1,156 @@
+"""本地相關性評分模組
+
+使用 BM25 計算 ContentItem 與研究主題/子查詢的相關性，
+在內容送進 LLM 之前過濾掉不相關的項目，以減少 prompt token 與分析延遲。
+"""
+
+from collections import Counter
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.models.content import ContentItem
+from src.utils.config import settings
+from src.utils.text import tokenize
+
+# BM25 參數
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 標題詞頻權重 (標題比內文更能代表主題)
+TITLE_WEIGHT = 2
+
+
+class RelevanceFilterResult(BaseModel):
+    """相關性過濾結果"""
+
+    kept: list[ContentItem] = Field(
+        default_factory=list, description="保留的內容 (依分數由高到低)"
+    )
+    dropped: list[ContentItem] = Field(default_factory=list, description="被過濾的內容")
+    threshold: float = Field(default=0.0, description="使用的門檻值")
+
+
+class RelevanceScorer:
+    """BM25 相關性評分器
+
+    中文以 bigram 斷詞、英文以單字斷詞，使用 NumPy 向量化計算。
+    每個查詢的分數會除以該查詢所有詞彙的 idf 總和，
+    得到約略等於「查詢詞覆蓋率」的 0-1 分數，項目分數取所有查詢中的最高值。
+    """
+
+    def __init__(
+        self,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        title_weight: int = TITLE_WEIGHT,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+
+    def score(self, items: list[ContentItem], queries: list[str]) -> np.ndarray:
+        """計算每個項目的相關性分數
+
+        Args:
+            items: 要評分的內容
+            queries: 研究主題與子查詢
+
+        Returns:
+            shape=(len(items),) 的分數陣列，範圍 0-1；沒有可用查詢詞時全部為 1
+        """
+        if not items:
+            return np.zeros(0, dtype=np.float64)
+
+        query_tokens = [list(dict.fromkeys(tokenize(q))) for q in queries]
+        query_tokens = [tokens for tokens in query_tokens if tokens]
+        if not query_tokens:
+            return np.ones(len(items), dtype=np.float64)
+
+        vocab: dict[str, int] = {}
+        for tokens in query_tokens:
+            for token in tokens:
+                vocab.setdefault(token, len(vocab))
+
+        # 詞頻矩陣 (只保留查詢詞的欄位)
+        tf = np.zeros((len(items), len(vocab)), dtype=np.float64)
+        doc_lengths = np.zeros(len(items), dtype=np.float64)
+        for row, item in enumerate(items):
+            tokens = tokenize(item.title) * self.title_weight + tokenize(item.content)
+            doc_lengths[row] = len(tokens)
+            for token, count in Counter(tokens).items():
+                col = vocab.get(token)
+                if col is not None:
+                    tf[row, col] = count
+
+        n_docs = len(items)
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+        avg_length = doc_lengths.mean() or 1.0
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / avg_length)
+        term_scores = idf * tf * (self.k1 + 1) / (tf + length_norm[:, None])
+
+        # 查詢-詞彙矩陣: 每列為一個查詢包含的詞彙
+        query_matrix = np.zeros((len(query_tokens), len(vocab)), dtype=np.float64)
+        for row, tokens in enumerate(query_tokens):
+            query_matrix[row, [vocab[t] for t in tokens]] = 1.0
+
+        raw = term_scores @ query_matrix.T
+        upper = query_matrix @ idf
+        normalized = np.clip(raw / upper, 0.0, 1.0)
+        return normalized.max(axis=1)
+
+    def filter(
+        self,
+        items: list[ContentItem],
+        queries: list[str],
+        threshold: float | None = None,
+        min_items: int | None = None,
+    ) -> RelevanceFilterResult:
+        """評分並過濾低相關性項目
+
+        分數會記錄在每個項目的 relevance_score 欄位。
+        若通過門檻的項目少於 min_items，會依分數補足，避免分析時沒有資料。
+
+        Args:
+            items: 要過濾的內容
+            queries: 研究主題與子查詢
+            threshold: 分數門檻，預設使用 settings.relevance_threshold
+            min_items: 最少保留數，預設使用 settings.relevance_min_items
+
+        Returns:
+            RelevanceFilterResult
+        """
+        _threshold = (
+            threshold if threshold is not None else settings.relevance_threshold
+        )
+        _min_items = (
+            min_items if min_items is not None else settings.relevance_min_items
+        )
+
+        scores = self.score(items, queries)
+        scored = [
+            item.model_copy(update={"relevance_score": float(score)})
+            for item, score in zip(items, scores)
+        ]
+
+        order = np.argsort(-scores, kind="stable")
+        keep_count = max(int(np.count_nonzero(scores >= _threshold)), _min_items)
+        kept_idx = set(order[:keep_count].tolist())
+
+        return RelevanceFilterResult(
+            kept=[scored[i] for i in order if i in kept_idx],
+            dropped=[scored[i] for i in range(len(scored)) if i not in kept_idx],
+            threshold=_threshold,
+        )
+
+
+def filter_by_relevance(
+    items: list[ContentItem],
+    queries: list[str],
+    threshold: float | None = None,
+    min_items: int | None = None,
+) -> RelevanceFilterResult:
+    """以預設參數評分並過濾內容 (RelevanceScorer.filter 的簡便函數)"""
+    return RelevanceScorer().filter(items, queries, threshold, min_items)
@@ -0,0 +1,205 @@
+"""文字處理工具模組
+
+提供中英混合文字的斷詞功能，供本地相關性評分等模組使用。
+"""
+
+import re
+import unicodedata
+
+# CJK 統一表意文字 (含擴充 A)、日文假名、韓文音節
+_CJK_RANGES = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3040-\u30ff\uac00-\ud7af"
+
+# 連續 CJK 字元，或連續英數字 (允許 . + # - 以保留 GPT-5、C++ 之類的詞)
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_RANGES}]+|[a-z0-9][a-z0-9.+#-]*")
+_CJK_CHAR = re.compile(rf"[{_CJK_RANGES}]")
+
+
+def tokenize(text: str) -> list[str]:
+    """將中英混合文字切成詞彙
+
+    - 英數字: 以連續字元為一詞並轉小寫
+    - CJK: 以相鄰兩字 (bigram) 為一詞，單一字元則保留為一詞
+
+    Args:
+        text: 原始文字
+
+    Returns:
+        詞彙列表 (保留重複，用於計算詞頻)
+    """
+    tokens: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        run = match.group()
+        if _is_cjk(run[0]):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.strip(".-"))
+    return [t for t in tokens if t]
+
+
+def ngram_features(text: str, max_n: int = 3) -> list[str]:
+    """將中英混合文字切成 n-gram 特徵 (供本地 embedding 使用)
+
+    - 英數字: 以連續字元為一詞並轉小寫
+    - CJK: 連續字元的 1 至 max_n 字 n-gram
+
+    Args:
+        text: 原始文字
+        max_n: CJK n-gram 的最大長度
+
+    Returns:
+        特徵列表 (保留重複，用於計算詞頻)
+    """
+    features: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        run = match.group()
+        if _is_cjk(run[0]):
+            for n in range(1, min(max_n, len(run)) + 1):
+                features.extend(run[i : i + n] for i in range(len(run) - n + 1))
+        else:
+            features.append(run.strip(".-"))
+    return [f for f in features if f]
+
+
+def _is_cjk(char: str) -> bool:
+    """判斷字元是否為 CJK 字元"""
+    return _CJK_CHAR.match(char) is not None
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """正規化文字以供比對 (例如知識節點名稱的索引欄位)
+
+    NFKC 正規化 (全形英數轉半形)、casefold，並將連續空白合併為單一空格。
+
+    Args:
+        text: 原始文字
+
+    Returns:
+        正規化後的文字
+    """
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+# 非 CJK 字元平均約 4 個字元為 1 token；CJK 字元約 1 字 1 token (保守估計)
+_CHARS_PER_TOKEN = 4
+
+
+def _char_cost(char: str) -> float:
+    """單一字元的估計 token 成本"""
+    if char.isspace():
+        return 0.0
+    if _is_cjk(char):
+        return 1.0
+    return 1.0 / _CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """估計文字的 token 數
+
+    不依賴特定 tokenizer 的快速估計：CJK 字元每字 1 token，
+    其他非空白字元每 4 字元 1 token。
+
+    Args:
+        text: 原始文字
+
+    Returns:
+        估計的 token 數 (無條件進位)
+    """
+    cjk_count = len(_CJK_CHAR.findall(text))
+    other_count = sum(1 for c in text if not c.isspace()) - cjk_count
+    return cjk_count + -(-other_count // _CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """截斷文字使其估計 token 數不超過上限
+
+    Args:
+        text: 原始文字
+        max_tokens: token 上限
+
+    Returns:
+        截斷後的文字 (未超過上限時原樣回傳)
+    """
+    if max_tokens <= 0:
+        return ""
+    cost = 0.0
+    for i, char in enumerate(text):
+        cost += _char_cost(char)
+        if cost > max_tokens:
+            return text[:i]
+    return text
+
+
+# 抽取關鍵字時移除的詞 (疑問詞、泛用詞與連接詞)，較長的詞放前面優先比對
+_STOP_PHRASES = (
+    "為什麼",
+    "怎麼樣",
+    "是什麼",
+    "有什麼",
+    "如何",
+    "怎麼",
+    "什麼",
+    "是否",
+    "有關",
+    "關於",
+    "相關",
+    "最新",
+    "新聞",
+    "消息",
+    "討論",
+    "看法",
+    "問題",
+    "影響",
+    "現在",
+    "目前",
+    "近期",
+    "最近",
+    "大家",
+    "請問",
+    "一下",
+    "都在",
+    "正在",
+)
+_STOP_CHARS = "的了嗎呢吧啊與及"
+_STOP_PATTERN = re.compile(
+    "|".join(map(re.escape, _STOP_PHRASES)) + f"|[{_STOP_CHARS}]"
+)
+_KEYWORD_PATTERN = re.compile(
+    rf"[{_CJK_RANGES}]+|[A-Za-z0-9][A-Za-z0-9.+#-]*", re.IGNORECASE
+)
+
+
+def extract_keywords(text: str, max_keywords: int = 4) -> list[str]:
+    """從短文字 (例如研究話題) 抽取搜尋關鍵字，不使用 LLM
+
+    - 英數字詞保留原始大小寫 (AI、GPT-5)
+    - CJK 連續字元以疑問詞、泛用詞與虛詞切開，丟棄切開後的單字片段
+    - 依出現順序去重
+
+    Args:
+        text: 原始文字
+        max_keywords: 最多回傳的關鍵字數
+
+    Returns:
+        關鍵字列表；沒有可用的詞時回傳空列表
+    """
+    keywords: list[str] = []
+    seen: set[str] = set()
+    for match in _KEYWORD_PATTERN.finditer(text):
+        run = match.group()
+        if _is_cjk(run[0]):
+            fragments = [f for f in _STOP_PATTERN.split(run) if len(f) >= 2]
+        else:
+            fragments = [run.strip(".-")]
+        for fragment in fragments:
+            key = fragment.lower()
+            if fragment and key not in seen:
+                seen.add(key)
+                keywords.append(fragment)
+    return keywords[:max_keywords]
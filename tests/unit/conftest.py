@@ -12,6 +12,14 @@ from src.models.content import (
     ResearchRequest,
 )
 from src.models.video_material import PlatformVariant, SourceItem, VideoMaterial
+from src.utils.config import settings
+from src.utils.local_embeddings import LOCAL_EMBEDDING_MODEL
+
+
+@pytest.fixture(autouse=True)
+def local_embeddings(monkeypatch):
+    """單元測試一律使用本地 embedding，不呼叫 embedding API"""
+    monkeypatch.setattr(settings, "embedding_model", LOCAL_EMBEDDING_MODEL)
 
 
 @pytest.fixture
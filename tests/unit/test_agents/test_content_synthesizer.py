@@ -74,6 +74,44 @@ class TestContentSynthesizerAgent:
         assert len(result.data.platform_variants) == 1
         assert result.data.platform_variants[0].platform == "TikTok"
 
+    async def test_streaming_matches_blocking(
+        self, mock_llm, sample_analysis_result, sample_content_items
+    ):
+        llm_output = mock_llm.with_structured_output.return_value.ainvoke.return_value
+
+        async def astream(prompt, config=None):
+            partial: dict = {}
+            for field, value in llm_output.model_dump().items():
+                partial[field] = value
+                yield dict(partial)
+
+        mock_llm.with_structured_output.return_value.astream = MagicMock(
+            side_effect=astream
+        )
+        input_data = ContentSynthesizerInput(
+            topic="AI 取代工作",
+            analysis=sample_analysis_result,
+            content_items=sample_content_items,
+        )
+        fields: list[str] = []
+
+        blocking = await ContentSynthesizerAgent(llm=mock_llm)(input_data)
+        streamed = await ContentSynthesizerAgent(
+            llm=mock_llm, on_field=lambda f, v: fields.append(f)
+        )(input_data)
+
+        assert streamed.success
+        assert streamed.data.model_dump(exclude={"generated_at"}) == (
+            blocking.data.model_dump(exclude={"generated_at"})
+        )
+        assert fields == list(LLMVideoOutput.model_fields)
+        assert streamed.metadata["streamed"] is True
+        assert blocking.metadata["streamed"] is False
+        assert (
+            streamed.metadata["time_to_first_field_ms"]
+            <= streamed.metadata["synthesis_ms"]
+        )
+
     def test_build_sources(self, sample_content_items):
         agent = ContentSynthesizerAgent()
         sources = agent._build_sources(sample_content_items)
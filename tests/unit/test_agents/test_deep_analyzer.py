@@ -4,8 +4,12 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.agents.deep_analyzer import DeepAnalyzerAgent, DeepAnalyzerInput
-from src.models.content import AnalysisResult
+from src.agents.deep_analyzer import (
+    DeepAnalyzerAgent,
+    DeepAnalyzerInput,
+    merge_analyses,
+)
+from src.models.content import AnalysisResult, ContentItem
 
 
 class TestDeepAnalyzerAgent:
@@ -35,6 +39,96 @@ class TestDeepAnalyzerAgent:
         assert len(result.data.key_insights) == 2
         assert result.data.source_count == 3  # 自動修正為實際來源數
 
+    async def test_analyze_records_context_metadata(self, mock_llm):
+        items = [
+            ContentItem(
+                title=f"長文 {i}",
+                url=f"https://example.com/{i}",
+                content="內容" * 1000,
+                source_type="news",
+                source_name="Test",
+            )
+            for i in range(10)
+        ]
+        agent = DeepAnalyzerAgent(llm=mock_llm)
+        result = await agent(
+            DeepAnalyzerInput(
+                topic="AI",
+                content_items=items,
+                context_token_budget=300,
+                map_reduce=False,
+            )
+        )
+
+        assert result.success
+        assert result.metadata["analysis_mode"] == "single"
+        assert result.metadata["context_token_budget"] == 300
+        assert result.metadata["context_estimated_tokens"] <= 300
+        assert result.metadata["truncated_items"]
+        assert result.metadata["dropped_items"]
+
+    async def test_map_reduce_auto_for_large_input(self, mock_llm):
+        items = [
+            ContentItem(
+                title=f"長文 {i}",
+                url=f"https://example.com/{i}",
+                content="內容" * 300,
+                source_type="news",
+                source_name="Test",
+            )
+            for i in range(6)
+        ]
+        agent = DeepAnalyzerAgent(llm=mock_llm)
+        result = await agent(
+            DeepAnalyzerInput(topic="AI", content_items=items, context_token_budget=700)
+        )
+
+        assert result.success
+        assert result.metadata["analysis_mode"] == "map_reduce"
+        assert result.metadata["shard_count"] > 1
+        assert result.metadata["failed_shards"] == 0
+        structured_llm = mock_llm.with_structured_output.return_value
+        assert structured_llm.ainvoke.await_count == result.metadata["shard_count"]
+        # 各分片的相同洞察合併為一
+        assert result.data.key_insights == ["insight 1", "insight 2"]
+        assert result.data.source_count == 6
+
+    async def test_map_reduce_tolerates_partial_failure(self):
+        items = [
+            ContentItem(
+                title=f"文章 {i}",
+                url=f"https://example.com/{i}",
+                content="內容" * 30,
+                source_type="news",
+                source_name="Test",
+            )
+            for i in range(3)
+        ]
+        llm = MagicMock()
+        structured_llm = MagicMock()
+        structured_llm.ainvoke = AsyncMock(
+            side_effect=[
+                Exception("LLM error"),
+                AnalysisResult(topic="AI", key_insights=["ok"], confidence_score=0.8),
+                AnalysisResult(topic="AI", key_insights=["ok"], confidence_score=0.8),
+            ]
+        )
+        llm.with_structured_output.return_value = structured_llm
+
+        agent = DeepAnalyzerAgent(llm=llm)
+        result = await agent(
+            DeepAnalyzerInput(
+                topic="AI",
+                content_items=items,
+                context_token_budget=80,
+                map_reduce=True,
+            )
+        )
+
+        assert result.success
+        assert result.metadata["failed_shards"] == 1
+        assert result.data.key_insights == ["ok"]
+
     async def test_analyze_empty_items(self, mock_llm):
         agent = DeepAnalyzerAgent(llm=mock_llm)
         result = await agent(DeepAnalyzerInput(topic="AI", content_items=[]))
@@ -55,16 +149,42 @@ class TestDeepAnalyzerAgent:
         assert not result.success
         assert "深度分析失敗" in result.error
 
-    def test_format_content_summary(self, sample_content_items):
-        agent = DeepAnalyzerAgent()
-        summary = agent._format_content_summary(sample_content_items)
 
-        assert "AI 最新進展" in summary
-        assert "PTT 測試文章" in summary
-        assert "[news]" in summary
-        assert "[forum]" in summary
+class TestMergeAnalyses:
+    def test_dedups_and_ranks_by_frequency(self):
+        partials = [
+            AnalysisResult(
+                topic="AI",
+                key_insights=["只出現一次的觀點", "AI 晶片需求大增"],
+                recommended_hooks=["你知道嗎？"],
+                source_count=10,
+                confidence_score=0.9,
+            ),
+            AnalysisResult(
+                topic="AI",
+                key_insights=["AI 晶片需求大增！"],
+                controversies=["監管爭議"],
+                recommended_hooks=["你知道嗎？"],
+                source_count=30,
+                confidence_score=0.5,
+            ),
+        ]
+        merged = merge_analyses("AI", partials, source_count=40)
+
+        assert merged.key_insights[0] == "AI 晶片需求大增"
+        assert len(merged.key_insights) == 2
+        assert merged.controversies == ["監管爭議"]
+        assert merged.recommended_hooks == ["你知道嗎？"]
+        assert merged.source_count == 40
+        assert merged.confidence_score == pytest.approx(0.6)
 
-    def test_format_empty_items(self):
-        agent = DeepAnalyzerAgent()
-        summary = agent._format_content_summary([])
-        assert "無來源資料" in summary
+    def test_caps_list_lengths(self):
+        partials = [
+            AnalysisResult(
+                topic="AI",
+                recommended_hooks=[f"鉤子{i}{i}{i} 第{i}版" for i in range(5)],
+            )
+            for _ in range(2)
+        ]
+        merged = merge_analyses("AI", partials, source_count=2)
+        assert len(merged.recommended_hooks) == 3
@@ -69,7 +69,7 @@ class TestSocialMediaAgent:
         )
 
         mock_scraper = MagicMock()
-        mock_scraper.get_post = AsyncMock(return_value=linkedin_item)
+        mock_scraper.fetch_post = AsyncMock(return_value=linkedin_item)
         mock_scraper.__aenter__ = AsyncMock(return_value=mock_scraper)
         mock_scraper.__aexit__ = AsyncMock(return_value=None)
 
@@ -88,6 +88,44 @@ class TestSocialMediaAgent:
         assert result.success
         assert len(result.data.social_items) == 1
 
+    async def test_linkedin_batch_dedup_and_failures(self):
+        """LinkedIn 批次: 重複 URL 只抓一次，失敗 URL 記錄於 errors"""
+        linkedin_item = _make_item(
+            "LinkedIn Post", "https://www.linkedin.com/posts/ok", "social"
+        )
+
+        async def fetch_side_effect(url):
+            if url.endswith("/broken"):
+                raise RuntimeError("HTTP 999")
+            return linkedin_item
+
+        mock_scraper = MagicMock()
+        mock_scraper.fetch_post = AsyncMock(side_effect=fetch_side_effect)
+        mock_scraper.__aenter__ = AsyncMock(return_value=mock_scraper)
+        mock_scraper.__aexit__ = AsyncMock(return_value=None)
+
+        with patch(
+            "src.agents.social_media.LinkedInScraper", return_value=mock_scraper
+        ):
+            agent = SocialMediaAgent()
+            result = await agent.run(
+                SocialMediaInput(
+                    queries=["AI"],
+                    platforms=["linkedin"],
+                    linkedin_urls=[
+                        "https://www.linkedin.com/posts/ok",
+                        "https://linkedin.com/posts/ok/?utm_source=share",
+                        "https://www.linkedin.com/posts/broken",
+                    ],
+                )
+            )
+
+        assert result.success
+        assert len(result.data.social_items) == 1
+        assert mock_scraper.fetch_post.await_count == 2
+        assert any("broken" in e and "HTTP 999" in e for e in result.data.errors)
+        assert "linkedin" in result.data.sources_used
+
     async def test_error_tolerance(self):
         """單一平台失敗不影響其他平台"""
         ptt_items = [_make_item("PTT Post", "https://ptt.cc/ok")]
@@ -1,10 +1,31 @@
 """SupervisorAgent 測試"""
 
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.agents.supervisor import SubQueryPlan, SupervisorAgent, SupervisorInput
+from src.agents.supervisor import (
+    SubQueryPlan,
+    SupervisorAgent,
+    SupervisorInput,
+    heuristic_decompose,
+)
+from src.models.content import ResearchRequest
+
+
+@pytest.fixture
+def deep_request(sample_research_request):
+    """超過本地分解深度、會走 LLM 路徑的請求"""
+    return sample_research_request.model_copy(update={"depth": 3})
+
+
+def _failing_llm(error: Exception) -> MagicMock:
+    llm = MagicMock()
+    structured_llm = MagicMock()
+    structured_llm.ainvoke = AsyncMock(side_effect=error)
+    llm.with_structured_output.return_value = structured_llm
+    return llm
 
 
 class TestSupervisorAgent:
@@ -22,24 +43,91 @@ class TestSupervisorAgent:
         llm.with_structured_output.return_value = structured_llm
         return llm
 
-    async def test_decompose_query(self, mock_llm, sample_research_request):
+    async def test_decompose_query(self, mock_llm, deep_request):
         agent = SupervisorAgent(llm=mock_llm)
-        result = await agent(SupervisorInput(request=sample_research_request))
+        result = await agent(SupervisorInput(request=deep_request))
 
         assert result.success
         assert len(result.data.plan.sub_queries) == 2
         assert result.data.original_request.topic == "AI 取代工作"
+        assert result.metadata["decomposer"] == "llm"
 
-    async def test_llm_error_handled(self, sample_research_request):
-        llm = MagicMock()
-        structured_llm = MagicMock()
-        structured_llm.ainvoke = AsyncMock(
-            side_effect=Exception("LLM connection error")
-        )
-        llm.with_structured_output.return_value = structured_llm
-
-        agent = SupervisorAgent(llm=llm)
+    async def test_low_depth_skips_llm(self, mock_llm, sample_research_request):
+        agent = SupervisorAgent(llm=mock_llm)
         result = await agent(SupervisorInput(request=sample_research_request))
 
+        assert result.success
+        assert result.metadata["decomposer"] == "heuristic"
+        mock_llm.with_structured_output.assert_not_called()
+
+    async def test_low_depth_does_not_create_llm(self, sample_research_request):
+        with patch("src.agents.supervisor.get_chat_model") as factory:
+            agent = SupervisorAgent()
+            result = await agent(SupervisorInput(request=sample_research_request))
+
+        assert result.success
+        factory.assert_not_called()
+
+    async def test_llm_error_falls_back_to_heuristic(self, deep_request):
+        agent = SupervisorAgent(llm=_failing_llm(Exception("LLM connection error")))
+        result = await agent(SupervisorInput(request=deep_request))
+
+        assert result.success
+        assert result.metadata["decomposer"] == "heuristic_fallback"
+        assert result.metadata["fallback_reason"] == "Exception"
+
+    async def test_llm_timeout_falls_back_to_heuristic(self, deep_request):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        llm = _failing_llm(Exception())
+        llm.with_structured_output.return_value.ainvoke = AsyncMock(side_effect=slow)
+
+        with patch(
+            "src.agents.supervisor.settings.supervisor_llm_timeout_seconds", 0.01
+        ):
+            agent = SupervisorAgent(llm=llm)
+            result = await agent(SupervisorInput(request=deep_request))
+
+        assert result.success
+        assert result.metadata["fallback_reason"] == "TimeoutError"
+
+    async def test_llm_error_handled(self, deep_request):
+        with patch("src.agents.supervisor.settings.supervisor_llm_fallback", False):
+            agent = SupervisorAgent(llm=_failing_llm(Exception("LLM connection error")))
+            result = await agent(SupervisorInput(request=deep_request))
+
         assert not result.success
         assert "查詢分解失敗" in result.error
+
+
+class TestHeuristicDecompose:
+    def test_fact_and_reaction_queries(self):
+        plan = heuristic_decompose(
+            ResearchRequest(topic="台積電美國設廠的影響", depth=1)
+        )
+
+        assert plan.sub_queries == [
+            "台積電美國設廠 最新消息",
+            "台積電美國設廠 網友反應",
+        ]
+        assert plan.recommended_sources == ["news", "social", "forum"]
+
+    def test_query_count_follows_depth(self):
+        plan = heuristic_decompose(ResearchRequest(topic="AI 取代工作", depth=3))
+        assert plan.sub_queries[-1] == "AI 取代工作"
+        assert len(plan.sub_queries) == 3
+
+    def test_long_topic_keeps_queries_short(self):
+        plan = heuristic_decompose(
+            ResearchRequest(
+                topic="為什麼大家都在討論 ChatGPT 與 Gemini 的差異和未來發展趨勢",
+                depth=1,
+            )
+        )
+        assert plan.sub_queries[0].startswith("ChatGPT Gemini")
+        assert all(len(q) <= 30 for q in plan.sub_queries)
+
+    def test_falls_back_to_raw_topic(self):
+        plan = heuristic_decompose(ResearchRequest(topic="？", depth=1))
+        assert plan.sub_queries == ["？ 最新消息", "？ 網友反應"]
@@ -0,0 +1,155 @@
+"""研究檢查點測試"""
+
+import time
+from typing import TypedDict
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.checkpoint import CompactSerializer, SQLiteCheckpointer
+from src.models.content import AnalysisResult, ContentItem, ResearchRequest
+
+
+def _items(n: int) -> list[ContentItem]:
+    return [
+        ContentItem(
+            title=f"新聞 {i}",
+            url=f"https://example.com/{i}",
+            content="AI 技術持續發展，" * 20,
+            source_type="news",
+            source_name="Test",
+        )
+        for i in range(n)
+    ]
+
+
+def _config(thread_id: str, checkpoint_id: str | None = None) -> dict:
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+class TestCompactSerializer:
+    def test_round_trip(self):
+        serde = CompactSerializer()
+        state = {
+            "news_results": _items(3),
+            "analysis": AnalysisResult(topic="AI", key_insights=["a"]),
+            "request": ResearchRequest(topic="AI"),
+            "execution_log": ["log"],
+        }
+        restored = serde.loads_typed(serde.dumps_typed(state))
+
+        assert restored["news_results"] == state["news_results"]
+        assert restored["analysis"] == state["analysis"]
+        assert restored["request"] == state["request"]
+        assert restored["execution_log"] == ["log"]
+
+    def test_smaller_than_default_serializer(self):
+        items = _items(50)
+        _, compact = CompactSerializer().dumps_typed(items)
+        _, default = JsonPlusSerializer().dumps_typed(items)
+        assert len(compact) < len(default) / 2
+
+    def test_empty_list_round_trip(self):
+        serde = CompactSerializer()
+        assert serde.loads_typed(serde.dumps_typed([])) == []
+
+
+class TestSQLiteCheckpointer:
+    def test_put_and_get_latest(self, tmp_path):
+        saver = SQLiteCheckpointer(tmp_path / "cp.db")
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"news_results": _items(2)}
+        checkpoint["channel_versions"] = {"news_results": 1}
+
+        saved = saver.put(_config("run"), checkpoint, {"step": 1}, {"news_results": 1})
+        loaded = saver.get_tuple(_config("run"))
+
+        assert loaded.config == saved
+        assert (
+            loaded.checkpoint["channel_values"]["news_results"]
+            == checkpoint["channel_values"]["news_results"]
+        )
+        assert loaded.metadata["step"] == 1
+
+    def test_unchanged_channels_not_rewritten(self, tmp_path):
+        saver = SQLiteCheckpointer(tmp_path / "cp.db")
+        first = empty_checkpoint()
+        first["channel_values"] = {"news_results": _items(5)}
+        first["channel_versions"] = {"news_results": 1}
+        saved = saver.put(_config("run"), first, {}, {"news_results": 1})
+
+        second = empty_checkpoint()
+        second["channel_values"] = {"news_results": _items(5), "current_step": "x"}
+        second["channel_versions"] = {"news_results": 1, "current_step": 1}
+        saver.put(saved, second, {}, {"current_step": 1})
+
+        with saver._transaction() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM checkpoint_blobs WHERE channel = 'news_results'"
+            ).fetchone()[0]
+        assert count == 1
+        latest = saver.get_tuple(_config("run"))
+        assert len(latest.checkpoint["channel_values"]["news_results"]) == 5
+        assert latest.parent_config == saved
+
+    def test_prune_expired(self, tmp_path):
+        saver = SQLiteCheckpointer(tmp_path / "cp.db", retention_seconds=60)
+        for thread_id in ("old", "new"):
+            saver.put(_config(thread_id), empty_checkpoint(), {}, {})
+        with saver._transaction() as conn:
+            conn.execute(
+                "UPDATE checkpoints SET created_at = ? WHERE thread_id = 'old'",
+                (time.time() - 3600,),
+            )
+
+        assert saver.prune_expired() == 1
+        assert saver.get_tuple(_config("old")) is None
+        assert saver.get_tuple(_config("new")) is not None
+
+    def test_list_filters_by_thread(self, tmp_path):
+        saver = SQLiteCheckpointer(tmp_path / "cp.db")
+        config = _config("run")
+        for _ in range(3):
+            config = saver.put(config, empty_checkpoint(), {}, {})
+        saver.put(_config("other"), empty_checkpoint(), {}, {})
+
+        assert len(list(saver.list(_config("run")))) == 3
+        assert len(list(saver.list(_config("run"), limit=2))) == 2
+
+    def test_next_version_is_sortable_and_unique(self, tmp_path):
+        saver = SQLiteCheckpointer(tmp_path / "cp.db")
+        first = saver.get_next_version(None, None)
+        second = saver.get_next_version(first, None)
+
+        assert first < second
+        assert saver.get_next_version(first, None) != second
+        assert saver.get_next_version(1, None).startswith(f"{2:032}.")
+
+    async def test_fork_keeps_original_branch(self, tmp_path):
+        class State(TypedDict):
+            x: str
+
+        builder = StateGraph(State)
+        builder.add_node("a", lambda s: {"x": s["x"] + "a"})
+        builder.add_node("b", lambda s: {"x": s["x"] + "b"})
+        builder.add_edge(START, "a")
+        builder.add_edge("a", "b")
+        builder.add_edge("b", END)
+        graph = builder.compile(checkpointer=SQLiteCheckpointer(tmp_path / "cp.db"))
+        config = {"configurable": {"thread_id": "run"}}
+
+        await graph.ainvoke({"x": ""}, config)
+        history = [s async for s in graph.aget_state_history(config)]
+        original_final = history[0].config
+        after_a = next(s for s in history if s.next == ("b",))
+
+        # 由 a 完成後的檢查點分岔並重跑 b
+        forked = await graph.aupdate_state(after_a.config, {"x": "ZZ"})
+        await graph.ainvoke(None, forked)
+
+        assert (await graph.aget_state(config)).values == {"x": "ZZb"}
+        assert (await graph.aget_state(original_final)).values == {"x": "ab"}
@@ -10,7 +10,10 @@ from src.graph.edges import (
 class TestSupervisorRouting:
     def test_routes_to_scraping_on_success(self):
         state = {"sub_queries": ["q1", "q2"]}
-        assert should_continue_after_supervisor(state) == "news_scraper"
+        assert should_continue_after_supervisor(state) == [
+            "news_scraper",
+            "social_media",
+        ]
 
     def test_routes_to_error_on_error(self):
         state = {"error": "something failed", "sub_queries": ["q1"]}
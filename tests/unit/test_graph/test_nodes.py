@@ -147,6 +147,33 @@ class TestDeepAnalyzerNode:
         assert result["current_step"] == "analysis_complete"
         assert result["analysis"].confidence_score == 0.8
 
+    async def test_filters_irrelevant_items(self, base_state, sample_items):
+        irrelevant = [
+            ContentItem(
+                title=f"[問卦] 晚餐吃什麼 {i}",
+                url=f"https://ptt.cc/bbs/Gossiping/{i}.html",
+                source_type="forum",
+                source_name="PTT:Gossiping",
+            )
+            for i in range(10)
+        ]
+        base_state["news_results"] = sample_items
+        base_state["social_results"] = []
+        base_state["forum_results"] = irrelevant
+        base_state["sub_queries"] = ["AI 趨勢"]
+
+        analysis = AnalysisResult(topic="AI 趨勢", confidence_score=0.8)
+        mock_agent = AsyncMock(return_value=AgentResult(success=True, data=analysis))
+
+        with patch("src.graph.nodes.DeepAnalyzerAgent", return_value=mock_agent):
+            result = await deep_analyzer_node(base_state)
+
+        analyzed = mock_agent.call_args.args[0].content_items
+        assert analyzed[0].title == "AI News"
+        assert len(analyzed) < len(irrelevant) + 1
+        assert result["relevant_items"] == analyzed
+        assert any("Relevance filter" in log for log in result["execution_log"])
+
     async def test_failure(self, base_state):
         base_state["news_results"] = []
         base_state["social_results"] = []
@@ -0,0 +1,138 @@
+"""抓取 quorum 閘門測試"""
+
+import asyncio
+
+from src.graph.quorum import (
+    QuorumGate,
+    discard_gate,
+    get_gate,
+    get_or_create_gate,
+    merge_updates,
+)
+from src.models.content import ContentItem, QuorumPolicy
+
+
+def _items(count: int, source_type: str) -> list[ContentItem]:
+    return [
+        ContentItem(
+            title=f"{source_type} {i}",
+            url=f"https://example.com/{source_type}/{i}",
+            source_type=source_type,
+            source_name="Test",
+        )
+        for i in range(count)
+    ]
+
+
+async def _job(delay: float, field: str, items: list[ContentItem]) -> dict:
+    await asyncio.sleep(delay)
+    return {
+        field: items,
+        "total_sources_scraped": len(items),
+        "execution_log": [f"{field}: {len(items)}"],
+    }
+
+
+class TestMergeUpdates:
+    def test_concatenates_and_sums(self):
+        merged = merge_updates(
+            [
+                {"news_results": _items(1, "news"), "total_sources_scraped": 1},
+                {
+                    "forum_results": _items(2, "forum"),
+                    "total_sources_scraped": 2,
+                    "execution_log": ["x"],
+                },
+            ]
+        )
+        assert len(merged["news_results"]) == 1
+        assert len(merged["forum_results"]) == 2
+        assert merged["total_sources_scraped"] == 3
+        assert merged["execution_log"] == ["x"]
+
+
+class TestQuorumGate:
+    async def test_requires_min_source_types(self):
+        gate = QuorumGate(QuorumPolicy(min_items=2, min_source_types=2))
+        gate.record({"news_results": _items(5, "news")})
+        assert not gate.met
+
+        gate.record({"forum_results": _items(1, "forum")})
+        assert gate.met
+        assert gate.met_reason == "6 items from 2 source types"
+
+    async def test_run_returns_when_quorum_met(self):
+        gate = QuorumGate(QuorumPolicy(min_items=2, min_source_types=2))
+        updates, late = await gate.run(
+            {
+                "news": _job(0.0, "news_results", _items(1, "news")),
+                "ptt": _job(0.01, "forum_results", _items(1, "forum")),
+                "threads": _job(5, "social_results", _items(1, "social")),
+            }
+        )
+
+        assert len(updates) == 2
+        assert late == ["threads"]
+        assert gate.late_sources == ["threads"]
+        gate.cancel()
+
+    async def test_run_waits_for_all_when_quorum_not_met(self):
+        gate = QuorumGate(QuorumPolicy(min_items=10))
+        updates, late = await gate.run(
+            {
+                "news": _job(0.0, "news_results", _items(1, "news")),
+                "ptt": _job(0.02, "forum_results", _items(1, "forum")),
+            }
+        )
+        assert len(updates) == 2
+        assert late == []
+        assert not gate.met
+
+    async def test_timeout_needs_at_least_one_item(self):
+        gate = QuorumGate(QuorumPolicy(min_items=10, max_wait_seconds=0.01))
+        updates, late = await gate.run(
+            {
+                "news": _job(0.05, "news_results", _items(1, "news")),
+                "threads": _job(5, "social_results", _items(1, "social")),
+            }
+        )
+        assert len(updates) == 1
+        assert late == ["threads"]
+        assert gate.met_reason == "0.01s elapsed"
+        gate.cancel()
+
+    async def test_collect_late_returns_finished_and_cancels_rest(self):
+        gate = QuorumGate(QuorumPolicy(min_items=1, min_source_types=1))
+        await gate.run(
+            {
+                "news": _job(0.0, "news_results", _items(1, "news")),
+                "ptt": _job(0.02, "forum_results", _items(2, "forum")),
+                "threads": _job(5, "social_results", _items(1, "social")),
+            }
+        )
+
+        updates, cancelled = await gate.collect_late(timeout=0.1)
+
+        assert cancelled == ["threads"]
+        assert len(merge_updates(updates)["forum_results"]) == 2
+        assert gate.late_sources == []
+
+    async def test_failed_job_becomes_log_entry(self):
+        async def failing() -> dict:
+            raise RuntimeError("boom")
+
+        gate = QuorumGate(QuorumPolicy(min_items=5))
+        updates, _ = await gate.run({"threads": failing()})
+        assert updates == [{"execution_log": ["Scrape threads failed: boom"]}]
+
+
+class TestGateRegistry:
+    def test_shared_per_run_and_discarded(self):
+        policy = QuorumPolicy()
+        gate = get_or_create_gate("run-q", policy)
+        assert get_or_create_gate("run-q", policy) is gate
+        assert get_gate("run-q") is gate
+
+        discard_gate("run-q")
+        assert get_gate("run-q") is None
+        assert get_gate(None) is None
@@ -1,6 +1,28 @@
 """研究工作流圖結構測試"""
 
-from src.graph.research_graph import build_research_graph, create_research_workflow
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agents.base import AgentResult
+from src.agents.news_scraper import NewsScraperOutput
+from src.agents.social_media import SocialMediaOutput
+from src.agents.supervisor import SubQueryPlan, SupervisorOutput
+from src.graph.checkpoint import SQLiteCheckpointer
+from src.graph.research_graph import (
+    build_research_graph,
+    clear_workflow_cache,
+    create_research_workflow,
+    get_research_workflow,
+    resume_research,
+    run_research,
+    stream_research,
+    warm_up_workflow,
+)
+from src.models.content import QuorumPolicy, ResearchRequest
 
 
 class TestBuildResearchGraph:
@@ -12,6 +34,7 @@ class TestBuildResearchGraph:
             "supervisor",
             "news_scraper",
             "social_media",
+            "scrape_join",
             "deep_analyzer",
             "content_synthesizer",
             "error_handler",
@@ -21,3 +44,359 @@ class TestBuildResearchGraph:
     def test_create_workflow_compiles(self):
         workflow = create_research_workflow()
         assert workflow is not None
+
+
+class TestWorkflowCache:
+    def test_reuses_compiled_workflow(self):
+        clear_workflow_cache()
+        assert get_research_workflow() is get_research_workflow()
+
+    def test_keyed_on_config(self):
+        default = get_research_workflow()
+        interrupted = get_research_workflow(interrupt_before=["deep_analyzer"])
+        assert interrupted is not default
+        assert get_research_workflow(interrupt_before=["deep_analyzer"]) is interrupted
+
+    def test_thread_safe_single_compile(self):
+        clear_workflow_cache()
+        with patch(
+            "src.graph.research_graph.create_research_workflow",
+            wraps=create_research_workflow,
+        ) as spy:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                workflows = list(pool.map(lambda _: get_research_workflow(), range(16)))
+
+        assert spy.call_count == 1
+        assert all(w is workflows[0] for w in workflows)
+
+    def test_warm_up_populates_cache(self):
+        clear_workflow_cache()
+        warm_up_workflow()
+        with patch("src.graph.research_graph.create_research_workflow") as spy:
+            get_research_workflow()
+        spy.assert_not_called()
+
+
+@pytest.fixture
+def mocked_agents(sample_content_items, sample_analysis_result, sample_video_material):
+    """以 mock 取代所有代理，回傳 (request, timeline, mocks)"""
+    timeline: list[str] = []
+
+    def slow_agent(name: str, result: AgentResult) -> AsyncMock:
+        async def run(*args, **kwargs):
+            timeline.append(f"{name}:start")
+            await asyncio.sleep(0.05)
+            timeline.append(f"{name}:end")
+            return result
+
+        return AsyncMock(side_effect=run)
+
+    plan = SubQueryPlan(
+        sub_queries=["AI 新聞", "AI 反應"],
+        search_strategy="並行搜尋",
+        recommended_sources=["news", "forum"],
+    )
+    request = ResearchRequest(topic="AI", sources=["news", "social", "forum"])
+    news = NewsScraperOutput(
+        items=sample_content_items[:1],
+        total_count=1,
+        sources_used=["google_news"],
+    )
+    social = SocialMediaOutput(
+        forum_items=sample_content_items[1:2],
+        social_items=sample_content_items[2:],
+        total_count=2,
+        sources_used=["ptt"],
+    )
+    mocks = {
+        "SupervisorAgent": AsyncMock(
+            return_value=AgentResult(
+                success=True,
+                data=SupervisorOutput(plan=plan, original_request=request),
+            )
+        ),
+        "NewsScraperAgent": slow_agent("news", AgentResult(success=True, data=news)),
+        "SocialMediaAgent": slow_agent(
+            "social", AgentResult(success=True, data=social)
+        ),
+        "DeepAnalyzerAgent": AsyncMock(
+            return_value=AgentResult(success=True, data=sample_analysis_result)
+        ),
+        "ContentSynthesizerAgent": AsyncMock(
+            return_value=AgentResult(success=True, data=sample_video_material)
+        ),
+    }
+    with ExitStack() as stack:
+        for name, mock in mocks.items():
+            stack.enter_context(patch(f"src.graph.nodes.{name}", return_value=mock))
+        yield request, timeline, mocks
+
+
+@pytest.fixture
+def checkpointer(tmp_path):
+    return SQLiteCheckpointer(tmp_path / "checkpoints.db")
+
+
+class TestParallelScraping:
+    async def test_scrapers_run_concurrently_and_merge(
+        self, mocked_agents, checkpointer
+    ):
+        request, timeline, _ = mocked_agents
+        result = await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+
+        # 兩個抓取節點都在任一個結束前開始
+        assert timeline.index("news:start") < timeline.index("social:end")
+        assert timeline.index("social:start") < timeline.index("news:end")
+
+        assert result["total_sources_scraped"] == 3
+        assert len(result["news_results"]) == 1
+        assert len(result["forum_results"]) == 1
+        assert result["current_step"] == "complete"
+        logs = result["execution_log"]
+        assert any(log.startswith("News:") for log in logs)
+        assert any(log.startswith("Social:") for log in logs)
+        assert "Scraping complete: 3 items" in logs
+        assert len(logs) == len(set(logs))
+
+
+class TestQuorumScraping:
+    @pytest.fixture
+    def slow_social(self, mocked_agents):
+        """社群抓取延遲 0.3 秒，分析時記錄於 timeline"""
+        request, timeline, mocks = mocked_agents
+        social_result = mocks["SocialMediaAgent"].side_effect
+        analysis_result = mocks["DeepAnalyzerAgent"].return_value
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(0.25)
+            return await social_result(*args, **kwargs)
+
+        async def analyze(*args, **kwargs):
+            timeline.append("analyze")
+            return analysis_result
+
+        mocks["SocialMediaAgent"].side_effect = slow
+        mocks["DeepAnalyzerAgent"].side_effect = analyze
+        return request, timeline, mocks
+
+    async def test_analysis_starts_before_slow_source_and_refines(
+        self, slow_social, checkpointer
+    ):
+        request, timeline, mocks = slow_social
+        request = request.model_copy(
+            update={"quorum": QuorumPolicy(min_items=1, min_source_types=1)}
+        )
+        result = await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+
+        assert timeline.index("analyze") < timeline.index("social:end")
+        # 各平台分開抓取 (threads + ptt)，遲到內容做一次補充分析
+        assert mocks["SocialMediaAgent"].await_count == 2
+        assert mocks["DeepAnalyzerAgent"].await_count == 2
+        assert result["current_step"] == "complete"
+        assert result["total_sources_scraped"] == 5
+        assert len(result["forum_results"]) == 2
+        logs = result["execution_log"]
+        assert any(log.startswith("Quorum met (1 items") for log in logs)
+        assert any(log.startswith("Refined with") for log in logs)
+
+    async def test_exclude_policy_records_late_items(self, slow_social, checkpointer):
+        request, _, mocks = slow_social
+        request = request.model_copy(
+            update={
+                "quorum": QuorumPolicy(
+                    min_items=1, min_source_types=1, late_items="exclude"
+                )
+            }
+        )
+        result = await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+
+        assert mocks["DeepAnalyzerAgent"].await_count == 1
+        assert len(result["excluded_items"]) == 4
+        assert result.get("forum_results", []) == []
+        assert result["total_sources_scraped"] == 1
+
+    async def test_time_based_quorum(self, slow_social, checkpointer):
+        request, timeline, _ = slow_social
+        request = request.model_copy(
+            update={"quorum": QuorumPolicy(min_items=100, max_wait_seconds=0.1)}
+        )
+        result = await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+
+        assert timeline.index("analyze") < timeline.index("social:end")
+        assert any("0.1s elapsed" in log for log in result["execution_log"])
+
+    async def test_without_policy_waits_for_all_sources(
+        self, slow_social, checkpointer
+    ):
+        request, timeline, mocks = slow_social
+        await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+
+        assert timeline.index("social:end") < timeline.index("analyze")
+        assert mocks["SocialMediaAgent"].await_count == 1
+
+
+class TestResumeResearch:
+    async def test_resumes_from_failed_node(self, mocked_agents, checkpointer):
+        request, _, mocks = mocked_agents
+        synthesizer = mocks["ContentSynthesizerAgent"]
+        succeed = synthesizer.return_value
+        synthesizer.return_value = AgentResult(success=False, error="LLM timeout")
+
+        failed = await run_research(
+            {"request": request, "execution_log": []}, checkpointer=checkpointer
+        )
+        assert failed["error"]
+        run_id = failed["run_id"]
+
+        synthesizer.return_value = succeed
+        resumed = await resume_research(run_id, checkpointer=checkpointer)
+
+        assert resumed["current_step"] == "complete"
+        assert resumed["video_material"] is not None
+        assert resumed.get("error") is None
+        # 抓取與分析不會重新執行
+        assert mocks["NewsScraperAgent"].await_count == 1
+        assert mocks["SocialMediaAgent"].await_count == 1
+        assert mocks["DeepAnalyzerAgent"].await_count == 1
+        assert synthesizer.await_count == 2
+        assert resumed["total_sources_scraped"] == 3
+
+    async def test_completed_run_returns_saved_state(self, mocked_agents, checkpointer):
+        request, _, mocks = mocked_agents
+        result = await run_research(
+            {"request": request, "execution_log": []},
+            run_id="run-1",
+            checkpointer=checkpointer,
+        )
+        resumed = await resume_research("run-1", checkpointer=checkpointer)
+
+        assert resumed["video_material"] == result["video_material"]
+        assert mocks["ContentSynthesizerAgent"].await_count == 1
+
+    async def test_unknown_run_raises(self, checkpointer):
+        with pytest.raises(ValueError, match="找不到"):
+            await resume_research("missing", checkpointer=checkpointer)
+
+
+class TestStreamResearch:
+    async def test_yields_node_events_with_counts(self, mocked_agents, checkpointer):
+        request, _, _ = mocked_agents
+        events = [
+            event
+            async for event in stream_research(
+                {"request": request, "execution_log": []}, checkpointer=checkpointer
+            )
+        ]
+
+        kinds = [(e.kind, e.node) for e in events]
+        assert kinds[0] == ("node_start", "supervisor")
+        assert events[-1].kind == "run_end"
+        assert events[-1].state["video_material"] is not None
+
+        ends = {e.node: e for e in events if e.kind == "node_end"}
+        assert ends["news_scraper"].item_count == 1
+        assert ends["social_media"].item_count == 2
+        assert ends["news_scraper"].current_step == "news_scraped"
+        assert ends["news_scraper"].duration_ms >= 50
+        assert ends["supervisor"].item_count is None
+
+        # 並行抓取: 兩個抓取節點都在任一個結束前開始
+        start_news = kinds.index(("node_start", "news_scraper"))
+        start_social = kinds.index(("node_start", "social_media"))
+        first_end = min(
+            kinds.index(("node_end", "news_scraper")),
+            kinds.index(("node_end", "social_media")),
+        )
+        assert max(start_news, start_social) < first_end
+        assert kinds.index(("node_end", "social_media")) < kinds.index(
+            ("node_start", "deep_analyzer")
+        )
+
+    async def test_reports_node_error(self, mocked_agents, checkpointer):
+        request, _, mocks = mocked_agents
+        mocks["DeepAnalyzerAgent"].return_value = AgentResult(
+            success=False, error="AI 深度分析失敗"
+        )
+        events = [
+            event
+            async for event in stream_research(
+                {"request": request, "execution_log": []}, checkpointer=checkpointer
+            )
+        ]
+
+        analyzer_end = next(
+            e for e in events if e.kind == "node_end" and e.node == "deep_analyzer"
+        )
+        assert analyzer_end.error == "AI 深度分析失敗"
+        assert events[-1].error == "AI 深度分析失敗"
+
+    async def test_streams_synthesis_fields(
+        self, mocked_agents, checkpointer, sample_video_material
+    ):
+        request, _, _ = mocked_agents
+
+        def synthesizer(on_field=None):
+            async def run(*args, **kwargs):
+                on_field("title_suggestion", sample_video_material.title_suggestion)
+                on_field("hook_line", sample_video_material.hook_line)
+                return AgentResult(
+                    success=True,
+                    data=sample_video_material,
+                    metadata={
+                        "streamed": True,
+                        "time_to_first_field_ms": 5.0,
+                        "synthesis_ms": 20.0,
+                    },
+                )
+
+            return AsyncMock(side_effect=run)
+
+        with patch("src.graph.nodes.ContentSynthesizerAgent", side_effect=synthesizer):
+            events = [
+                event
+                async for event in stream_research(
+                    {"request": request, "execution_log": []},
+                    checkpointer=checkpointer,
+                )
+            ]
+
+        fields = [e for e in events if e.kind == "field"]
+        assert [e.field for e in fields] == ["title_suggestion", "hook_line"]
+        assert fields[0].node == "content_synthesizer"
+        assert fields[0].value == sample_video_material.title_suggestion
+        log = events[-1].state["execution_log"][-1]
+        assert "streamed, first field 5 ms / total 20 ms" in log
+
+    async def test_run_research_does_not_stream_fields(
+        self, mocked_agents, checkpointer, sample_video_material
+    ):
+        request, _, _ = mocked_agents
+        on_fields = []
+
+        def synthesizer(on_field=None):
+            on_fields.append(on_field)
+            return AsyncMock(
+                return_value=AgentResult(success=True, data=sample_video_material)
+            )
+
+        with patch("src.graph.nodes.ContentSynthesizerAgent", side_effect=synthesizer):
+            await run_research(
+                {"request": request, "execution_log": []}, checkpointer=checkpointer
+            )
+            async for _ in stream_research(
+                {"request": request, "execution_log": []}, checkpointer=checkpointer
+            ):
+                pass
+
+        assert on_fields[0] is None
+        assert callable(on_fields[1])
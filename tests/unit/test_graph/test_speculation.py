@@ -0,0 +1,216 @@
+"""推測性抓取測試"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agents.base import AgentResult
+from src.agents.news_scraper import (
+    NewsScraperAgent,
+    NewsScraperInput,
+    NewsScraperOutput,
+)
+from src.agents.supervisor import SubQueryPlan, SupervisorOutput
+from src.graph.nodes import news_scraper_node, supervisor_node
+from src.graph.speculation import (
+    SpeculativeScrape,
+    discard_speculation,
+    get_speculation,
+    merge_unique,
+    start_speculation,
+)
+from src.models.content import ContentItem, ResearchRequest
+
+
+def _item(url: str, source_type: str = "news") -> ContentItem:
+    return ContentItem(
+        title=f"AI {url}",
+        url=f"https://example.com/{url}",
+        content="AI content",
+        source_type=source_type,
+        source_name="Test",
+    )
+
+
+@pytest.fixture
+def request_model():
+    return ResearchRequest(topic="AI 趨勢", sources=["news", "social", "forum"])
+
+
+@pytest.fixture
+def fake_searches():
+    """以假資料取代推測性搜尋 (news 延遲 0.05 秒)"""
+
+    async def search_news(self):
+        await asyncio.sleep(0.05)
+        return [_item("spec-1"), _item("shared")]
+
+    async def search_forum(self):
+        return [_item("ptt-1", "forum")]
+
+    with (
+        patch.object(SpeculativeScrape, "_search_news", search_news),
+        patch.object(SpeculativeScrape, "_search_forum", search_forum),
+    ):
+        yield
+
+
+class TestMergeUnique:
+    def test_dedups_by_url_keeping_first(self):
+        first = _item("a")
+        merged = merge_unique([first, _item("b")], [_item("a"), _item("c")])
+        assert [str(i.url) for i in merged] == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+        assert merged[0] is first
+
+
+class TestSpeculativeScrape:
+    async def test_starts_only_selected_sources(self, fake_searches):
+        spec = SpeculativeScrape(ResearchRequest(topic="AI", sources=["news"]))
+        spec.start()
+        assert spec.active_sources == ["news"]
+        result = await spec.collect("news")
+        assert len(result.items) == 2
+        assert await spec.collect("forum") is None
+
+    async def test_resolve_cancels_unrecommended_sources(
+        self, request_model, fake_searches
+    ):
+        spec = SpeculativeScrape(request_model)
+        spec.start()
+        cancelled = spec.resolve(["AI 最新新聞"], ["Google News 新聞"])
+
+        assert cancelled == ["forum"]
+        assert spec.active_sources == ["news"]
+        assert await spec.collect("forum") is None
+        spec.cancel()
+
+    async def test_covered_queries_only_when_plan_contains_topic(
+        self, request_model, fake_searches
+    ):
+        spec = SpeculativeScrape(request_model)
+        spec.start()
+        spec.resolve(["AI 最新新聞"])
+        assert spec.covered_queries("news") == {}
+
+        spec.resolve(["ai  趨勢", "AI 最新新聞"])
+        assert spec.covered_queries("news") == {"google_news": ["ai  趨勢"]}
+        assert spec.covered_queries("forum") == {"ptt": ["ai  趨勢"]}
+        spec.cancel()
+
+    async def test_overlap_measures_time_before_plan(
+        self, request_model, fake_searches
+    ):
+        spec = SpeculativeScrape(request_model)
+        spec.start()
+        await asyncio.sleep(0.02)
+        spec.resolve(["AI 最新新聞"])
+        result = await spec.collect("news")
+
+        assert result.duration_ms >= 50
+        assert 15 <= result.overlap_ms < result.duration_ms
+
+    async def test_collect_reports_errors(self, request_model):
+        async def failing(self):
+            raise RuntimeError("rss down")
+
+        with patch.object(SpeculativeScrape, "_search_news", failing):
+            spec = SpeculativeScrape(ResearchRequest(topic="AI", sources=["news"]))
+            spec.start()
+            result = await spec.collect("news")
+
+        assert result.items == []
+        assert result.errors == ["rss down"]
+
+
+class TestRegistry:
+    async def test_start_get_discard(self, request_model, fake_searches):
+        spec = start_speculation("run-1", request_model)
+        assert get_speculation("run-1") is spec
+        discard_speculation("run-1")
+        assert get_speculation("run-1") is None
+
+    def test_no_speculative_sources(self):
+        request = ResearchRequest(topic="AI", sources=["social"])
+        assert start_speculation("run-2", request) is None
+        assert get_speculation(None) is None
+
+
+class TestSpeculativeNodes:
+    async def test_supervisor_and_news_nodes_use_speculation(
+        self, request_model, fake_searches
+    ):
+        plan = SubQueryPlan(
+            sub_queries=["AI 趨勢", "AI 最新新聞"],
+            search_strategy="test",
+            recommended_sources=["news"],
+        )
+        supervisor_result = AgentResult(
+            success=True,
+            data=SupervisorOutput(plan=plan, original_request=request_model),
+        )
+        news_result = AgentResult(
+            success=True,
+            data=NewsScraperOutput(
+                items=[_item("sub-1"), _item("shared")],
+                sources_used=["google_news"],
+            ),
+        )
+        state = {"request": request_model, "run_id": "run-spec"}
+
+        with (
+            patch("src.graph.nodes.settings.speculative_scraping", True),
+            patch("src.graph.nodes.SupervisorAgent") as MockSupervisor,
+            patch("src.graph.nodes.NewsScraperAgent") as MockNews,
+        ):
+            MockSupervisor.return_value = AsyncMock(return_value=supervisor_result)
+            mock_news = AsyncMock(return_value=news_result)
+            MockNews.return_value = mock_news
+
+            update = await supervisor_node(state)
+            state.update(update)
+            news_update = await news_scraper_node(state)
+
+        assert "cancelled ['forum']" in update["execution_log"][-1]
+        news_input = mock_news.await_args.args[0]
+        assert news_input.covered_queries == {"google_news": ["AI 趨勢"]}
+
+        urls = [str(i.url) for i in news_update["news_results"]]
+        assert urls == [
+            "https://example.com/sub-1",
+            "https://example.com/shared",
+            "https://example.com/spec-1",
+        ]
+        assert news_update["total_sources_scraped"] == 3
+        assert any("saved ~" in e for e in news_update["execution_log"])
+        discard_speculation("run-spec")
+
+    async def test_supervisor_failure_discards_speculation(
+        self, request_model, fake_searches
+    ):
+        state = {"request": request_model, "run_id": "run-fail"}
+        with (
+            patch("src.graph.nodes.settings.speculative_scraping", True),
+            patch("src.graph.nodes.SupervisorAgent") as MockSupervisor,
+        ):
+            MockSupervisor.return_value = AsyncMock(
+                return_value=AgentResult(success=False, error="boom")
+            )
+            await supervisor_node(state)
+
+        assert get_speculation("run-fail") is None
+
+
+class TestCoveredQueries:
+    async def test_news_agent_skips_google_for_covered_query(self):
+        agent = NewsScraperAgent()
+        agent._has_google = True
+        agent._newsapi_key = None
+        input_data = NewsScraperInput(
+            queries=["AI"], covered_queries={"google_news": ["AI"]}
+        )
+        assert agent._create_search_tasks("AI", input_data) == []
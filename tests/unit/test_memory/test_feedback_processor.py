@@ -26,6 +26,8 @@ def _make_mock_manager():
     manager = MagicMock()
     manager.store_correction = AsyncMock()
     manager.mark_feedback_processed = AsyncMock()
+    manager.store_corrections_many = AsyncMock()
+    manager.mark_feedback_processed_many = AsyncMock()
     manager.get_unprocessed_feedback = AsyncMock(return_value=[])
     return manager
 
@@ -70,6 +72,35 @@ class TestFeedbackProcessor:
         count = await processor.process_all_pending("user-1")
 
         assert count == 1
+        manager.store_corrections_many.assert_awaited_once()
+        manager.mark_feedback_processed_many.assert_awaited_once_with(["fb-1"])
+        manager.store_correction.assert_not_awaited()
+
+    async def test_process_all_pending_batches_only_successes(self):
+        ok = _make_sample_feedback()
+        bad = ok.model_copy(update={"feedback_id": "fb-2", "user_correction": "壞"})
+        manager = _make_mock_manager()
+        manager.get_unprocessed_feedback.return_value = [ok, bad]
+
+        extraction = CorrectionExtraction(
+            pattern="p", correction="c", context="ctx", confidence=0.5
+        )
+
+        async def invoke(prompt, config=None):
+            if "壞" in prompt:
+                raise RuntimeError("LLM error")
+            return extraction
+
+        llm = MagicMock()
+        llm.with_structured_output.return_value.ainvoke = AsyncMock(side_effect=invoke)
+
+        processor = FeedbackProcessor(memory_manager=manager, llm=llm)
+        count = await processor.process_all_pending("user-1")
+
+        assert count == 1
+        stored = manager.store_corrections_many.await_args.args[0]
+        assert [c.user_id for c in stored] == ["user-1"]
+        manager.mark_feedback_processed_many.assert_awaited_once_with(["fb-1"])
 
     async def test_process_all_pending_with_errors(self):
         feedback = _make_sample_feedback()
@@ -85,6 +116,7 @@ class TestFeedbackProcessor:
         count = await processor.process_all_pending("user-1")
 
         assert count == 0
+        manager.mark_feedback_processed_many.assert_not_awaited()
 
     async def test_process_empty_pending(self):
         manager = _make_mock_manager()
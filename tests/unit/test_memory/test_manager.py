@@ -31,10 +31,19 @@ def _make_mock_stores():
     sqlite.get_corrections = AsyncMock(return_value=[])
     sqlite.save_node = AsyncMock()
     sqlite.get_nodes = AsyncMock(return_value=[])
+    sqlite.find_nodes = AsyncMock(return_value=[])
+    sqlite.traverse = AsyncMock(return_value=[])
+    sqlite.get_users = AsyncMock(return_value={})
+    sqlite.save_feedback_many = AsyncMock()
+    sqlite.mark_feedback_processed_many = AsyncMock()
+    sqlite.save_corrections_many = AsyncMock()
+    sqlite.save_nodes_many = AsyncMock()
+    sqlite.save_edges_many = AsyncMock()
 
     vector = MagicMock()
     vector.initialize = AsyncMock()
     vector.store_correction = AsyncMock()
+    vector.store_corrections_many = AsyncMock()
     vector.search_corrections = AsyncMock(return_value=[])
     vector.search_conversations = AsyncMock(return_value=[])
     vector.delete_user_data = AsyncMock()
@@ -144,6 +153,56 @@ class TestFeedbackManagement:
         sqlite.mark_feedback_processed.assert_awaited_once_with("fb-1")
 
 
+class TestBulkOperations:
+    async def test_get_users_queries_only_cache_misses(self):
+        sqlite, vector = _make_mock_stores()
+        sqlite.get_users.return_value = {"u2": UserProfile(user_id="u2")}
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+        await manager.get_or_create_user("u1")
+
+        users = await manager.get_users(["u1", "u2", "u3"])
+
+        assert set(users) == {"u1", "u2"}
+        sqlite.get_users.assert_awaited_once_with(["u2", "u3"])
+        await manager.get_users(["u2"])
+        assert sqlite.get_users.await_count == 1
+
+    async def test_store_corrections_many(self):
+        sqlite, vector = _make_mock_stores()
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+        corrections = [
+            LearnedCorrection(
+                correction_id=f"c-{i}",
+                user_id="user-1",
+                pattern="p",
+                correction="c",
+                context="ctx",
+            )
+            for i in range(2)
+        ]
+
+        await manager.store_corrections_many(corrections)
+
+        sqlite.save_corrections_many.assert_awaited_once_with(corrections)
+        vector.store_corrections_many.assert_awaited_once_with(corrections)
+        vector.store_correction.assert_not_awaited()
+
+    async def test_bulk_delegates(self):
+        sqlite, vector = _make_mock_stores()
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+
+        await manager.mark_feedback_processed_many(["fb-1", "fb-2"])
+        await manager.save_knowledge_nodes([])
+        await manager.save_knowledge_edges([])
+
+        sqlite.mark_feedback_processed_many.assert_awaited_once_with(["fb-1", "fb-2"])
+        sqlite.save_nodes_many.assert_awaited_once_with([])
+        sqlite.save_edges_many.assert_awaited_once_with([])
+
+
 class TestCorrectionManagement:
     async def test_store_correction(self):
         sqlite, vector = _make_mock_stores()
@@ -191,7 +250,7 @@ class TestTopicContext:
             },
         )
         sqlite.get_user.return_value = profile
-        sqlite.get_nodes.return_value = [
+        sqlite.find_nodes.return_value = [
             KnowledgeNode(
                 node_id="n1",
                 user_id="user-1",
@@ -209,6 +268,8 @@ class TestTopicContext:
         assert ctx["topic_preference"]["interest_level"] == 0.9
         assert len(ctx["related_knowledge"]) == 1
         assert len(ctx["related_conversations"]) == 1
+        sqlite.find_nodes.assert_awaited_once_with("user-1", "AI", NodeType.TOPIC)
+        sqlite.get_nodes.assert_not_awaited()
 
     async def test_update_topic_preference(self):
         sqlite, vector = _make_mock_stores()
@@ -236,6 +297,23 @@ class TestKnowledgeGraph:
         await manager.save_knowledge_node(node)
         sqlite.save_node.assert_awaited_once_with(node)
 
+    async def test_get_related_knowledge(self):
+        sqlite, vector = _make_mock_stores()
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+
+        await manager.get_related_knowledge(
+            "user-1", "n1", max_depth=3, relation_types=["related_to"]
+        )
+        sqlite.traverse.assert_awaited_once_with(
+            "user-1",
+            "n1",
+            max_depth=3,
+            relation_types=["related_to"],
+            min_weight=0.0,
+            limit=None,
+        )
+
 
 class TestGDPR:
     async def test_export_user_data(self):
@@ -265,3 +343,49 @@ class TestGDPR:
         assert result is True
         sqlite.delete_user.assert_awaited_once_with("user-del")
         vector.delete_user_data.assert_awaited_once_with("user-del")
+
+
+class TestDataVersion:
+    async def test_personalization_writes_bump_version(self):
+        sqlite, vector = _make_mock_stores()
+        sqlite.get_user.return_value = UserProfile(user_id="user-1")
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+        correction = LearnedCorrection(
+            correction_id="c1",
+            user_id="user-1",
+            pattern="p",
+            correction="c",
+            context="x",
+        )
+        node = KnowledgeNode(
+            node_id="n1", user_id="user-1", node_type=NodeType.TOPIC, name="AI"
+        )
+
+        versions = [manager.data_version("user-1")]
+        await manager.update_user_profile(UserProfile(user_id="user-1"))
+        versions.append(manager.data_version("user-1"))
+        await manager.update_topic_preference("user-1", "AI", 0.9)
+        versions.append(manager.data_version("user-1"))
+        await manager.store_correction(correction)
+        versions.append(manager.data_version("user-1"))
+        await manager.store_corrections_many([correction, correction])
+        versions.append(manager.data_version("user-1"))
+        await manager.save_knowledge_node(node)
+        versions.append(manager.data_version("user-1"))
+        await manager.save_knowledge_nodes([node])
+        versions.append(manager.data_version("user-1"))
+
+        assert versions == [0, 1, 2, 3, 4, 5, 6]
+        assert manager.data_version("user-2") == 0
+
+    async def test_reads_do_not_bump_version(self):
+        sqlite, vector = _make_mock_stores()
+        manager = MemoryManager(sqlite_store=sqlite, vector_store=vector)
+        await manager.initialize()
+
+        await manager.get_or_create_user("user-1")
+        await manager.get_topic_context("user-1", "AI")
+        await manager.get_relevant_corrections("user-1", "AI")
+
+        assert manager.data_version("user-1") == 0
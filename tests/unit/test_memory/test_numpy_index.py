@@ -0,0 +1,155 @@
+"""NumpyIndex 測試"""
+
+import numpy as np
+import pytest
+
+from src.memory.storage import numpy_index
+from src.memory.storage.numpy_index import NumpyIndex, NumpyIndexClient
+
+
+def _upsert(index: NumpyIndex, ids: list[str], vectors: list[list[float]]) -> None:
+    index.upsert(
+        ids=ids,
+        embeddings=vectors,
+        documents=[f"doc-{i}" for i in ids],
+        metadatas=[{"id": i} for i in ids],
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    return NumpyIndex(tmp_path / "user-1_corrections")
+
+
+class TestNumpyIndex:
+    def test_query_ranks_by_cosine_similarity(self, index):
+        _upsert(index, ["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+
+        result = index.query(query_embeddings=[[2, 0]], n_results=2)
+
+        assert result["ids"] == [["a", "c"]]
+        assert result["documents"] == [["doc-a", "doc-c"]]
+        assert result["metadatas"] == [[{"id": "a"}, {"id": "c"}]]
+        assert result["distances"][0] == pytest.approx([0.0, 1 - 2**-0.5])
+
+    def test_include_limits_fields(self, index):
+        _upsert(index, ["a"], [[1, 0]])
+
+        result = index.query(
+            query_embeddings=[[1, 0]], n_results=5, include=["metadatas"]
+        )
+
+        assert result["metadatas"] == [[{"id": "a"}]]
+        assert result["documents"] is None
+        assert result["distances"] is None
+
+    def test_upsert_replaces_existing_id(self, index):
+        _upsert(index, ["a", "b"], [[1, 0], [0, 1]])
+        _upsert(index, ["a"], [[0, 1]])
+
+        assert index.count() == 2
+        result = index.query(query_embeddings=[[1, 0]], n_results=5)
+        assert sorted(result["ids"][0]) == ["a", "b"]
+        assert result["distances"][0] == pytest.approx([1.0, 1.0])
+
+    def test_grows_and_persists(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(numpy_index, "_INITIAL_CAPACITY", 4)
+        path = tmp_path / "c"
+        index = NumpyIndex(path)
+        vectors = np.eye(10).tolist()
+        for i in range(10):
+            _upsert(index, [str(i)], [vectors[i]])
+
+        reopened = NumpyIndex(path)
+        assert reopened.count() == 10
+        assert reopened.query(query_embeddings=[vectors[7]], n_results=1)["ids"] == [
+            ["7"]
+        ]
+        assert np.load(path / "vectors-0.npy", mmap_mode="r").shape == (16, 10)
+
+    def test_compacts_dead_rows(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(numpy_index, "_COMPACT_MIN_DEAD", 4)
+        path = tmp_path / "c"
+        index = NumpyIndex(path)
+        for i in range(5):
+            _upsert(index, ["a", "b"], [[1, i], [i, 1]])
+
+        # 第 3 次與第 5 次寫入後失效列 (4) 超過有效列 (2)，各壓縮一次
+        assert index._size == 2
+        assert sorted(p.name for p in path.iterdir()) == [
+            "manifest.json",
+            "records-2.jsonl",
+            "vectors-2.npy",
+        ]
+        lines = (path / "records-2.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+
+        reopened = NumpyIndex(path)
+        result = reopened.query(query_embeddings=[[1, 0]], n_results=5)
+        assert result["ids"] == [["b", "a"]]
+
+    def test_crash_during_compaction_keeps_previous_generation(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(numpy_index, "_COMPACT_MIN_DEAD", 4)
+        path = tmp_path / "c"
+        index = NumpyIndex(path)
+        _upsert(index, ["a", "b"], [[1, 0], [0, 1]])
+        _upsert(index, ["a", "b"], [[1, 0], [0, 1]])
+
+        # 新 generation 的檔案已寫出，但 manifest 尚未切換
+        def crash() -> None:
+            raise OSError("crash")
+
+        monkeypatch.setattr(index, "_write_manifest", crash)
+        with pytest.raises(OSError):
+            _upsert(index, ["a", "b"], [[1, 0], [0, 1]])
+
+        reopened = NumpyIndex(path)
+        assert reopened._generation == 0
+        assert reopened.count() == 2
+        result = reopened.query(query_embeddings=[[0, 1]], n_results=2)
+        assert result["ids"] == [["b", "a"]]
+        assert result["metadatas"] == [[{"id": "b"}, {"id": "a"}]]
+        assert result["distances"][0] == pytest.approx([0.0, 1.0])
+
+    def test_torn_record_is_truncated_before_next_append(self, tmp_path):
+        path = tmp_path / "c"
+        _upsert(NumpyIndex(path), ["a", "b"], [[1, 0], [0, 1]])
+        records = path / "records-0.jsonl"
+        records.write_bytes(records.read_bytes()[:-5])
+
+        reopened = NumpyIndex(path)
+        assert reopened.count() == 1
+        _upsert(reopened, ["c"], [[1, 1]])
+
+        final = NumpyIndex(path)
+        assert final.count() == 2
+        result = final.query(query_embeddings=[[1, 1]], n_results=5)
+        assert sorted(result["ids"][0]) == ["a", "c"]
+        assert result["ids"][0][0] == "c"
+        assert result["metadatas"][0][0] == {"id": "c"}
+
+    def test_dimension_mismatch(self, index):
+        _upsert(index, ["a"], [[1, 0]])
+        with pytest.raises(ValueError, match="維度"):
+            _upsert(index, ["b"], [[1, 0, 0]])
+
+
+class TestNumpyIndexClient:
+    def test_get_or_create_reuses_index(self, tmp_path):
+        client = NumpyIndexClient(tmp_path)
+        assert client.get_or_create_collection("x") is client.get_or_create_collection(
+            "x"
+        )
+
+    def test_delete_collection(self, tmp_path):
+        client = NumpyIndexClient(tmp_path)
+        _upsert(client.get_or_create_collection("x"), ["a"], [[1, 0]])
+
+        client.delete_collection("x")
+
+        assert not (tmp_path / "x").exists()
+        assert client.get_or_create_collection("x").count() == 0
+        with pytest.raises(ValueError):
+            client.delete_collection("missing")
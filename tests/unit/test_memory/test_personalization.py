@@ -25,6 +25,7 @@ def _make_mock_manager(profile=None, corrections=None, topic_context=None):
             "analysis_depth": "standard",
         }
     )
+    manager.data_version = MagicMock(return_value=0)
     return manager
 
 
@@ -101,3 +102,65 @@ class TestPersonalizationEngine:
 
         assert "避免引用的來源" in result
         assert "unreliable_source" in result
+
+
+class TestPromptCache:
+    async def test_cached_per_normalized_input(self):
+        manager = _make_mock_manager()
+        engine = PersonalizationEngine(manager)
+
+        first = await engine.get_personalized_prompt(
+            "user-1", "base", "AI 晶片", "deep_analyzer"
+        )
+        second = await engine.get_personalized_prompt(
+            "user-1", "其他 prompt", "  ai   晶片 ", "deep_analyzer"
+        )
+
+        assert manager.get_or_create_user.await_count == 1
+        assert manager.get_relevant_corrections.await_count == 1
+        assert second == first.replace("base", "其他 prompt", 1)
+
+    async def test_keyed_on_user_and_agent(self):
+        manager = _make_mock_manager()
+        engine = PersonalizationEngine(manager)
+
+        await engine.get_personalized_prompt("user-1", "base", "AI", "deep_analyzer")
+        await engine.get_personalized_prompt("user-1", "base", "AI", "news_scraper")
+        await engine.get_personalized_prompt("user-2", "base", "AI", "deep_analyzer")
+
+        assert manager.get_or_create_user.await_count == 3
+
+    async def test_version_bump_invalidates(self):
+        manager = _make_mock_manager()
+        engine = PersonalizationEngine(manager)
+        await engine.get_personalized_prompt("user-1", "base", "AI", "deep_analyzer")
+
+        manager.data_version.return_value = 1
+        manager.get_relevant_corrections.return_value = [
+            {"pattern": "新模式", "correction": "新修正", "context": "AI"}
+        ]
+        result = await engine.get_personalized_prompt(
+            "user-1", "base", "AI", "deep_analyzer"
+        )
+
+        assert "新修正" in result
+        assert manager.get_or_create_user.await_count == 2
+
+    async def test_lru_eviction(self):
+        manager = _make_mock_manager()
+        engine = PersonalizationEngine(manager, cache_entries=1)
+
+        await engine.get_personalized_prompt("user-1", "base", "AI", "a")
+        await engine.get_personalized_prompt("user-1", "base", "AI", "b")
+        await engine.get_personalized_prompt("user-1", "base", "AI", "a")
+
+        assert manager.get_or_create_user.await_count == 3
+
+    async def test_disabled(self):
+        manager = _make_mock_manager()
+        engine = PersonalizationEngine(manager, cache_entries=0)
+
+        await engine.get_personalized_prompt("user-1", "base", "AI", "a")
+        await engine.get_personalized_prompt("user-1", "base", "AI", "a")
+
+        assert manager.get_or_create_user.await_count == 2
@@ -1,5 +1,8 @@
 """SQLiteStore 測試"""
 
+import asyncio
+import sqlite3
+
 import pytest
 
 from src.memory.models.feedback import FeedbackType, UserFeedback
@@ -17,6 +20,35 @@ async def sqlite_store():
     await store.close()
 
 
+def _feedback(feedback_id: str, user_id: str = "test-1") -> UserFeedback:
+    return UserFeedback(
+        feedback_id=feedback_id,
+        user_id=user_id,
+        session_id="sess-1",
+        original_content="原始內容",
+        original_analysis="原始分析",
+        agent_type="deep_analyzer",
+        feedback_type=FeedbackType.CORRECTION,
+        user_correction="修正內容",
+    )
+
+
+def _committed_feedback_ids(db_path) -> list[str]:
+    """以獨立連線讀取已提交的反饋 ID"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT feedback_id FROM feedback ORDER BY feedback_id")
+        return [row[0] for row in rows]
+
+
+@pytest.fixture
+async def file_store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "memory.db"), commit_interval_ms=0)
+    await store.initialize()
+    await store.create_user(UserProfile(user_id="test-1"))
+    yield store
+    await store.close()
+
+
 class TestUserCRUD:
     async def test_create_and_get_user(self, sqlite_store):
         profile = UserProfile(user_id="test-1")
@@ -194,3 +226,397 @@ class TestKnowledgeGraph:
         node, relation = related[0]
         assert node.name == "Sam Altman"
         assert relation == "related_person"
+
+
+def _topic(node_id: str, name: str, node_type: NodeType = NodeType.TOPIC):
+    return KnowledgeNode(
+        node_id=node_id, user_id="test-1", node_type=node_type, name=name
+    )
+
+
+def _edge(edge_id: str, source: str, target: str, relation: str, weight: float):
+    return KnowledgeEdge(
+        edge_id=edge_id,
+        user_id="test-1",
+        source_node_id=source,
+        target_node_id=target,
+        relation_type=relation,
+        weight=weight,
+    )
+
+
+class TestFindNodes:
+    @pytest.fixture
+    async def graph_store(self, sqlite_store):
+        await sqlite_store.create_user(UserProfile(user_id="test-1"))
+        await sqlite_store.save_nodes_many(
+            [
+                _topic("n1", "生成式 AI 應用"),
+                _topic("n2", "ＡＩ"),
+                _topic("n3", "AI 晶片"),
+                _topic("n4", "台積電先進製程"),
+                _topic("n5", "OpenAI", NodeType.ORGANIZATION),
+                _topic("n6", "100%_再生能源"),
+            ]
+        )
+        return sqlite_store
+
+    async def test_exact_then_prefix_then_substring(self, graph_store):
+        results = await graph_store.find_nodes("test-1", "ai", NodeType.TOPIC)
+        # 全形 ＡＩ 正規化後完全相符，其次前綴，最後子字串
+        assert [n.node_id for n in results] == ["n2", "n3", "n1"]
+
+    async def test_cjk_substring_uses_fts(self, graph_store):
+        assert graph_store._fts_enabled
+        results = await graph_store.find_nodes("test-1", "先進製程")
+        assert [n.name for n in results] == ["台積電先進製程"]
+
+    async def test_short_query_and_type_filter(self, graph_store):
+        results = await graph_store.find_nodes("test-1", "AI", limit=2)
+        assert [n.node_id for n in results] == ["n2", "n3"]
+        orgs = await graph_store.find_nodes("test-1", "openai", NodeType.ORGANIZATION)
+        assert [n.node_id for n in orgs] == ["n5"]
+
+    async def test_like_wildcards_are_literal(self, graph_store):
+        assert [n.node_id for n in await graph_store.find_nodes("test-1", "%_")] == [
+            "n6"
+        ]
+        assert await graph_store.find_nodes("test-1", "_") != []
+        assert await graph_store.find_nodes("test-1", "   ") == []
+        assert await graph_store.find_nodes("other-user", "AI") == []
+
+    async def test_fts_follows_updates_and_deletes(self, graph_store):
+        await graph_store.save_node(_topic("n4", "聯發科天璣晶片"))
+        assert await graph_store.find_nodes("test-1", "先進製程") == []
+        assert [
+            n.node_id for n in await graph_store.find_nodes("test-1", "天璣晶片")
+        ] == ["n4"]
+
+        await graph_store.delete_user("test-1")
+        assert await graph_store.find_nodes("test-1", "天璣晶片") == []
+
+    async def test_short_query_uses_composite_index(self, graph_store):
+        async with graph_store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM knowledge_nodes "
+            "WHERE user_id = ? AND node_type = ? AND name_norm LIKE ?",
+            ("test-1", "topic", "%ai%"),
+        ) as cursor:
+            plan = " ".join(row["detail"] for row in await cursor.fetchall())
+        assert "idx_nodes_user_type_name" in plan
+
+    async def test_migrates_existing_database(self, tmp_path):
+        db_path = tmp_path / "old.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                """CREATE TABLE users (user_id TEXT PRIMARY KEY, profile_json TEXT);
+                CREATE TABLE knowledge_nodes (
+                    node_id TEXT PRIMARY KEY, user_id TEXT NOT NULL,
+                    node_type TEXT NOT NULL, name TEXT NOT NULL, description TEXT,
+                    user_sentiment REAL DEFAULT 0.0, user_notes TEXT,
+                    interaction_count INTEGER DEFAULT 0, embedding_key TEXT,
+                    created_at TIMESTAMP, updated_at TIMESTAMP);
+                INSERT INTO knowledge_nodes (node_id, user_id, node_type, name)
+                VALUES ('old-1', 'test-1', 'topic', '電動車 Battery');"""
+            )
+
+        store = SQLiteStore(str(db_path))
+        await store.initialize()
+        try:
+            results = await store.find_nodes("test-1", "battery", NodeType.TOPIC)
+            assert [n.node_id for n in results] == ["old-1"]
+            assert [n.node_id for n in await store.find_nodes("test-1", "電動車")] == [
+                "old-1"
+            ]
+        finally:
+            await store.close()
+
+
+class TestTraversal:
+    @pytest.fixture(params=[False, True], ids=["cte", "adjacency_cache"])
+    async def graph_store(self, request):
+        store = SQLiteStore(":memory:", adjacency_cache=request.param)
+        await store.initialize()
+        await store.create_user(UserProfile(user_id="test-1"))
+        await store.save_nodes_many([_topic(f"n{i}", f"T{i}") for i in range(4)])
+        await store.save_edges_many(
+            [
+                _edge("e1", "n0", "n1", "related_to", 0.9),
+                _edge("e2", "n1", "n2", "related_to", 0.5),
+                _edge("e3", "n0", "n2", "mentions", 0.3),
+                _edge("e4", "n2", "n0", "related_to", 0.8),
+                _edge("e5", "n1", "n3", "related_person", 0.2),
+            ]
+        )
+        yield store
+        await store.close()
+
+    async def test_multi_hop_paths_with_weights(self, graph_store):
+        paths = await graph_store.traverse("test-1", "n0", max_depth=2)
+
+        assert [p.node_ids for p in paths] == [
+            ["n0", "n1"],
+            ["n0", "n1", "n2"],
+            ["n0", "n2"],
+            ["n0", "n1", "n3"],
+        ]
+        assert [p.weight for p in paths] == pytest.approx([0.9, 0.45, 0.3, 0.18])
+        assert paths[1].relations == ["related_to", "related_to"]
+        assert paths[1].depth == 2
+        assert paths[1].node.name == "T2"
+
+    async def test_filters(self, graph_store):
+        shallow = await graph_store.traverse("test-1", "n0", max_depth=1)
+        assert [p.node_ids for p in shallow] == [["n0", "n1"], ["n0", "n2"]]
+
+        strong = await graph_store.traverse("test-1", "n0", min_weight=0.4)
+        assert [p.node_ids for p in strong] == [["n0", "n1"], ["n0", "n1", "n2"]]
+
+        related = await graph_store.traverse(
+            "test-1", "n0", max_depth=3, relation_types=["related_to"], limit=1
+        )
+        assert [p.node_ids for p in related] == [["n0", "n1"]]
+        assert await graph_store.traverse("test-1", "n0", relation_types=[]) == []
+        assert await graph_store.traverse("other-user", "n0") == []
+
+    async def test_new_edges_are_visible(self, graph_store):
+        await graph_store.traverse("test-1", "n0")
+        await graph_store.save_edge(_edge("e6", "n0", "n3", "related_person", 1.0))
+
+        paths = await graph_store.traverse("test-1", "n0", max_depth=1)
+        assert paths[0].node_ids == ["n0", "n3"]
+
+    async def test_edge_saved_during_adjacency_load_is_visible(
+        self, graph_store, monkeypatch
+    ):
+        if not graph_store._adjacency_enabled:
+            pytest.skip("只適用鄰接表快取")
+
+        # 讓鄰接表查詢讀完資料列後暫停，期間寫入新的邊
+        loaded, resume = asyncio.Event(), asyncio.Event()
+        execute = graph_store._conn.execute
+
+        class _PausedQuery:
+            def __init__(self, query):
+                self._query = query
+
+            async def __aenter__(self):
+                async with self._query as cursor:
+                    rows = await cursor.fetchall()
+                loaded.set()
+                await resume.wait()
+                return _aiter(rows)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        async def _aiter(rows):
+            for row in rows:
+                yield row
+
+        def paused_execute(sql, *args):
+            query = execute(sql, *args)
+            return _PausedQuery(query) if "FROM knowledge_edges" in sql else query
+
+        monkeypatch.setattr(graph_store._conn, "execute", paused_execute)
+        task = asyncio.create_task(graph_store.traverse("test-1", "n0", max_depth=1))
+        await loaded.wait()
+        await graph_store.save_edge(_edge("e6", "n0", "n3", "related_person", 1.0))
+        resume.set()
+        await task
+        monkeypatch.undo()
+
+        paths = await graph_store.traverse("test-1", "n0", max_depth=1)
+        assert paths[0].node_ids == ["n0", "n3"]
+
+    async def test_rolled_back_edges_are_dropped_from_cache(self, graph_store):
+        with pytest.raises(RuntimeError):
+            async with graph_store.transaction():
+                await graph_store.save_edge(_edge("e6", "n0", "n3", "x", 1.0))
+                assert len(await graph_store.traverse("test-1", "n0", 1)) == 3
+                raise RuntimeError("boom")
+
+        assert len(await graph_store.traverse("test-1", "n0", 1)) == 2
+
+    async def test_edge_lookup_uses_source_index(self, graph_store):
+        async with graph_store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM knowledge_edges WHERE source_node_id = ?",
+            ("n0",),
+        ) as cursor:
+            plan = " ".join(row["detail"] for row in await cursor.fetchall())
+        assert "idx_edges_source" in plan
+
+
+class TestTransactions:
+    async def test_wal_and_synchronous(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / "memory.db"), synchronous="NORMAL")
+        await store.initialize()
+        async with store._conn.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        async with store._conn.execute("PRAGMA synchronous") as cursor:
+            assert (await cursor.fetchone())[0] == 1
+        await store.close()
+
+    async def test_commits_once_at_end(self, file_store, tmp_path):
+        db_path = tmp_path / "memory.db"
+        async with file_store.transaction():
+            await file_store.save_feedback(_feedback("fb-1"))
+            await file_store.save_feedback(_feedback("fb-2"))
+            assert _committed_feedback_ids(db_path) == []
+
+        assert _committed_feedback_ids(db_path) == ["fb-1", "fb-2"]
+
+    async def test_rolls_back_on_error(self, file_store):
+        with pytest.raises(RuntimeError):
+            async with file_store.transaction():
+                await file_store.save_feedback(_feedback("fb-1"))
+                async with file_store.transaction():  # 巢狀併入外層
+                    await file_store.save_feedback(_feedback("fb-2"))
+                raise RuntimeError("boom")
+
+        assert await file_store.get_unprocessed_feedback("test-1") == []
+
+    async def test_other_writers_wait_for_transaction(self, file_store):
+        started = asyncio.Event()
+
+        async def failing_batch():
+            async with file_store.transaction():
+                await file_store.save_feedback(_feedback("fb-1"))
+                started.set()
+                await asyncio.sleep(0.02)
+                raise RuntimeError("boom")
+
+        batch = asyncio.create_task(failing_batch())
+        await started.wait()
+        await file_store.save_feedback(_feedback("fb-2"))
+
+        with pytest.raises(RuntimeError):
+            await batch
+        remaining = await file_store.get_unprocessed_feedback("test-1")
+        assert [f.feedback_id for f in remaining] == ["fb-2"]
+
+
+class TestCommitCoalescing:
+    async def test_flushes_after_interval(self, tmp_path):
+        db_path = tmp_path / "memory.db"
+        store = SQLiteStore(str(db_path), commit_interval_ms=20)
+        await store.initialize()
+        await store.create_user(UserProfile(user_id="test-1"))
+        await store.save_feedback(_feedback("fb-1"))
+        await store.save_feedback(_feedback("fb-2"))
+
+        assert _committed_feedback_ids(db_path) == []
+        assert len(await store.get_unprocessed_feedback("test-1")) == 2
+
+        await asyncio.sleep(0.1)
+        assert _committed_feedback_ids(db_path) == ["fb-1", "fb-2"]
+        await store.close()
+
+    async def test_close_flushes_pending_writes(self, tmp_path):
+        db_path = tmp_path / "memory.db"
+        store = SQLiteStore(str(db_path), commit_interval_ms=60_000)
+        await store.initialize()
+        await store.create_user(UserProfile(user_id="test-1"))
+        await store.save_feedback(_feedback("fb-1"))
+
+        await store.close()
+        assert _committed_feedback_ids(db_path) == ["fb-1"]
+
+    async def test_transaction_keeps_pending_writes_on_rollback(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / "memory.db"), commit_interval_ms=60_000)
+        await store.initialize()
+        await store.create_user(UserProfile(user_id="test-1"))
+        await store.save_feedback(_feedback("fb-1"))
+
+        with pytest.raises(RuntimeError):
+            async with store.transaction():
+                await store.save_feedback(_feedback("fb-2"))
+                raise RuntimeError("boom")
+
+        remaining = await store.get_unprocessed_feedback("test-1")
+        assert [f.feedback_id for f in remaining] == ["fb-1"]
+        await store.close()
+
+
+class TestBulkOperations:
+    async def test_save_feedback_many_and_mark_processed(self, file_store, tmp_path):
+        await file_store.save_feedback_many([_feedback(f"fb-{i}") for i in range(3)])
+        assert _committed_feedback_ids(tmp_path / "memory.db") == [
+            "fb-0",
+            "fb-1",
+            "fb-2",
+        ]
+
+        await file_store.mark_feedback_processed_many(["fb-0", "fb-2"])
+        remaining = await file_store.get_unprocessed_feedback("test-1")
+        assert [f.feedback_id for f in remaining] == ["fb-1"]
+
+        fetched = await file_store.get_feedback_by_ids(["fb-2", "missing", "fb-0"])
+        assert [f.feedback_id for f in fetched] == ["fb-2", "fb-0"]
+        assert all(f.processed for f in fetched)
+
+    async def test_failed_batch_is_rolled_back(self, file_store):
+        duplicate = [_feedback("fb-1"), _feedback("fb-1")]
+        with pytest.raises(sqlite3.IntegrityError):
+            await file_store.save_feedback_many(duplicate)
+        assert await file_store.get_unprocessed_feedback("test-1") == []
+
+    async def test_corrections_many(self, sqlite_store):
+        await sqlite_store.create_user(UserProfile(user_id="test-1"))
+        corrections = [
+            LearnedCorrection(
+                correction_id=f"corr-{i}",
+                user_id="test-1",
+                pattern=f"p{i}",
+                correction="c",
+                context="ctx",
+            )
+            for i in range(3)
+        ]
+        await sqlite_store.save_corrections_many(corrections)
+
+        fetched = await sqlite_store.get_corrections_by_ids(["corr-2", "corr-0"])
+        assert [c.pattern for c in fetched] == ["p2", "p0"]
+
+    async def test_nodes_and_edges_many(self, sqlite_store):
+        await sqlite_store.create_user(UserProfile(user_id="test-1"))
+        nodes = [
+            KnowledgeNode(
+                node_id=f"n{i}",
+                user_id="test-1",
+                node_type=NodeType.TOPIC,
+                name=f"T{i}",
+            )
+            for i in range(3)
+        ]
+        await sqlite_store.save_nodes_many(nodes)
+        await sqlite_store.save_edges_many(
+            [
+                KnowledgeEdge(
+                    edge_id=f"e{i}",
+                    user_id="test-1",
+                    source_node_id="n0",
+                    target_node_id=f"n{i}",
+                    relation_type="related_to",
+                )
+                for i in (1, 2)
+            ]
+        )
+
+        fetched = await sqlite_store.get_nodes_by_ids(["n1", "n0", "n1"])
+        assert [n.node_id for n in fetched] == ["n1", "n0"]
+        related = await sqlite_store.get_related_nodes("n0")
+        assert sorted(n.name for n, _ in related) == ["T1", "T2"]
+
+    async def test_get_users_in_batches(self, sqlite_store, monkeypatch):
+        monkeypatch.setattr("src.memory.storage.sqlite_store._ID_BATCH_SIZE", 2)
+        for i in range(5):
+            await sqlite_store.create_user(UserProfile(user_id=f"u{i}"))
+
+        users = await sqlite_store.get_users(["u4", "u0", "u2", "missing", "u3"])
+        assert list(users) == ["u4", "u0", "u2", "u3"]
+        assert await sqlite_store.get_users([]) == {}
+
+    async def test_empty_batches_are_noops(self, sqlite_store):
+        await sqlite_store.save_feedback_many([])
+        await sqlite_store.save_nodes_many([])
+        await sqlite_store.mark_feedback_processed_many([])
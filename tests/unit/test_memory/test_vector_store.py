@@ -0,0 +1,242 @@
+"""VectorStore 測試"""
+
+import asyncio
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from src.memory.models.learned_correction import LearnedCorrection
+from src.memory.storage.vector_store import VectorStore
+from src.utils.embedding_cache import EmbeddingCache
+
+
+class FakeEmbeddings:
+    """以文字雜湊產生固定向量，並記錄呼叫次數"""
+
+    model = "fake-embedding"
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls.append(text)
+        return self._vector(text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        self.calls.extend(texts)
+        return [self._vector(t) for t in texts]
+
+    @staticmethod
+    def _vector(text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode()).digest()
+        return [b / 255 for b in digest[:8]]
+
+
+def _correction(
+    correction_id: str = "c1", user_id: str = "user-1"
+) -> LearnedCorrection:
+    return LearnedCorrection(
+        correction_id=correction_id,
+        user_id=user_id,
+        pattern=f"把台積電說成聯電 {correction_id}",
+        correction="應為台積電",
+        context="半導體新聞",
+    )
+
+
+@pytest.fixture
+async def vector_store(tmp_path, monkeypatch):
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(
+        "src.memory.storage.vector_store.create_embedding_model", lambda: embeddings
+    )
+    store = VectorStore(
+        str(tmp_path / "vectors"),
+        embedding_cache=EmbeddingCache(tmp_path / "embeddings.db"),
+    )
+    await store.initialize()
+    return store
+
+
+class TestEmbeddingReuse:
+    async def test_same_query_embedded_once(self, vector_store):
+        await vector_store.store_correction("user-1", _correction())
+        await vector_store.store_conversation("user-1", "s1", "聊到台積電")
+
+        await vector_store.search_corrections("user-1", "台積電")
+        await vector_store.search_conversations("user-1", "台積電")
+
+        assert vector_store._embedding_fn.calls.count("台積電") == 1
+        assert vector_store._embedding_cache.stats()["memory_hits"] == 1
+
+    async def test_restoring_unchanged_correction_hits_cache(self, vector_store):
+        await vector_store.store_correction("user-1", _correction())
+        await vector_store.store_correction("user-1", _correction())
+
+        assert len(vector_store._embedding_fn.calls) == 1
+        results = await vector_store.search_corrections("user-1", "台積電")
+        assert [r["correction_id"] for r in results] == ["c1"]
+
+    async def test_without_cache(self, tmp_path, monkeypatch):
+        embeddings = FakeEmbeddings()
+        monkeypatch.setattr(
+            "src.memory.storage.vector_store.create_embedding_model", lambda: embeddings
+        )
+        monkeypatch.setattr(
+            "src.memory.storage.vector_store.settings.embedding_cache_enabled", False
+        )
+        store = VectorStore(str(tmp_path / "vectors"))
+        await store.initialize()
+
+        await store.store_correction("user-1", _correction())
+        await store.store_correction("user-1", _correction())
+        assert len(embeddings.calls) == 2
+
+
+class TestBatchedWrites:
+    async def test_store_corrections_many_batches(self, vector_store, monkeypatch):
+        monkeypatch.setattr(
+            "src.memory.storage.vector_store.settings.embedding_batch_size", 2
+        )
+        collection = vector_store._get_collection("user-1", "corrections")
+        upsert = collection.upsert
+        upserts: list[int] = []
+
+        def counting_upsert(**kwargs):
+            upserts.append(len(kwargs["ids"]))
+            return upsert(**kwargs)
+
+        monkeypatch.setattr(collection, "upsert", counting_upsert)
+        corrections = [_correction(f"c{i}") for i in range(5)]
+
+        ids = await vector_store.store_corrections_many(corrections)
+
+        assert ids == [f"c{i}" for i in range(5)]
+        assert [len(b) for b in vector_store._embedding_fn.batches] == [2, 2, 1]
+        assert upserts == [2, 2, 1]
+        assert collection.count() == 5
+
+    async def test_store_corrections_many_groups_by_user(self, vector_store):
+        await vector_store.store_corrections_many(
+            [_correction("c1"), _correction("c2", user_id="user-2")]
+        )
+
+        results = await vector_store.search_corrections("user-2", "台積電")
+        assert [r["correction_id"] for r in results] == ["c2"]
+
+    async def test_store_corrections_many_dedupes_ids(self, vector_store):
+        updated = _correction("c1").model_copy(update={"correction": "應為輝達"})
+
+        ids = await vector_store.store_corrections_many(
+            [_correction("c1"), _correction("c2"), updated]
+        )
+
+        assert ids == ["c1", "c2", "c1"]
+        results = await vector_store.search_corrections("user-1", "台積電", limit=5)
+        by_id = {r["correction_id"]: r for r in results}
+        assert sorted(by_id) == ["c1", "c2"]
+        assert by_id["c1"]["correction"] == "應為輝達"
+
+    async def test_cached_documents_are_not_reembedded(self, vector_store):
+        await vector_store.store_correction("user-1", _correction("c1"))
+        await vector_store.store_corrections_many(
+            [_correction("c1"), _correction("c2")]
+        )
+
+        assert len(vector_store._embedding_fn.batches) == 1
+        assert len(vector_store._embedding_fn.batches[0]) == 1
+
+    async def test_store_conversations_many(self, vector_store):
+        await vector_store.store_conversations_many(
+            "user-1",
+            [("s1", "聊到台積電"), ("s1", "聊到台積電"), ("s2", "聊到輝達")],
+        )
+
+        assert vector_store._embedding_fn.batches == [["聊到台積電", "聊到輝達"]]
+        results = await vector_store.search_conversations("user-1", "輝達", limit=5)
+        assert sorted(r["metadata"]["session_id"] for r in results) == ["s1", "s2"]
+
+
+class TestCollectionCache:
+    async def test_warm_search_skips_metadata_lookups(self, vector_store):
+        await vector_store.store_correction("user-1", _correction())
+        await vector_store.search_corrections("user-1", "台積電")
+
+        client = vector_store._client
+        with (
+            patch.object(
+                client,
+                "get_or_create_collection",
+                wraps=client.get_or_create_collection,
+            ) as get_or_create,
+            patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread,
+        ):
+            results = await vector_store.search_corrections("user-1", "台積電")
+
+        assert [r["correction_id"] for r in results] == ["c1"]
+        get_or_create.assert_not_called()
+        assert to_thread.call_count == 1
+
+    async def test_empty_collection_skips_embedding(self, vector_store):
+        assert await vector_store.search_conversations("user-1", "台積電") == []
+        assert await vector_store.search_conversations("user-1", "台積電") == []
+        assert vector_store._embedding_fn.calls == []
+
+    async def test_counts_follow_writes_and_deletes(self, vector_store):
+        await vector_store.store_conversations_many(
+            "user-1", [("s1", "聊到台積電"), ("s2", "聊到輝達")]
+        )
+        await vector_store.store_conversation("user-1", "s1", "聊到台積電")
+        assert vector_store._counts["user-1_conversations"] == 2
+
+        await vector_store.delete_user_data("user-1")
+        assert await vector_store.search_conversations("user-1", "輝達") == []
+
+
+class TestLocalEmbeddings:
+    async def test_default_backend_ranks_related_documents(self, tmp_path):
+        store = VectorStore(
+            str(tmp_path / "vectors"),
+            embedding_cache=EmbeddingCache(tmp_path / "embeddings.db"),
+        )
+        await store.initialize()
+        await store.store_conversations_many(
+            "user-1",
+            [
+                ("s1", "央行宣布升息半碼"),
+                ("s2", "台積電宣布 2 奈米先進製程量產"),
+                ("s3", "電動車補助政策延長"),
+            ],
+        )
+
+        results = await store.search_conversations("user-1", "台積電製程", limit=1)
+        assert results[0]["metadata"]["session_id"] == "s2"
+
+
+class TestNumpyBackend:
+    async def test_search_and_delete(self, tmp_path):
+        store = VectorStore(
+            str(tmp_path / "vectors"),
+            embedding_cache=EmbeddingCache(tmp_path / "embeddings.db"),
+            backend="numpy",
+        )
+        await store.initialize()
+        await store.store_corrections_many([_correction("c1"), _correction("c2")])
+        await store.store_conversations_many(
+            "user-1", [("s1", "央行宣布升息半碼"), ("s2", "台積電先進製程量產")]
+        )
+
+        corrections = await store.search_corrections("user-1", "台積電", limit=5)
+        assert sorted(c["correction_id"] for c in corrections) == ["c1", "c2"]
+        conversations = await store.search_conversations(
+            "user-1", "台積電製程", limit=1
+        )
+        assert conversations[0]["metadata"]["session_id"] == "s2"
+        assert (tmp_path / "vectors" / "numpy" / "user-1_corrections").is_dir()
+
+        await store.delete_user_data("user-1")
+        await store.delete_user_data("user-1")
+        assert await store.search_corrections("user-1", "台積電") == []
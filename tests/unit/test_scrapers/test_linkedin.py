@@ -4,7 +4,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.scrapers.linkedin import LinkedInScraper, LinkedInURLHandler
+from src.scrapers.linkedin import (
+    LinkedInScraper,
+    LinkedInURLHandler,
+    normalize_linkedin_url,
+)
 
 
 ARTICLE_HTML = """
@@ -195,3 +199,100 @@ class TestLinkedInURLHandler:
         handler.scraper.close = AsyncMock()
         await handler.close()
         handler.scraper.close.assert_awaited_once()
+
+    @patch("src.scrapers.linkedin.rate_limit", new_callable=AsyncMock)
+    async def test_process_urls_dedup_and_cache(self, mock_rate_limit):
+        handler = LinkedInURLHandler()
+
+        mock_response = MagicMock()
+        mock_response.text = ARTICLE_HTML
+        handler.scraper._fetch = AsyncMock(return_value=mock_response)
+
+        result = await handler.process_urls(
+            [
+                "https://www.linkedin.com/pulse/a",
+                "https://linkedin.com/pulse/a/?trk=public_post",
+                "https://www.linkedin.com/pulse/b#comments",
+            ]
+        )
+        assert len(result.items) == 2
+        assert result.duplicates == 1
+        assert result.failures == {}
+        assert handler.scraper._fetch.await_count == 2
+
+        # 第二次批次命中快取，不再發送請求
+        again = await handler.process_urls(["https://www.linkedin.com/pulse/b"])
+        assert len(again.items) == 1
+        assert again.cache_hits == 1
+        assert handler.scraper._fetch.await_count == 2
+
+    @patch("src.scrapers.linkedin.rate_limit", new_callable=AsyncMock)
+    async def test_process_urls_cache_is_bounded(self, mock_rate_limit):
+        handler = LinkedInURLHandler(cache_size=2)
+
+        mock_response = MagicMock()
+        mock_response.text = ARTICLE_HTML
+        handler.scraper._fetch = AsyncMock(return_value=mock_response)
+
+        urls = [f"https://www.linkedin.com/pulse/{name}" for name in "abc"]
+        result = await handler.process_urls(urls)
+        assert len(result.items) == 3
+        assert list(handler._cache) == urls[1:]
+
+        # 最舊的 a 已被淘汰，需要重新抓取
+        again = await handler.process_urls(urls[:2])
+        assert again.cache_hits == 1
+        assert handler.scraper._fetch.await_count == 4
+
+    @patch("src.scrapers.linkedin.rate_limit", new_callable=AsyncMock)
+    async def test_process_urls_reports_failures(self, mock_rate_limit):
+        handler = LinkedInURLHandler()
+
+        ok_response = MagicMock()
+        ok_response.text = ARTICLE_HTML
+        empty_response = MagicMock()
+        empty_response.text = EMPTY_HTML
+
+        async def fetch_side_effect(url, **kwargs):
+            if url.endswith("/down"):
+                raise ConnectionError("timeout")
+            if url.endswith("/empty"):
+                return empty_response
+            return ok_response
+
+        handler.scraper._fetch = AsyncMock(side_effect=fetch_side_effect)
+
+        result = await handler.process_urls(
+            [
+                "https://www.linkedin.com/posts/ok",
+                "https://www.linkedin.com/posts/down",
+                "https://www.linkedin.com/posts/empty",
+                "https://example.com/not-linkedin",
+            ]
+        )
+        assert len(result.items) == 1
+        assert set(result.failures) == {
+            "https://www.linkedin.com/posts/down",
+            "https://www.linkedin.com/posts/empty",
+            "https://example.com/not-linkedin",
+        }
+        assert "timeout" in result.failures["https://www.linkedin.com/posts/down"]
+
+
+class TestNormalizeLinkedInURL:
+    def test_normalizes_host_query_and_slash(self):
+        assert (
+            normalize_linkedin_url("http://m.linkedin.com/posts/abc/?utm_source=x#c")
+            == "https://www.linkedin.com/posts/abc"
+        )
+
+    def test_adds_scheme(self):
+        assert (
+            normalize_linkedin_url("  linkedin.com/in/user ")
+            == "https://www.linkedin.com/in/user"
+        )
+
+    def test_rejects_non_linkedin(self):
+        assert normalize_linkedin_url("https://example.com/posts/abc") is None
+        assert normalize_linkedin_url("https://notlinkedin.com/x") is None
+        assert normalize_linkedin_url("") is None
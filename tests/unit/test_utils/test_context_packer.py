@@ -0,0 +1,103 @@
+"""ContextPacker 測試"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.models.content import ContentItem, EngagementMetrics
+from src.utils.context_packer import EMPTY_CONTEXT_TEXT, ContextPacker
+
+
+def _item(
+    title: str,
+    content: str = "",
+    relevance: float | None = None,
+    likes: int = 0,
+    published_at: datetime | None = None,
+) -> ContentItem:
+    return ContentItem(
+        title=title,
+        url=f"https://example.com/{title}",
+        content=content,
+        source_type="news",
+        source_name="Test",
+        relevance_score=relevance,
+        engagement=EngagementMetrics(likes=likes) if likes else None,
+        published_at=published_at,
+    )
+
+
+class TestContextPacker:
+    def test_empty(self):
+        packed = ContextPacker(token_budget=100).pack([])
+        assert packed.text == EMPTY_CONTEXT_TEXT
+        assert packed.included_count == 0
+
+    def test_fits_without_truncation(self):
+        items = [_item("A", "短內容"), _item("B", "另一段短內容")]
+        packed = ContextPacker(token_budget=1000).pack(items)
+
+        assert packed.included_count == 2
+        assert packed.truncated == []
+        assert packed.dropped == []
+        assert "短內容" in packed.text
+
+    def test_stays_within_budget(self):
+        items = [_item(f"標題{i}", "長" * 2000, relevance=0.5) for i in range(20)]
+        packed = ContextPacker(token_budget=1500).pack(items)
+
+        assert packed.estimated_tokens <= 1500
+        assert packed.included_count + len(packed.dropped) == 20
+        assert packed.truncated
+
+    def test_ranks_by_relevance(self):
+        items = [_item("低", relevance=0.1), _item("高", relevance=0.9)]
+        packed = ContextPacker(token_budget=1000).pack(items)
+        assert packed.text.index("標題: 高") < packed.text.index("標題: 低")
+
+    def test_higher_priority_gets_more_content(self):
+        items = [
+            _item("low", "字" * 1000, relevance=0.0),
+            _item("high", "字" * 1000, relevance=1.0),
+        ]
+        packed = ContextPacker(token_budget=600).pack(items)
+        kept = {t["title"]: t["kept_tokens"] for t in packed.truncated}
+        assert kept["high"] > kept["low"]
+
+    def test_drops_lowest_priority_when_over_budget(self):
+        items = [
+            _item("keep", "內容" * 100, relevance=1.0),
+            _item("drop", "內容" * 100, relevance=0.0),
+        ]
+        packed = ContextPacker(token_budget=60, min_item_tokens=40).pack(items)
+        assert [d["title"] for d in packed.dropped] == ["drop"]
+
+    def test_priorities_use_engagement_and_recency(self):
+        now = datetime(2025, 1, 30, tzinfo=timezone.utc)
+        items = [
+            _item("old", published_at=now - timedelta(days=30)),
+            _item("new", published_at=now),
+            _item("popular", likes=500, published_at=now - timedelta(days=30)),
+        ]
+        weights = ContextPacker(token_budget=100).priorities(items, now=now)
+        assert weights[1] > weights[0]
+        assert weights[2] > weights[0]
+
+    def test_shard_respects_budget(self):
+        packer = ContextPacker(token_budget=500)
+        items = [_item(f"標題{i}", "字" * 150, relevance=i / 20) for i in range(20)]
+        shards = packer.shard(items)
+
+        assert len(shards) > 1
+        assert sum(len(s) for s in shards) == 20
+        for shard in shards:
+            assert sum(packer.item_cost(i) for i in shard) <= 500
+            assert packer.pack(shard).truncated == []
+
+    def test_shard_mixes_priorities(self):
+        packer = ContextPacker(token_budget=400)
+        items = [_item(f"t{i}", "字" * 150, relevance=i / 4) for i in range(4)]
+        shards = packer.shard(items)
+        top = {shard[0].title for shard in shards}
+        assert "t3" in top and "t2" in top
+
+    def test_shard_empty(self):
+        assert ContextPacker(token_budget=100).shard([]) == []
@@ -0,0 +1,120 @@
+"""Embedding 快取測試"""
+
+import asyncio
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.utils.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(tmp_path / "embeddings.db", max_entries=100)
+
+
+class TestEmbeddingCache:
+    async def test_miss_then_hit(self, cache):
+        assert await cache.get_many("m", ["台積電"]) == [None]
+
+        await cache.set_many("m", ["台積電"], [[0.1, 0.2, 0.3]])
+        (vector,) = await cache.get_many("m", ["台積電"])
+
+        assert vector == pytest.approx([0.1, 0.2, 0.3])
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    async def test_persists_float32_blobs(self, cache, tmp_path):
+        await cache.set_many("m", ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+        with sqlite3.connect(tmp_path / "embeddings.db") as conn:
+            blob = conn.execute(
+                "SELECT vector FROM embedding_cache WHERE model = 'm' LIMIT 1"
+            ).fetchone()[0]
+        assert len(blob) == 2 * np.dtype(np.float32).itemsize
+
+        # 新實例沒有記憶體層，只能從磁碟讀取
+        reopened = EmbeddingCache(tmp_path / "embeddings.db")
+        assert await reopened.get_many("m", ["b", "x", "a"]) == [
+            [3.0, 4.0],
+            None,
+            [1.0, 2.0],
+        ]
+        assert reopened.stats()["disk_hits"] == 2
+        assert reopened.stats()["misses"] == 1
+
+    async def test_keyed_on_model(self, cache):
+        await cache.set_many("model-a", ["text"], [[1.0]])
+        assert await cache.get_many("model-b", ["text"]) == [None]
+
+    async def test_memory_lru_eviction(self, tmp_path):
+        cache = EmbeddingCache(tmp_path / "e.db", memory_entries=2)
+        await cache.set_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+
+        assert cache.stats()["memory_entries"] == 2
+        await cache.get_many("m", ["a"])
+        assert cache.stats()["disk_hits"] == 1
+
+    async def test_disk_eviction(self, tmp_path):
+        cache = EmbeddingCache(tmp_path / "e.db", max_entries=2, memory_entries=0)
+        await cache.set_many("m", ["a"], [[1.0]])
+        await cache.set_many("m", ["b"], [[2.0]])
+        await cache.set_many("m", ["c"], [[3.0]])
+
+        assert await cache.get_many("m", ["a", "b", "c"]) == [None, [2.0], [3.0]]
+
+    async def test_schema_created_once_under_concurrent_first_use(
+        self, tmp_path, monkeypatch
+    ):
+        scripts = []
+        connect = sqlite3.connect
+
+        class SlowSchemaConnection(sqlite3.Connection):
+            def executescript(self, sql):
+                scripts.append(sql)
+                time.sleep(0.05)
+                return super().executescript(sql)
+
+        monkeypatch.setattr(
+            sqlite3,
+            "connect",
+            lambda path: connect(path, factory=SlowSchemaConnection),
+        )
+        cache = EmbeddingCache(tmp_path / "e.db")
+
+        def first_use() -> None:
+            cache._connect().close()
+
+        await asyncio.gather(*(asyncio.to_thread(first_use) for _ in range(8)))
+        assert len(scripts) == 1
+
+    def test_memory_lru_is_thread_safe(self, tmp_path):
+        cache = EmbeddingCache(tmp_path / "e.db", memory_entries=4)
+
+        def churn(offset: int) -> None:
+            for i in range(5000):
+                key = str((i + offset) % 8)
+                cache._memory_put("m", key, [1.0])
+                cache._memory_get("m", key)
+
+        # 縮短執行緒切換間隔，讓 get / move_to_end 之間更容易被其他執行緒搶占
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                for future in [pool.submit(churn, n) for n in range(8)]:
+                    future.result()
+        finally:
+            sys.setswitchinterval(interval)
+        assert cache.stats()["memory_entries"] == 4
+
+    async def test_clear(self, cache):
+        await cache.set_many("m", ["a"], [[1.0]])
+        await cache.clear()
+        assert await cache.get_many("m", ["a"]) == [None]
@@ -0,0 +1,202 @@
+"""LLM 回應快取測試"""
+
+import asyncio
+import sqlite3
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from src.utils.llm_cache import (
+    LLMResponseCache,
+    cached_structured_invoke,
+    cached_structured_stream,
+    completed_fields,
+    make_cache_key,
+)
+
+
+class Plan(BaseModel):
+    queries: list[str]
+
+
+def _llm(model: str = "gpt-4o-mini", temperature: float = 0.3) -> MagicMock:
+    llm = MagicMock()
+    llm.model_name = model
+    llm.temperature = temperature
+    llm._llm_type = "openai-chat"
+    structured_llm = MagicMock()
+    structured_llm.ainvoke = AsyncMock(return_value=Plan(queries=["a", "b"]))
+    llm.with_structured_output.return_value = structured_llm
+    return llm
+
+
+def _streaming_llm(chunks: list[dict]) -> MagicMock:
+    """astream 依序產出部分 dict 的 LLM"""
+
+    async def astream(prompt, config=None):
+        for chunk in chunks:
+            yield chunk
+
+    llm = _llm()
+    llm.with_structured_output.return_value.astream = MagicMock(side_effect=astream)
+    return llm
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(tmp_path / "llm_cache.db", ttl_seconds=60, max_entries=10)
+
+
+class TestMakeCacheKey:
+    def test_stable_for_same_input(self):
+        assert make_cache_key(_llm(), Plan, "p") == make_cache_key(_llm(), Plan, "p")
+
+    def test_varies_with_model_temperature_and_prompt(self):
+        base = make_cache_key(_llm(), Plan, "p")
+        assert make_cache_key(_llm(model="gpt-4o"), Plan, "p") != base
+        assert make_cache_key(_llm(temperature=0.9), Plan, "p") != base
+        assert make_cache_key(_llm(), Plan, "q") != base
+
+    def test_none_without_model_name(self):
+        assert make_cache_key(MagicMock(), Plan, "p") is None
+
+
+class TestLLMResponseCache:
+    async def test_set_and_get(self, cache):
+        await cache.set("k", Plan(queries=["x"]))
+        result = await cache.get("k", Plan)
+        assert result == Plan(queries=["x"])
+        assert cache.stats()["hits"] == 1
+
+    async def test_expired_entry_is_miss(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.db", ttl_seconds=1, max_entries=10)
+        await cache.set("k", Plan(queries=["x"]))
+        with cache._transaction() as conn:
+            conn.execute("UPDATE llm_cache SET created_at = ?", (time.time() - 10,))
+        assert await cache.get("k", Plan) is None
+
+    async def test_evicts_least_recently_used(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.db", ttl_seconds=0, max_entries=2)
+        await cache.set("a", Plan(queries=["a"]))
+        await cache.set("b", Plan(queries=["b"]))
+        with cache._transaction() as conn:
+            conn.execute("UPDATE llm_cache SET accessed_at = 0 WHERE cache_key = 'a'")
+        await cache.set("c", Plan(queries=["c"]))
+
+        assert await cache.get("a", Plan) is None
+        assert await cache.get("c", Plan) is not None
+
+    async def test_schema_created_once_under_concurrent_first_use(
+        self, tmp_path, monkeypatch
+    ):
+        scripts = []
+        connect = sqlite3.connect
+
+        class SlowSchemaConnection(sqlite3.Connection):
+            def executescript(self, sql):
+                scripts.append(sql)
+                time.sleep(0.05)
+                return super().executescript(sql)
+
+        monkeypatch.setattr(
+            sqlite3,
+            "connect",
+            lambda path: connect(path, factory=SlowSchemaConnection),
+        )
+        cache = LLMResponseCache(tmp_path / "c.db", ttl_seconds=0, max_entries=100)
+
+        def first_use() -> None:
+            cache._connect().close()
+
+        await asyncio.gather(*(asyncio.to_thread(first_use) for _ in range(8)))
+        assert len(scripts) == 1
+
+    async def test_invalid_payload_is_miss(self, cache):
+        class Other(BaseModel):
+            value: int
+
+        await cache.set("k", Plan(queries=["x"]))
+        assert await cache.get("k", Other) is None
+
+
+class TestCachedStructuredInvoke:
+    async def test_hit_skips_llm(self, cache):
+        llm = _llm()
+        first = await cached_structured_invoke(llm, Plan, "prompt", cache=cache)
+        second = await cached_structured_invoke(llm, Plan, "prompt", cache=cache)
+
+        assert first == second
+        assert isinstance(second, Plan)
+        assert llm.with_structured_output.return_value.ainvoke.await_count == 1
+
+    async def test_bypass_flag(self, cache):
+        llm = _llm()
+        await cached_structured_invoke(
+            llm, Plan, "prompt", use_cache=False, cache=cache
+        )
+        await cached_structured_invoke(
+            llm, Plan, "prompt", use_cache=False, cache=cache
+        )
+
+        assert llm.with_structured_output.return_value.ainvoke.await_count == 2
+        assert cache.stats()["misses"] == 0
+
+
+class TestCompletedFields:
+    def test_all_but_last_key_are_complete(self):
+        partial = {"queries": ["a"], "note": "par"}
+        assert completed_fields(partial, set()) == ["queries"]
+        assert completed_fields(partial, {"queries"}) == []
+
+
+class TestCachedStructuredStream:
+    async def test_emits_fields_as_they_complete(self, cache):
+        class Report(BaseModel):
+            title: str
+            queries: list[str]
+            note: str
+
+        llm = _streaming_llm(
+            [
+                {"title": "AI"},
+                {"title": "AI 趨勢", "queries": ["a"]},
+                {"title": "AI 趨勢", "queries": ["a", "b"], "note": "o"},
+                {"title": "AI 趨勢", "queries": ["a", "b"], "note": "ok"},
+            ]
+        )
+        seen: list[tuple[str, object]] = []
+
+        result = await cached_structured_stream(
+            llm, Report, "prompt", lambda f, v: seen.append((f, v)), cache=cache
+        )
+
+        assert seen == [
+            ("title", "AI 趨勢"),
+            ("queries", ["a", "b"]),
+            ("note", "ok"),
+        ]
+        assert result == Report(title="AI 趨勢", queries=["a", "b"], note="ok")
+        schema = llm.with_structured_output.call_args.args[0]
+        assert schema == Report.model_json_schema()
+
+    async def test_shares_cache_with_invoke(self, cache):
+        llm = _streaming_llm([{"queries": ["x"]}])
+        invoked = await cached_structured_invoke(llm, Plan, "prompt", cache=cache)
+        seen: dict = {}
+
+        streamed = await cached_structured_stream(
+            llm, Plan, "prompt", seen.__setitem__, cache=cache
+        )
+
+        assert streamed == invoked
+        assert seen == {"queries": ["a", "b"]}
+        llm.with_structured_output.return_value.astream.assert_not_called()
+
+    async def test_empty_stream_raises(self, cache):
+        llm = _streaming_llm([])
+        with pytest.raises(ValueError):
+            await cached_structured_stream(
+                llm, Plan, "prompt", lambda f, v: None, use_cache=False
+            )
@@ -0,0 +1,74 @@
+"""LLM 工廠與模型註冊表測試"""
+
+import asyncio
+
+import pytest
+from pydantic import SecretStr
+
+from src.utils.llm_factory import ModelRegistry, resolve_model_key
+
+
+@pytest.fixture(autouse=True)
+def fake_api_key(monkeypatch):
+    monkeypatch.setattr(
+        "src.utils.llm_factory.settings.openai_api_key", SecretStr("sk-test")
+    )
+    monkeypatch.setattr("src.utils.llm_factory.settings.llm_provider", "openai")
+
+
+class TestResolveModelKey:
+    def test_applies_settings_defaults(self, monkeypatch):
+        monkeypatch.setattr("src.utils.llm_factory.settings.llm_model", "gpt-4o-mini")
+        key = resolve_model_key(temperature=0)
+        assert key[:3] == ("openai", "gpt-4o-mini", 0.0)
+
+    def test_anthropic_default_model(self, monkeypatch):
+        monkeypatch.setattr("src.utils.llm_factory.settings.llm_model", "gpt-4o-mini")
+        key = resolve_model_key(provider="anthropic")
+        assert key[1] == "claude-3-5-haiku-latest"
+
+
+class TestModelRegistry:
+    def test_reuses_model_for_same_config(self):
+        registry = ModelRegistry()
+        first = registry.get(model="gpt-4o-mini", temperature=0.2)
+        assert registry.get(model="gpt-4o-mini", temperature=0.2) is first
+        assert registry.get(model="gpt-4o-mini", temperature=0.7) is not first
+        assert registry.stats()["created"] == 2
+        registry.close()
+
+    def test_models_share_sync_http_client(self):
+        registry = ModelRegistry()
+        a = registry.get(temperature=0.1)
+        b = registry.get(temperature=0.9)
+        assert a.http_client is b.http_client
+        registry.close()
+        assert a.http_client.is_closed
+
+    async def test_models_share_async_pool_within_loop(self):
+        registry = ModelRegistry()
+        a = registry.get(temperature=0.1)
+        b = registry.get(temperature=0.9)
+        assert a.http_async_client is not None
+        assert a.http_async_client is b.http_async_client
+
+        client = a.http_async_client
+        await registry.aclose()
+        assert client.is_closed
+        assert registry.get(temperature=0.1) is not a
+        registry.close()
+
+    def test_separate_pools_per_event_loop(self):
+        registry = ModelRegistry()
+
+        async def get_model():
+            return registry.get(temperature=0.3)
+
+        first = asyncio.run(get_model())
+        second = asyncio.run(get_model())
+
+        assert first is not second
+        assert first.http_async_client is not second.http_async_client
+        # 已關閉迴圈的連線池會被移除
+        assert registry.stats()["async_pools"] == 1
+        registry.close()
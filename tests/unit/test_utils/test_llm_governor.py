@@ -0,0 +1,212 @@
+"""LLM 調節器測試"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from src.utils.llm_cache import cached_structured_invoke
+from src.utils.llm_governor import LLMGovernor, is_rate_limit_error
+
+
+class RateLimitError(Exception):
+    """模擬 SDK 的 429 例外"""
+
+    def __init__(self, retry_after: str | None = None) -> None:
+        super().__init__("rate limited")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+def _report_usage(callbacks, total_tokens: int) -> None:
+    """模擬 chat model 結束時回報 usage metadata"""
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": total_tokens - 1,
+            "output_tokens": 1,
+            "total_tokens": total_tokens,
+        },
+        response_metadata={"model_name": "test-model"},
+    )
+    result = LLMResult(generations=[[ChatGeneration(message=message)]])
+    for handler in callbacks:
+        handler.on_llm_end(result)
+
+
+class TestIsRateLimitError:
+    def test_detects_429(self):
+        assert is_rate_limit_error(RateLimitError())
+        error = Exception("x")
+        error.status_code = 429
+        assert is_rate_limit_error(error)
+
+    def test_other_errors(self):
+        assert not is_rate_limit_error(ValueError("boom"))
+        error = Exception("x")
+        error.status_code = 500
+        assert not is_rate_limit_error(error)
+
+
+class TestConcurrency:
+    async def test_limits_in_flight_calls(self):
+        governor = LLMGovernor(max_concurrency=2, tokens_per_minute=0)
+        active = 0
+        peak = 0
+
+        async def call(callbacks):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "ok"
+
+        results = await asyncio.gather(*(governor.run(call) for _ in range(6)))
+
+        assert results == ["ok"] * 6
+        assert peak == 2
+        assert governor.stats()["in_flight"] == 0
+        assert governor.calls == 6
+
+    async def test_interactive_served_before_background(self):
+        governor = LLMGovernor(max_concurrency=1, tokens_per_minute=0)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        async def blocker(callbacks):
+            await release.wait()
+
+        def make_call(label):
+            async def call(callbacks):
+                order.append(label)
+
+            return call
+
+        first = asyncio.create_task(governor.run(blocker))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(governor.run(make_call("bg-1"), priority="background")),
+            asyncio.create_task(governor.run(make_call("bg-2"), priority="background")),
+            asyncio.create_task(governor.run(make_call("ui"), priority="interactive")),
+        ]
+        await asyncio.sleep(0)
+        assert governor.stats()["waiting"] == 3
+
+        release.set()
+        await asyncio.gather(first, *waiters)
+        assert order == ["ui", "bg-1", "bg-2"]
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        governor = LLMGovernor(max_concurrency=1, tokens_per_minute=0)
+        release = asyncio.Event()
+
+        async def blocker(callbacks):
+            await release.wait()
+
+        first = asyncio.create_task(governor.run(blocker))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(governor.run(AsyncMock(return_value="x")))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await first
+
+        assert await governor.run(AsyncMock(return_value="y")) == "y"
+        assert governor.stats()["in_flight"] == 0
+
+
+class TestTokenBudget:
+    async def test_settles_actual_usage(self):
+        governor = LLMGovernor(tokens_per_minute=0)
+
+        async def call(callbacks):
+            _report_usage(callbacks, 120)
+            return "ok"
+
+        await governor.run(call, estimated_tokens=5000)
+        stats = governor.stats()
+        assert stats["tokens_last_minute"] == 120
+        assert stats["tokens_used"] == 120
+
+    async def test_keeps_estimate_without_usage(self):
+        governor = LLMGovernor(tokens_per_minute=0)
+        await governor.run(AsyncMock(return_value="ok"), estimated_tokens=300)
+        assert governor.stats()["tokens_last_minute"] == 300
+
+    async def test_waits_when_budget_exhausted(self):
+        governor = LLMGovernor(tokens_per_minute=1000)
+        await governor.run(AsyncMock(return_value="ok"), estimated_tokens=800)
+
+        sleep = AsyncMock(side_effect=lambda _: governor._window.clear())
+        with patch("src.utils.llm_governor.asyncio.sleep", sleep):
+            await governor.run(AsyncMock(return_value="ok"), estimated_tokens=500)
+
+        waited = sleep.await_args.args[0]
+        assert 59 < waited <= 60
+
+    async def test_first_call_never_blocked(self):
+        governor = LLMGovernor(tokens_per_minute=100)
+        sleep = AsyncMock()
+        with patch("src.utils.llm_governor.asyncio.sleep", sleep):
+            await governor.run(AsyncMock(return_value="ok"), estimated_tokens=5000)
+        sleep.assert_not_awaited()
+
+
+class TestRateLimitBackoff:
+    async def test_retries_after_429(self):
+        governor = LLMGovernor(tokens_per_minute=0, max_retries=2, backoff_seconds=0)
+        call = AsyncMock(side_effect=[RateLimitError(), "ok"])
+
+        assert await governor.run(call) == "ok"
+        assert call.await_count == 2
+        assert governor.rate_limited == 1
+
+    async def test_honours_retry_after(self):
+        governor = LLMGovernor(tokens_per_minute=0, max_retries=1, backoff_seconds=10)
+        call = AsyncMock(side_effect=[RateLimitError(retry_after="0.01"), "ok"])
+        sleep = AsyncMock()
+        with patch("src.utils.llm_governor.asyncio.sleep", sleep):
+            await governor.run(call)
+        assert sleep.await_args.args[0] <= 0.01
+
+    async def test_gives_up_after_max_retries(self):
+        governor = LLMGovernor(tokens_per_minute=0, max_retries=1, backoff_seconds=0)
+        call = AsyncMock(side_effect=RateLimitError())
+
+        with pytest.raises(RateLimitError):
+            await governor.run(call)
+        assert call.await_count == 2
+        assert governor.stats()["in_flight"] == 0
+
+    async def test_other_errors_not_retried(self):
+        governor = LLMGovernor(tokens_per_minute=0, max_retries=3)
+        call = AsyncMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            await governor.run(call)
+        assert call.await_count == 1
+
+
+class TestCachedInvokeIntegration:
+    async def test_routes_through_governor_with_priority(self):
+        structured = MagicMock()
+        structured.ainvoke = AsyncMock(return_value="result")
+        llm = MagicMock()
+        llm.with_structured_output.return_value = structured
+
+        governor = LLMGovernor(tokens_per_minute=0)
+        with (
+            patch("src.utils.llm_cache.get_llm_governor", return_value=governor),
+            patch.object(governor, "run", wraps=governor.run) as spy,
+        ):
+            await cached_structured_invoke(
+                llm, MagicMock, "prompt", use_cache=False, priority="background"
+            )
+
+        assert spy.call_args.kwargs["priority"] == "background"
+        config = structured.ainvoke.await_args.kwargs["config"]
+        assert len(config["callbacks"]) == 1
@@ -0,0 +1,53 @@
+"""本地 embedding 測試"""
+
+import numpy as np
+import pytest
+
+from src.utils.llm_factory import create_embedding_model
+from src.utils.local_embeddings import LOCAL_EMBEDDING_MODEL, LocalNgramEmbeddings
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return float(np.dot(a, b))
+
+
+class TestLocalNgramEmbeddings:
+    def test_fixed_dimension_and_unit_norm(self):
+        embeddings = LocalNgramEmbeddings(dim=64)
+        vector = embeddings.embed_query("台積電先進製程")
+
+        assert len(vector) == 64
+        assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-6)
+
+    def test_deterministic(self):
+        text = "AI 晶片出口管制"
+        assert (
+            LocalNgramEmbeddings().embed_query(text)
+            == (LocalNgramEmbeddings().embed_documents([text])[0])
+        )
+
+    def test_related_text_is_closer(self):
+        embeddings = LocalNgramEmbeddings()
+        query = embeddings.embed_query("台積電 先進製程")
+        related = embeddings.embed_query("台積電宣布 2 奈米先進製程量產")
+        unrelated = embeddings.embed_query("央行宣布升息半碼")
+
+        assert _cosine(query, related) > _cosine(query, unrelated)
+
+    def test_empty_text(self):
+        assert LocalNgramEmbeddings(dim=8).embed_query("") == [0.0] * 8
+
+    def test_model_name_tracks_parameters(self):
+        assert LocalNgramEmbeddings(dim=64).model != LocalNgramEmbeddings().model
+
+
+class TestCreateEmbeddingModel:
+    def test_selects_local_backend(self, monkeypatch):
+        monkeypatch.setattr("src.utils.llm_factory.settings.local_embedding_dim", 128)
+        embeddings = create_embedding_model(LOCAL_EMBEDDING_MODEL)
+
+        assert isinstance(embeddings, LocalNgramEmbeddings)
+        assert embeddings.dim == 128
+
+    def test_unit_tests_default_to_local(self):
+        assert isinstance(create_embedding_model(), LocalNgramEmbeddings)
@@ -32,6 +32,19 @@ class TestRateLimiter:
         limiter = RateLimiter(config=config)
         assert limiter.config.requests_per_minute == 5
 
+    async def test_per_key_config(self):
+        limiter = RateLimiter()
+        limiter.configure("slow_api", RateLimitConfig(requests_per_minute=2))
+        assert limiter.get_config("slow_api").requests_per_minute == 2
+        assert limiter.get_config("other") is limiter.config
+
+    def test_linkedin_has_dedicated_limit(self):
+        limiter = RateLimiter()
+        assert (
+            limiter.get_config("linkedin").requests_per_minute
+            < limiter.config.requests_per_minute
+        )
+
 
 class TestRateLimitFunction:
     async def test_rate_limit_function(self):
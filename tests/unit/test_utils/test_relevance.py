@@ -0,0 +1,70 @@
+"""RelevanceScorer 測試"""
+
+from src.models.content import ContentItem
+from src.utils.relevance import RelevanceScorer, filter_by_relevance
+
+
+def _item(title: str, content: str = "") -> ContentItem:
+    return ContentItem(
+        title=title,
+        url=f"https://example.com/{abs(hash(title))}",
+        content=content,
+        source_type="forum",
+        source_name="PTT:Gossiping",
+    )
+
+
+class TestRelevanceScorer:
+    def test_full_match_scores_higher_than_partial(self):
+        items = [
+            _item("[新聞] 立法院通過 AI 監管草案"),
+            _item("[問卦] AI 畫圖是不是很強"),
+            _item("[問卦] 今天晚餐吃什麼"),
+        ]
+        scores = RelevanceScorer().score(items, ["AI 監管"])
+
+        assert scores[0] > scores[1] > scores[2]
+        assert scores[2] == 0.0
+
+    def test_best_query_wins(self):
+        items = [_item("台積電法說會", "先進製程需求強勁")]
+        scores = RelevanceScorer().score(items, ["AI 監管", "台積電 法說會"])
+        assert scores[0] > 0.5
+
+    def test_no_query_tokens(self):
+        items = [_item("任何標題")]
+        scores = RelevanceScorer().score(items, ["!!!"])
+        assert scores.tolist() == [1.0]
+
+    def test_empty_items(self):
+        assert RelevanceScorer().score([], ["AI"]).size == 0
+
+
+class TestFilterByRelevance:
+    def test_drops_below_threshold_and_records_scores(self):
+        items = [
+            _item("晚餐吃什麼"),
+            _item("AI 監管法案進度", "數位部說明 AI 監管方向"),
+        ]
+        result = filter_by_relevance(items, ["AI 監管"], threshold=0.3, min_items=0)
+
+        assert [i.title for i in result.kept] == ["AI 監管法案進度"]
+        assert [i.title for i in result.dropped] == ["晚餐吃什麼"]
+        assert result.kept[0].relevance_score is not None
+        assert result.dropped[0].relevance_score == 0.0
+
+    def test_min_items_floor(self):
+        items = [_item("晚餐吃什麼"), _item("天氣很好")]
+        result = filter_by_relevance(items, ["AI 監管"], threshold=0.3, min_items=1)
+
+        assert len(result.kept) == 1
+        assert len(result.dropped) == 1
+
+    def test_kept_sorted_by_score(self):
+        items = [
+            _item("AI 新聞"),
+            _item("AI 監管", "AI 監管 AI 監管"),
+        ]
+        result = filter_by_relevance(items, ["AI 監管"], threshold=0.0, min_items=0)
+        scores = [i.relevance_score for i in result.kept]
+        assert scores == sorted(scores, reverse=True)
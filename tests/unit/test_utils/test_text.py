@@ -0,0 +1,76 @@
+"""文字斷詞測試"""
+
+from src.utils.text import (
+    estimate_tokens,
+    extract_keywords,
+    ngram_features,
+    tokenize,
+    truncate_to_tokens,
+)
+
+
+class TestTokenize:
+    def test_cjk_bigrams(self):
+        assert tokenize("人工智慧") == ["人工", "工智", "智慧"]
+
+    def test_single_cjk_char(self):
+        assert tokenize("股") == ["股"]
+
+    def test_mixed_text(self):
+        assert tokenize("AI 監管") == ["ai", "監管"]
+
+    def test_keeps_product_names(self):
+        assert "gpt-5" in tokenize("GPT-5 發布")
+
+    def test_punctuation_ignored(self):
+        assert tokenize("「你好！」") == ["你好"]
+
+    def test_empty(self):
+        assert tokenize("") == []
+
+
+class TestNgramFeatures:
+    def test_cjk_ngrams_up_to_max(self):
+        assert ngram_features("晶片", max_n=3) == ["晶", "片", "晶片"]
+        assert "台積電" in ngram_features("台積電")
+        assert "台積電" not in ngram_features("台積電", max_n=2)
+
+    def test_mixed_text(self):
+        assert ngram_features("GPT-5 股") == ["gpt-5", "股"]
+
+
+class TestEstimateTokens:
+    def test_cjk_one_token_per_char(self):
+        assert estimate_tokens("人工智慧") == 4
+
+    def test_latin_four_chars_per_token(self):
+        assert estimate_tokens("abcdefgh") == 2
+
+    def test_whitespace_free(self):
+        assert estimate_tokens("   ") == 0
+
+
+class TestTruncateToTokens:
+    def test_within_budget_unchanged(self):
+        assert truncate_to_tokens("人工智慧", 10) == "人工智慧"
+
+    def test_truncates_cjk(self):
+        assert truncate_to_tokens("人工智慧", 2) == "人工"
+
+    def test_zero_budget(self):
+        assert truncate_to_tokens("abc", 0) == ""
+
+
+class TestExtractKeywords:
+    def test_keeps_latin_case_and_splits_cjk(self):
+        assert extract_keywords("AI 取代工作") == ["AI", "取代工作"]
+
+    def test_removes_question_words_and_particles(self):
+        assert extract_keywords("GPT-5 發布了嗎？") == ["GPT-5", "發布"]
+        assert extract_keywords("台積電美國設廠的影響") == ["台積電美國設廠"]
+
+    def test_dedup_and_limit(self):
+        assert extract_keywords("AI ai AI 晶片", max_keywords=1) == ["AI"]
+
+    def test_empty_when_nothing_usable(self):
+        assert extract_keywords("的？") == []